@@ -0,0 +1,90 @@
+"""Compare the legacy seek-per-frame crop export with export_crop().
+
+The legacy loop is the one VideoCropper.export_video used before it
+moved to export_crop(): it sets CAP_PROP_POS_FRAMES before every read,
+which makes the FFmpeg backend seek back to a keyframe and re-decode the
+GOP up to the requested frame. export_crop() opens its own capture and
+decodes sequentially. Both variants crop the centre half of the frame and
+write it with the same mp4v VideoWriter.
+
+    python -m benchmarks.bench_crop_export
+    python -m benchmarks.bench_crop_export --sizes 1920x1080 --seconds 10
+"""
+import argparse
+import os
+import tempfile
+import time
+
+import cv2
+import numpy as np
+
+from frame_extractor.cropper import CropConfig, export_crop
+
+from .synthetic import make_clip
+
+
+def legacy_export(path, rect, output_path, limit=None):
+    x, y, width, height = rect
+    cap = cv2.VideoCapture(path)
+    total = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
+    if limit is not None:
+        total = min(total, limit)
+    out = cv2.VideoWriter(output_path, cv2.VideoWriter.fourcc(*"mp4v"),
+                          cap.get(cv2.CAP_PROP_FPS), (width, height))
+    frame = None
+    crop_buffer = np.empty((height, width, 3), dtype=np.uint8)
+    written = 0
+    start = time.perf_counter()
+    for frame_idx in range(total):
+        cap.set(cv2.CAP_PROP_POS_FRAMES, frame_idx)
+        ret, frame = cap.read(image=frame)
+        if not ret:
+            break
+        np.copyto(crop_buffer, frame[y:y + height, x:x + width])
+        out.write(crop_buffer)
+        written += 1
+    elapsed = time.perf_counter() - start
+    out.release()
+    cap.release()
+    return written, elapsed
+
+
+def sequential_export(path, rect, output_folder):
+    x, y, width, height = rect
+    config = CropConfig(path, x, y, width, height, output_folder=output_folder)
+    start = time.perf_counter()
+    result = export_crop(config)
+    return result.frames_written, time.perf_counter() - start
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", default="640x360,1920x1080",
+                        help="Comma-separated WIDTHxHEIGHT clip sizes (default: 640x360,1920x1080)")
+    parser.add_argument("--seconds", type=int, default=10, help="Clip length (default: 10)")
+    parser.add_argument("--fps", type=int, default=30)
+    parser.add_argument("--legacy-limit", type=int, default=0,
+                        help="Frames exported by the legacy loop (0 = whole clip)")
+    args = parser.parse_args(argv)
+
+    print(f"{'clip':<12} {'variant':<11} {'frames':>7} {'seconds':>9} {'frames/s':>10}")
+    with tempfile.TemporaryDirectory() as output_folder:
+        for size in args.sizes.split(","):
+            width, height = (int(v) for v in size.split("x"))
+            path = make_clip(width, height, args.fps, args.seconds)
+            rect = (width // 4, height // 4, width // 2, height // 2)
+
+            results = {}
+            legacy_output = os.path.join(output_folder, "legacy.mp4")
+            for variant, run in (
+                    ("legacy", lambda: legacy_export(path, rect, legacy_output, args.legacy_limit or None)),
+                    ("sequential", lambda: sequential_export(path, rect, output_folder))):
+                frames, elapsed = run()
+                results[variant] = frames / elapsed if elapsed else 0.0
+                print(f"{size:<12} {variant:<11} {frames:>7} {elapsed:>9.2f} {results[variant]:>10.1f}")
+            if results["legacy"]:
+                print(f"{size:<12} speedup     {results['sequential'] / results['legacy']:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""Cropped stills in one pass vs. crop export followed by extraction.
+
+The two-pass workflow exports framed_<name>.mp4 with export_crop() and
+then runs extract_frames() on it, which re-encodes lossily and decodes
+the video a second time. The single pass gives extract_frames() the
+rectangle as ExtractionConfig.crop. Both produce PNGs of the same frames;
+PSNR is measured against the same crop of the decoded source.
+
+    python -m benchmarks.bench_crop_extract
+    python -m benchmarks.bench_crop_extract --width 1920 --height 1080 --interval 0.5
+"""
+import argparse
+import glob
+import os
+import tempfile
+import time
+
+import cv2
+import numpy as np
+
+from frame_extractor.cropper import CropConfig, export_crop
+from frame_extractor.engine import ExtractionConfig, extract_frames
+
+from .synthetic import make_clip
+
+
+def psnr_against_source(path, rect, output_dir, interval):
+    x, y, width, height = rect
+    cap = cv2.VideoCapture(path)
+    step = max(1, int(cap.get(cv2.CAP_PROP_FPS) * interval))
+    values = []
+    for i, still in enumerate(sorted(glob.glob(os.path.join(output_dir, "*.png")))):
+        cap.set(cv2.CAP_PROP_POS_FRAMES, i * step)
+        ret, frame = cap.read()
+        if not ret:
+            break
+        values.append(cv2.PSNR(frame[y:y + height, x:x + width], cv2.imread(still)))
+    cap.release()
+    return float(np.mean(values)) if values else float("nan")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--width", type=int, default=1280)
+    parser.add_argument("--height", type=int, default=720)
+    parser.add_argument("--seconds", type=int, default=20)
+    parser.add_argument("--interval", type=float, default=1.0,
+                        help="Seconds between stills (default: 1.0)")
+    args = parser.parse_args(argv)
+
+    path = make_clip(args.width, args.height, 30, args.seconds)
+    rect = (args.width // 4, args.height // 4, args.width // 2, args.height // 2)
+    x, y, width, height = rect
+
+    with tempfile.TemporaryDirectory() as output_folder:
+        start = time.perf_counter()
+        exported = export_crop(CropConfig(path, x, y, width, height,
+                                          output_folder=os.path.join(output_folder, "video")))
+        two_pass = extract_frames(ExtractionConfig(exported.output_path,
+                                                   os.path.join(output_folder, "two"),
+                                                   interval=args.interval, resume=False))
+        two_pass_seconds = time.perf_counter() - start
+
+        start = time.perf_counter()
+        one_pass = extract_frames(ExtractionConfig(path, os.path.join(output_folder, "one"),
+                                                   interval=args.interval, crop=rect,
+                                                   resume=False))
+        one_pass_seconds = time.perf_counter() - start
+
+        print(f"{args.seconds}s {args.width}x{args.height} clip, centre crop {width}x{height}, "
+              f"one still every {args.interval:g}s")
+        print(f"{'variant':<34} {'stills':>7} {'seconds':>8} {'PSNR dB':>8}")
+        for name, result, seconds in (
+                (f"export ({exported.encoder}) + extract", two_pass, two_pass_seconds),
+                ("extract with crop", one_pass, one_pass_seconds)):
+            psnr = psnr_against_source(path, rect, result.output_dir, args.interval)
+            # cv2.PSNR reports identical images as ~361 dB
+            psnr = "exact" if psnr > 100 else f"{psnr:.1f}"
+            print(f"{name:<34} {result.extracted_count:>7} {seconds:>8.2f} {psnr:>8}")
+
+
+if __name__ == "__main__":
+    main()
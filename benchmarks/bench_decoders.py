@@ -0,0 +1,73 @@
+"""OpenCV vs. PyAV decoding, and keyframe-only extraction.
+
+Decodes every frame of a clip with each decoder (PyAV once per thread
+type), then runs extract_frames() in "keyframes" mode with each decoder.
+OpenCV has to reach each keyframe by seeking or decoding through the
+frames in between; PyAV tells the decoder to discard non-key frames.
+PyAV rows are skipped when it is not installed (pip install av).
+
+    python -m benchmarks.bench_decoders
+    python -m benchmarks.bench_decoders --video talk.mp4
+"""
+import argparse
+import os
+import tempfile
+import time
+
+from frame_extractor.engine import ExtractionConfig, extract_frames
+from frame_extractor.readers import open_reader, pyav_available
+
+from .synthetic import make_clip
+
+
+def decode_all(path, decoder, thread_type="auto"):
+    """Return (frames, seconds) to grab and convert every frame"""
+    cap = open_reader(path, decoder, thread_type=thread_type)
+    frames = 0
+    start = time.perf_counter()
+    while True:
+        ok, _ = cap.read()
+        if not ok:
+            break
+        frames += 1
+    seconds = time.perf_counter() - start
+    cap.release()
+    return frames, seconds
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--video", default=None,
+                        help="Clip to decode (default: a synthetic 720p mp4v clip)")
+    parser.add_argument("--seconds", type=int, default=30,
+                        help="Length of the synthetic clip (default: 30)")
+    args = parser.parse_args(argv)
+
+    path = args.video or make_clip(1280, 720, 30, args.seconds)
+    decoders = ["opencv"] + (["pyav"] if pyav_available() else [])
+    print(os.path.basename(path))
+    if "pyav" not in decoders:
+        print("PyAV is not installed; only OpenCV is measured")
+
+    print(f"\n{'decode every frame':<26} {'frames':>7} {'seconds':>8} {'fps':>7}")
+    variants = [("opencv", "auto")]
+    if "pyav" in decoders:
+        variants += [("pyav", "slice"), ("pyav", "frame"), ("pyav", "auto")]
+    for decoder, thread_type in variants:
+        frames, seconds = decode_all(path, decoder, thread_type)
+        name = decoder if decoder == "opencv" else f"pyav, {thread_type} threads"
+        print(f"{name:<26} {frames:>7} {seconds:>8.2f} {frames / seconds:>7.0f}")
+
+    print(f"\n{'extract keyframes (jpg)':<26} {'stills':>7} {'seconds':>8}")
+    with tempfile.TemporaryDirectory() as output_folder:
+        for decoder in decoders:
+            start = time.perf_counter()
+            result = extract_frames(ExtractionConfig(path, output_folder, mode="keyframes",
+                                                     image_format="jpg", decoder=decoder,
+                                                     resume=False))
+            seconds = time.perf_counter() - start
+            print(f"{decoder:<26} {result.extracted_count:>7} {seconds:>8.2f}")
+
+
+if __name__ == "__main__":
+    main()
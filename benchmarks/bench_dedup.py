@@ -0,0 +1,89 @@
+"""Cost of near-duplicate detection against the PNG encode it saves.
+
+Part one times Deduplicator.keep() and a default PNG encode on the same
+frames at several resolutions. Part two extracts every frame of a
+lecture-style clip (a new slide every few seconds, light noise in
+between) with and without --dedup.
+
+    python -m benchmarks.bench_dedup
+    python -m benchmarks.bench_dedup --seconds 30 --width 1920 --height 1080
+"""
+import argparse
+import shutil
+import tempfile
+import time
+
+from frame_extractor.dedup import DEFAULT_THRESHOLD, Deduplicator
+from frame_extractor.engine import ExtractionConfig, extract_frames
+from frame_extractor.writers import PngWriter
+
+from .bench_writers import load_frames
+from .synthetic import make_clip, make_slides_clip
+
+RESOLUTIONS = ((1280, 720), (1920, 1080), (3840, 2160))
+
+
+def time_per_frame(fn, frames, repeat=3):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for frame in frames:
+            fn(frame)
+        best = min(best, (time.perf_counter() - start) / len(frames))
+    return best
+
+
+def micro(frames_per_size=10):
+    lines = [
+        "| Resolution | dedup ms/frame | PNG encode ms/frame | ratio |",
+        "|---|---:|---:|---:|",
+    ]
+    for width, height in RESOLUTIONS:
+        frames = load_frames(make_clip(width, height, 30, 2), frames_per_size)
+        dedup = Deduplicator()
+        png = PngWriter()
+        dedup_s = time_per_frame(dedup.keep, frames)
+        png_s = time_per_frame(png.encode, frames, repeat=1)
+        lines.append(f"| {width}x{height} | {1000 * dedup_s:.3f} | {1000 * png_s:.1f} | "
+                     f"{png_s / dedup_s:.0f}x |")
+    return "\n".join(lines)
+
+
+def end_to_end(path):
+    lines = [
+        "| dedup | frames written | dropped | MB written | seconds |",
+        "|---|---:|---:|---:|---:|",
+    ]
+    for threshold in (None, DEFAULT_THRESHOLD):
+        out_dir = tempfile.mkdtemp(prefix="bench_dedup_")
+        try:
+            config = ExtractionConfig(path, out_dir, mode="all", dedup=threshold, resume=False)
+            start = time.perf_counter()
+            result = extract_frames(config)
+            elapsed = time.perf_counter() - start
+        finally:
+            shutil.rmtree(out_dir, ignore_errors=True)
+        label = "off" if threshold is None else f"{threshold}"
+        lines.append(f"| {label} | {result.extracted_count} | {result.dropped_count} | "
+                     f"{result.bytes_written / 1e6:.1f} | {elapsed:.1f} |")
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--width", type=int, default=1280)
+    parser.add_argument("--height", type=int, default=720)
+    parser.add_argument("--seconds", type=int, default=30)
+    parser.add_argument("--slide-seconds", type=int, default=5)
+    args = parser.parse_args(argv)
+
+    print("Per-frame cost, one thread\n")
+    print(micro())
+    path = make_slides_clip(args.width, args.height, 30, args.seconds, args.slide_seconds)
+    print(f"\nAll frames of a {args.seconds}s {args.width}x{args.height} slides clip "
+          f"(new slide every {args.slide_seconds}s)\n")
+    print(end_to_end(path))
+
+
+if __name__ == "__main__":
+    main()
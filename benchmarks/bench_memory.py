@@ -0,0 +1,99 @@
+"""Check that memory stays flat over a long extraction and crop export.
+
+Python-level peak (tracemalloc, which sees NumPy arrays including those
+OpenCV allocates) and process peak RSS are sampled once 10% of the clip is
+done and again at the end. With decode buffers reused, both should be
+reached early and stay put; the script exits with status 1 if either
+grows by more than the tolerance in the remaining 90%.
+
+Extraction holds up to --memory-budget of decoded frames in flight by
+design (see pipeline.py), so a small budget is used to make the plateau
+show within the first 10% of the clip.
+
+    python -m benchmarks.bench_memory
+    python -m benchmarks.bench_memory --seconds 600 --width 1280 --height 720
+"""
+import argparse
+import resource
+import shutil
+import sys
+import tempfile
+import tracemalloc
+
+from frame_extractor.cropper import CropConfig, export_crop
+from frame_extractor.engine import ExtractionConfig, extract_frames
+
+from .synthetic import make_clip
+
+# Growth allowed between the 10% sample and the end
+TOLERANCE_BYTES = 8 * 1024 * 1024
+TOLERANCE_RATIO = 0.10
+
+
+def peak_rss():
+    # ru_maxrss is KiB on Linux, bytes on macOS
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return rss if sys.platform == "darwin" else rss * 1024
+
+
+def measure(run):
+    """Run run(progress) and return (peaks at 10%, peaks at the end)"""
+    early = []
+
+    def progress(snapshot):
+        if not early and snapshot.total and snapshot.done >= snapshot.total // 10:
+            early.append((tracemalloc.get_traced_memory()[1], peak_rss()))
+
+    tracemalloc.start()
+    try:
+        run(progress)
+        final = (tracemalloc.get_traced_memory()[1], peak_rss())
+    finally:
+        tracemalloc.stop()
+    return early[0], final
+
+
+def flat(early, final):
+    return final <= early * (1 + TOLERANCE_RATIO) + TOLERANCE_BYTES
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--width", type=int, default=640)
+    parser.add_argument("--height", type=int, default=360)
+    parser.add_argument("--seconds", type=int, default=120)
+    parser.add_argument("--memory-budget", type=int, default=32, metavar="MB")
+    args = parser.parse_args(argv)
+
+    path = make_clip(args.width, args.height, 30, args.seconds)
+    out_dir = tempfile.mkdtemp(prefix="bench_memory_")
+    # Crop export first: peak RSS is per process, so it must not inherit the extraction's
+    jobs = {
+        "crop export": lambda progress: export_crop(
+            CropConfig(path, 16, 16, args.width // 2, args.height // 2, out_dir,
+                       progress_interval=0), progress),
+        "extract (all frames, jpg)": lambda progress: extract_frames(
+            ExtractionConfig(path, out_dir, mode="all", image_format="jpg", resume=False,
+                             memory_budget=args.memory_budget * 1024 * 1024,
+                             progress_interval=0), progress),
+    }
+    ok = True
+    print(f"{args.seconds}s {args.width}x{args.height} clip, "
+          f"{args.memory_budget} MiB extraction budget\n")
+    print("| Job | traced peak @10% | traced peak @100% | RSS peak @10% | RSS peak @100% | flat |")
+    print("|---|---:|---:|---:|---:|---|")
+    try:
+        for name, run in jobs.items():
+            (traced_early, rss_early), (traced_final, rss_final) = measure(run)
+            job_ok = flat(traced_early, traced_final) and flat(rss_early, rss_final)
+            ok = ok and job_ok
+            print(f"| {name} | {traced_early / 2**20:.1f} MiB | {traced_final / 2**20:.1f} MiB | "
+                  f"{rss_early / 2**20:.0f} MiB | {rss_final / 2**20:.0f} MiB | "
+                  f"{'yes' if job_ok else 'NO'} |")
+    finally:
+        shutil.rmtree(out_dir, ignore_errors=True)
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
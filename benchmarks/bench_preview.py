@@ -0,0 +1,131 @@
+"""Compare preview stepping latency with and without PreviewSource.
+
+The legacy path is the one VideoCropper.display_frame used before the
+cache: seek, read, convert and resize for every displayed frame. Both
+variants replay the same sequence of +-1 and +-STEP_FRAMES steps (the
+cropper's buttons) and back-and-forth scrubs with a pause between steps, like a user pressing keys, and
+report per-step latency. The pause is when the prefetcher works.
+
+The drag case sends a burst of timeline motion events across the clip.
+The legacy path decodes every one of them on the calling (Tk) thread.
+PreviewSource.request() only queues the newest one. The case reports the
+time the calling thread was blocked and when the final frame was ready.
+
+    python -m benchmarks.bench_preview
+    python -m benchmarks.bench_preview --size 3840x2160 --seconds 4 --pause 0.1
+"""
+import argparse
+import statistics
+import threading
+import time
+
+import cv2
+
+from frame_extractor.preview import STEP_FRAMES, PreviewSource
+
+from .synthetic import make_clip
+
+DISPLAY_SIZE = (800, 450)
+
+
+def step_pattern(start, total):
+    """Frame indices visited by a typical inspect-and-adjust session"""
+    indices = [start]
+    step = STEP_FRAMES
+    for delta in [1] * 15 + [-1] * 8 + [step] * 4 + [-step] * 3 + [1, -1] * 6 + [step, -step] * 3:
+        indices.append(max(0, min(total - 1, indices[-1] + delta)))
+    return indices
+
+
+def legacy_frame(cap, index):
+    cap.set(cv2.CAP_PROP_POS_FRAMES, index)
+    ret, frame = cap.read()
+    if not ret:
+        return None
+    return cv2.resize(cv2.cvtColor(frame, cv2.COLOR_BGR2RGB), DISPLAY_SIZE)
+
+
+def run(path, indices, pause, cached):
+    cap = cv2.VideoCapture(path)
+    total = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
+    preview = PreviewSource(cap, DISPLAY_SIZE, total) if cached else None
+    latencies = []
+    for index in indices:
+        start = time.perf_counter()
+        frame = preview.frame(index) if cached else legacy_frame(cap, index)
+        latencies.append(time.perf_counter() - start)
+        assert frame is not None
+        time.sleep(pause)
+    hits = preview.cache.hits if cached else 0
+    if preview:
+        preview.close()
+    cap.release()
+    return latencies, hits
+
+
+def drag(path, events, spacing, cached):
+    """Return (seconds the caller was blocked, seconds until the last frame was ready)"""
+    cap = cv2.VideoCapture(path)
+    total = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
+    preview = PreviewSource(cap, DISPLAY_SIZE, total) if cached else None
+    indices = [i * (total - 1) // (events - 1) for i in range(events)]
+    done = threading.Event()
+
+    def on_frame(index, frame):
+        if index == indices[-1]:
+            done.set()
+
+    blocked = 0.0
+    start = time.perf_counter()
+    for index in indices:
+        t = time.perf_counter()
+        if cached:
+            _, exact = preview.request(index, on_frame)
+            if exact and index == indices[-1]:
+                done.set()
+        else:
+            legacy_frame(cap, index)
+        blocked += time.perf_counter() - t
+        time.sleep(spacing)
+    if cached:
+        done.wait()
+    ready = time.perf_counter() - start
+    if preview:
+        preview.close()
+    cap.release()
+    return blocked, ready
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--size", default="1920x1080", help="WIDTHxHEIGHT (default: 1920x1080)")
+    parser.add_argument("--seconds", type=int, default=10, help="Clip length (default: 10)")
+    parser.add_argument("--fps", type=int, default=30)
+    parser.add_argument("--pause", type=float, default=0.15,
+                        help="Seconds between steps (default: 0.15)")
+    parser.add_argument("--drag-events", type=int, default=40,
+                        help="Timeline motion events in the drag case (default: 40)")
+    args = parser.parse_args(argv)
+
+    width, height = (int(v) for v in args.size.split("x"))
+    path = make_clip(width, height, args.fps, args.seconds)
+    indices = step_pattern(args.fps * args.seconds // 3, args.fps * args.seconds)
+
+    print(f"{len(indices)} steps on {args.size}, {args.pause * 1000:.0f} ms apart")
+    print(f"{'variant':<8} {'median ms':>10} {'p95 ms':>8} {'max ms':>8} {'cache hits':>11}")
+    for name, cached in (("legacy", False), ("cached", True)):
+        latencies, hits = run(path, indices, args.pause, cached)
+        latencies_ms = sorted(t * 1000 for t in latencies)
+        p95 = latencies_ms[int(len(latencies_ms) * 0.95)]
+        print(f"{name:<8} {statistics.median(latencies_ms):>10.1f} {p95:>8.1f} "
+              f"{latencies_ms[-1]:>8.1f} {hits:>11}")
+
+    print(f"\ndrag: {args.drag_events} motion events 10 ms apart across the clip")
+    print(f"{'variant':<8} {'blocked ms':>11} {'last frame ms':>14}")
+    for name, cached in (("legacy", False), ("request", True)):
+        blocked, ready = drag(path, args.drag_events, 0.01, cached)
+        print(f"{name:<8} {blocked * 1000:>11.1f} {ready * 1000:>14.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+"""Full-resolution stills vs. resizing during extraction.
+
+The two-pass workflow extracts full-resolution frames and downscales the
+files afterwards, which encodes, writes, reads and decodes every frame at
+full size before the small image is encoded again. The single pass sets
+ExtractionConfig.sizes, so only the small images are ever encoded; with
+several sizes every one of them is made from the same decoded frame.
+
+    python -m benchmarks.bench_resize
+    python -m benchmarks.bench_resize --width 3840 --height 2160 --seconds 4 --format jpg
+"""
+import argparse
+import glob
+import os
+import tempfile
+import time
+
+import cv2
+
+from frame_extractor.engine import ExtractionConfig, extract_frames
+from frame_extractor.resize import Resizer
+
+from .synthetic import make_clip
+
+SIZES = ((224, 224), (512, 512))
+
+
+def downscale_files(output_dir, sizes, aspect):
+    """Second pass of the two-pass workflow: read every still back and resize it"""
+    resizers = None
+    written = 0
+    for path in sorted(glob.glob(os.path.join(output_dir, "*.*"))):
+        if path.endswith(".json"):
+            continue
+        frame = cv2.imread(path)
+        if resizers is None:
+            height, width = frame.shape[:2]
+            resizers = [Resizer(width, height, size, aspect=aspect) for size in sizes]
+        stem, extension = os.path.splitext(os.path.basename(path))
+        for resizer in resizers:
+            folder = os.path.join(output_dir, resizer.label)
+            os.makedirs(folder, exist_ok=True)
+            out = os.path.join(folder, stem + extension)
+            cv2.imwrite(out, resizer(frame))
+            written += os.path.getsize(out)
+    return written
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--width", type=int, default=1920)
+    parser.add_argument("--height", type=int, default=1080)
+    parser.add_argument("--seconds", type=int, default=6)
+    parser.add_argument("--format", default="png", help="Image format (default: png)")
+    parser.add_argument("--aspect", default="fill", help="Aspect policy (default: fill)")
+    args = parser.parse_args(argv)
+
+    path = make_clip(args.width, args.height, 30, args.seconds)
+    common = dict(mode="all", image_format=args.format, aspect=args.aspect, resume=False)
+    labels = " + ".join(f"{w}x{h}" for w, h in SIZES)
+    print(f"{args.seconds}s {args.width}x{args.height} clip, all frames as {args.format}, "
+          f"{args.aspect} to {labels}")
+    print(f"{'variant':<34} {'seconds':>8} {'MB written':>11}")
+    with tempfile.TemporaryDirectory() as output_folder:
+        start = time.perf_counter()
+        full = extract_frames(ExtractionConfig(path, os.path.join(output_folder, "full"),
+                                               **common))
+        full_seconds = time.perf_counter() - start
+        print(f"{'extract full size':<34} {full_seconds:>8.2f} {full.bytes_written / 1e6:>11.1f}")
+        start = time.perf_counter()
+        small_bytes = downscale_files(full.output_dir, SIZES, args.aspect)
+        seconds = full_seconds + time.perf_counter() - start
+        print(f"{'  + downscale the files':<34} {seconds:>8.2f} "
+              f"{(full.bytes_written + small_bytes) / 1e6:>11.1f}")
+
+        for sizes in ((SIZES[0],), SIZES):
+            start = time.perf_counter()
+            result = extract_frames(ExtractionConfig(path, os.path.join(output_folder, "one"),
+                                                     sizes=sizes, **common))
+            seconds = time.perf_counter() - start
+            name = "extract at " + " + ".join(f"{w}x{h}" for w, h in sizes)
+            print(f"{name:<34} {seconds:>8.2f} {result.bytes_written / 1e6:>11.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+"""Compare the legacy read-everything loop with FrameScheduler.
+
+The legacy loop is the one extract_frames used before the scheduler: it
+calls cap.read() on every frame and tests membership in a Python list.
+Neither variant writes images, so the numbers isolate decode and frame
+selection cost.
+
+    python -m benchmarks.bench_scheduler               # 1 hour, 30 fps
+    python -m benchmarks.bench_scheduler --seconds 600
+"""
+import argparse
+import time
+
+import cv2
+
+from frame_extractor.scheduler import FrameScheduler
+
+from .synthetic import make_clip
+
+
+def legacy_loop(path, targets, limit=None):
+    cap = cv2.VideoCapture(path)
+    targets = list(targets)
+    frame_number = 0
+    selected = 0
+    start = time.perf_counter()
+    while limit is None or frame_number < limit:
+        ret, frame = cap.read()
+        if not ret:
+            break
+        if frame_number in targets:
+            selected += 1
+        frame_number += 1
+    elapsed = time.perf_counter() - start
+    cap.release()
+    return frame_number, selected, elapsed
+
+
+def scheduler_loop(path, targets, limit=None):
+    cap = cv2.VideoCapture(path)
+    if limit is not None:
+        targets = targets[:next((i for i, t in enumerate(targets) if t >= limit), len(targets))]
+    scheduler = FrameScheduler(targets)
+    start = time.perf_counter()
+    selected = sum(1 for _ in scheduler.frames(cap))
+    elapsed = time.perf_counter() - start
+    cap.release()
+    return scheduler.position, selected, elapsed
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--seconds", type=int, default=3600, help="Clip length (default: 3600)")
+    parser.add_argument("--fps", type=int, default=30)
+    parser.add_argument("--width", type=int, default=160)
+    parser.add_argument("--height", type=int, default=90)
+    parser.add_argument("--interval", type=float, default=1.0,
+                        help="Seconds between frames for the interval case")
+    parser.add_argument("--legacy-all-limit", type=int, default=20000,
+                        help="Frames decoded by the legacy loop in all-frames mode, which is "
+                             "O(n^2) and would otherwise take very long (0 = no limit)")
+    args = parser.parse_args(argv)
+
+    print(f"Generating/using {args.seconds}s synthetic clip at {args.width}x{args.height}...")
+    path = make_clip(args.width, args.height, args.fps, args.seconds)
+    cap = cv2.VideoCapture(path)
+    total = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
+    fps = cap.get(cv2.CAP_PROP_FPS)
+    cap.release()
+
+    step = max(1, int(fps * args.interval))
+    cases = [
+        (f"interval {args.interval}s", range(0, total, step), None),
+        ("all frames", range(total), args.legacy_all_limit or None),
+    ]
+    print(f"{'case':<16} {'variant':<10} {'frames':>8} {'selected':>9} {'seconds':>9} {'frames/s':>10}")
+    for name, targets, legacy_limit in cases:
+        results = {}
+        for variant, loop, limit in (("legacy", legacy_loop, legacy_limit),
+                                     ("scheduler", scheduler_loop, None)):
+            frames, selected, elapsed = loop(path, targets, limit)
+            results[variant] = frames / elapsed if elapsed else 0.0
+            print(f"{name:<16} {variant:<10} {frames:>8} {selected:>9} {elapsed:>9.2f} {results[variant]:>10.0f}")
+        if results["legacy"]:
+            print(f"{name:<16} speedup    {results['scheduler'] / results['legacy']:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+"""Cold-start time of the CLI and the two GUIs.
+
+Every measurement runs in a fresh interpreter, so module import costs are
+included. GUI timings need a display (and tkinter/Pillow); they are
+skipped with a note when one is not available.
+
+    python -m benchmarks.bench_startup --runs 5
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+GUI_SNIPPET = """
+import time
+start = time.perf_counter()
+import tkinter as tk
+from {module} import {cls}
+root = tk.Tk()
+app = {cls}(root)
+root.update()
+print(time.perf_counter() - start)
+root.destroy()
+"""
+
+GPU_SNIPPET = """
+import time
+start = time.perf_counter()
+from frame_extractor.gpu import {func}
+{func}()
+print(time.perf_counter() - start)
+"""
+
+CASES = [
+    ("interpreter", [sys.executable, "-c", "pass"], False),
+    ("cli --help", [sys.executable, "-m", "frame_extractor", "extract", "--help"], False),
+    ("gpu probe (cached)", [sys.executable, "-c", GPU_SNIPPET.format(func="load_cached_gpu_info")], True),
+    ("gpu probe (nvidia-smi)", [sys.executable, "-c", GPU_SNIPPET.format(func="probe_gpu")], True),
+    ("extractor window", [sys.executable, "-c", GUI_SNIPPET.format(module="main", cls="FrameExtractor")], True),
+    ("cropper window", [sys.executable, "-c", GUI_SNIPPET.format(module="video_cropper", cls="VideoCropper")], True),
+]
+
+
+def time_command(cmd, reports_time):
+    """Return seconds to first window/output, or raise CalledProcessError"""
+    start = time.perf_counter()
+    result = subprocess.run(cmd, cwd=REPO_ROOT, capture_output=True, text=True, check=True)
+    elapsed = time.perf_counter() - start
+    if reports_time:
+        return float(result.stdout.strip().splitlines()[-1])
+    return elapsed
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args(argv)
+
+    print(f"{'case':<24} {'median ms':>10} {'min ms':>8}")
+    for name, cmd, reports_time in CASES:
+        try:
+            samples = [time_command(cmd, reports_time) for _ in range(args.runs)]
+        except subprocess.CalledProcessError as e:
+            reason = (e.stderr or "").strip().splitlines()[-1:] or ["failed"]
+            print(f"{name:<24} {'skipped':>10}  ({reason[0]})")
+            continue
+        print(f"{name:<24} {1000 * statistics.median(samples):>10.0f} {1000 * min(samples):>8.0f}")
+    print("\nGUI and GPU rows are measured in-process (imports + construction), "
+          "excluding interpreter start.")
+
+
+if __name__ == "__main__":
+    main()
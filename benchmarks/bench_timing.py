@@ -0,0 +1,74 @@
+"""Overhead of per-stage timing on extraction and crop export.
+
+Each job runs alternately with timing off, with histograms only, and with
+trace events as well, and the median wall time of each variant is
+compared. The cost of a single StageTimer.record() call is measured on
+its own too.
+
+    python -m benchmarks.bench_timing
+    python -m benchmarks.bench_timing --width 1920 --height 1080 --seconds 10 --runs 7
+"""
+import argparse
+import statistics
+import tempfile
+import time
+
+from frame_extractor.cropper import CropConfig, export_crop
+from frame_extractor.engine import ExtractionConfig, extract_frames
+from frame_extractor.timing import StageTimer
+
+from .synthetic import make_clip
+
+VARIANTS = (("off", {}), ("timings", dict(timings=True)), ("trace", None))
+
+
+def record_cost(calls=200_000, trace=False):
+    """Seconds per record() call, including the clock read before it"""
+    timer = StageTimer(trace=trace)
+    start = time.perf_counter()
+    for _ in range(calls):
+        timer.record("decode", time.perf_counter())
+    return (time.perf_counter() - start) / calls
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--width", type=int, default=1280)
+    parser.add_argument("--height", type=int, default=720)
+    parser.add_argument("--seconds", type=int, default=10)
+    parser.add_argument("--runs", type=int, default=5, help="Runs per variant (default: 5)")
+    args = parser.parse_args(argv)
+
+    path = make_clip(args.width, args.height, 30, args.seconds)
+    print(f"record(): {record_cost() * 1e6:.2f} us, "
+          f"{record_cost(trace=True) * 1e6:.2f} us with trace events\n")
+
+    with tempfile.TemporaryDirectory() as output_folder:
+        trace_path = f"{output_folder}/trace.json"
+        jobs = {
+            "extract all frames (jpg)": lambda timing: extract_frames(ExtractionConfig(
+                path, output_folder, mode="all", image_format="jpg", resume=False, **timing)),
+            "crop export (opencv)": lambda timing: export_crop(CropConfig(
+                path, 0, 0, args.width // 2, args.height // 2, output_folder=output_folder,
+                encoder="opencv", **timing)),
+        }
+        print(f"{args.seconds}s {args.width}x{args.height} clip, median of {args.runs} runs")
+        print(f"{'job':<26} {'off s':>7} {'timings s':>10} {'trace s':>8} {'overhead':>9}")
+        for name, run in jobs.items():
+            times = {variant: [] for variant, _ in VARIANTS}
+            for _ in range(args.runs):
+                # Interleaved so that drift in machine load hits every variant alike
+                for variant, timing in VARIANTS:
+                    if timing is None:
+                        timing = dict(trace_path=trace_path)
+                    start = time.perf_counter()
+                    result = run(timing)
+                    times[variant].append(time.perf_counter() - start)
+            off, timed, traced = (statistics.median(times[variant]) for variant, _ in VARIANTS)
+            print(f"{name:<26} {off:>7.2f} {timed:>10.2f} {traced:>8.2f} "
+                  f"{(timed / off - 1) * 100:>+8.1f}%")
+            print(f"  {result.timings.summary()}")
+
+
+if __name__ == "__main__":
+    main()
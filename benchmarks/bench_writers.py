@@ -0,0 +1,108 @@
+"""Throughput and size of each output writer on a synthetic clip.
+
+Frames are decoded once up front, then each writer encodes and writes the
+same frames on a single thread, so the numbers are per-core costs.
+
+    python -m benchmarks.bench_writers
+    python -m benchmarks.bench_writers --width 3840 --height 2160 --frames 10
+"""
+import argparse
+import os
+import shutil
+import tempfile
+import time
+
+import cv2
+
+from frame_extractor.writers import (
+    BmpWriter,
+    JpegWriter,
+    NpyWriter,
+    PngWriter,
+    WebpWriter,
+)
+
+from .synthetic import make_clip
+
+
+def default_writers():
+    return [
+        PngWriter(),
+        PngWriter(0),
+        PngWriter(1),
+        PngWriter(3),
+        PngWriter(9),
+        WebpWriter(),
+        WebpWriter(90),
+        JpegWriter(95),
+        JpegWriter(85),
+        BmpWriter(),
+        NpyWriter(),
+    ]
+
+
+def load_frames(path, count):
+    cap = cv2.VideoCapture(path)
+    total = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
+    step = max(1, total // count)
+    frames = []
+    for index in range(0, total, step):
+        cap.set(cv2.CAP_PROP_POS_FRAMES, index)
+        ret, frame = cap.read()
+        if not ret or len(frames) == count:
+            break
+        frames.append(frame)
+    cap.release()
+    return frames
+
+
+def run(frames, writers, out_dir):
+    rows = []
+    for writer in writers:
+        start = time.perf_counter()
+        for i, frame in enumerate(frames):
+            writer.write(os.path.join(out_dir, f"frame_{i:06d}"), frame)
+        elapsed = time.perf_counter() - start
+        stats = writer.stats
+        rows.append({
+            "writer": writer.describe(),
+            "fps": stats.frames / elapsed if elapsed else 0.0,
+            "encode_ms": 1000 * stats.encode_seconds / stats.frames,
+            "kb_per_frame": stats.bytes_written / stats.frames / 1024,
+            "ratio": stats.bytes_written / sum(f.nbytes for f in frames),
+        })
+    return rows
+
+
+def format_table(rows):
+    lines = [
+        "| Writer | frames/s | encode ms/frame | KiB/frame | size vs raw |",
+        "|---|---:|---:|---:|---:|",
+    ]
+    for row in rows:
+        lines.append(f"| {row['writer']} | {row['fps']:.1f} | {row['encode_ms']:.1f} | "
+                     f"{row['kb_per_frame']:.0f} | {row['ratio']:.1%} |")
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--width", type=int, default=1920)
+    parser.add_argument("--height", type=int, default=1080)
+    parser.add_argument("--seconds", type=int, default=10)
+    parser.add_argument("--frames", type=int, default=30, help="Frames encoded per writer")
+    args = parser.parse_args(argv)
+
+    path = make_clip(args.width, args.height, 30, args.seconds)
+    frames = load_frames(path, args.frames)
+    out_dir = tempfile.mkdtemp(prefix="bench_writers_")
+    try:
+        rows = run(frames, default_writers(), out_dir)
+    finally:
+        shutil.rmtree(out_dir, ignore_errors=True)
+    print(f"{len(frames)} frames at {args.width}x{args.height}, one thread\n")
+    print(format_table(rows))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,360 @@
+"""Reproducible end-to-end benchmark suite with regression checks.
+
+`run` generates synthetic clips locally (see synthetic.py) in several
+resolutions, lengths and codecs. On each clip it times a plain decode
+pass, every extraction mode in every output format, and every crop export
+path. Each case runs in a fresh interpreter, so its peak RSS is its own
+and no cache or thread pool carries over from the case before. Every case
+is repeated; the median throughput and the highest peak RSS are kept.
+Every case also runs with a StageTimer (see frame_extractor/timing.py),
+and the count, total and percentiles of each stage (decode, seek, crop,
+resize, encode, write...) are kept, medians over the runs, so a change
+in throughput can be traced to the stage that caused it. The results,
+with a description of the machine, are written as JSON.
+
+`compare` reads two result files and flags every case that got slower or
+grew in memory beyond a tolerance, exiting with status 1 if any did. Keep
+a result file from a known-good commit as the baseline and compare later
+runs on the same machine against it:
+
+    python -m benchmarks.suite run --output baseline.json
+    python -m benchmarks.suite run --output current.json --baseline baseline.json
+    python -m benchmarks.suite compare baseline.json current.json --tolerance 15
+    python -m benchmarks.suite run --profile quick --cases "extract-all-*"
+
+ffmpeg crop paths are recorded as skipped when ffmpeg is not on PATH.
+"""
+import argparse
+import datetime
+import fnmatch
+import json
+import os
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+import cv2
+import numpy as np
+
+from frame_extractor.cropper import CropConfig, export_crop
+from frame_extractor.encoders import find_ffmpeg
+from frame_extractor.engine import ExtractionConfig, extract_frames
+from frame_extractor.options import FORMATS, MODES
+from frame_extractor.timing import StageTimer
+
+from .synthetic import make_clip
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SCHEMA = 2  # 2: stages are per-stage histogram summaries
+
+# (width, height, fps, seconds, codec, extension)
+PROFILES = {
+    "quick": [
+        (1280, 720, 30, 4, "mp4v", ".mp4"),
+    ],
+    "standard": [
+        (1280, 720, 30, 6, "mp4v", ".mp4"),
+        (1280, 720, 30, 6, "MJPG", ".avi"),  # intra-only: every seek lands on a keyframe
+        (1920, 1080, 30, 3, "mp4v", ".mp4"),
+        (3840, 2160, 30, 1, "mp4v", ".mp4"),
+    ],
+}
+
+CROP_PATHS = ("opencv", "ffmpeg-pipe", "ffmpeg-filter", "ffmpeg-copy")
+
+DEFAULT_TOLERANCE = 10  # percent
+
+
+def clip_name(clip):
+    width, height, fps, seconds, codec, _ = clip
+    return f"{width}x{height}_{fps}fps_{seconds}s_{codec}"
+
+
+def case_names():
+    """Names of the cases run on every clip"""
+    names = ["decode"]
+    names += [f"extract-{mode}-{image_format}" for mode in MODES for image_format in FORMATS]
+    names += [f"crop-{path}" for path in CROP_PATHS]
+    return names
+
+
+def peak_rss():
+    """Peak resident set size of this process in bytes, or None where it cannot be read"""
+    try:
+        import resource
+    except ImportError:
+        return None  # Windows
+    # ru_maxrss is KiB on Linux, bytes on macOS
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return rss if sys.platform == "darwin" else rss * 1024
+
+
+def crop_config(name, path, width, height, output_folder):
+    """CropConfig that takes the crop export path called name"""
+    centre = dict(x=width // 4, y=height // 4, width=width // 2, height=height // 2)
+    if name == "opencv":
+        return CropConfig(path, output_folder=output_folder, encoder="opencv", **centre)
+    if name == "ffmpeg-pipe":
+        # use_gpu without CUDA still routes frames through Python, i.e. the pipe
+        return CropConfig(path, output_folder=output_folder, encoder="ffmpeg", use_gpu=True,
+                          **centre)
+    if name == "ffmpeg-filter":
+        return CropConfig(path, output_folder=output_folder, encoder="ffmpeg", **centre)
+    # The full frame of the second half of the clip: a keyframe-aligned stream copy
+    cap = cv2.VideoCapture(path)
+    frames = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
+    cap.release()
+    return CropConfig(path, output_folder=output_folder, encoder="ffmpeg",
+                      start_frame=frames // 2)
+
+
+def decode(path, timer=None):
+    """Read every frame sequentially; return (frames, seconds)"""
+    cap = cv2.VideoCapture(path)
+    frames = 0
+    buffer = None
+    start = time.perf_counter()
+    while True:
+        frame_start = time.perf_counter() if timer is not None else None
+        ret, buffer = cap.read(image=buffer)
+        if not ret:
+            break
+        if timer is not None:
+            timer.record("decode", frame_start)
+        frames += 1
+    elapsed = time.perf_counter() - start
+    cap.release()
+    return frames, elapsed
+
+
+def run_case(name, path, width, height):
+    """Run one case in this process and return its measurements"""
+    output_folder = tempfile.mkdtemp(prefix="bench_suite_")
+    try:
+        start = time.perf_counter()
+        if name == "decode":
+            timer = StageTimer()
+            frames, _ = decode(path, timer)
+            bytes_written = 0
+        elif name.startswith("extract-"):
+            _, mode, image_format = name.split("-")
+            result = extract_frames(ExtractionConfig(path, output_folder, mode=mode,
+                                                     image_format=image_format, resume=False,
+                                                     timings=True))
+            frames = result.extracted_count
+            bytes_written = result.bytes_written
+            timer = result.timings
+        else:
+            config = crop_config(name[len("crop-"):], path, width, height, output_folder)
+            config.timings = True
+            result = export_crop(config)
+            frames = result.frames_written
+            bytes_written = result.bytes_written
+            timer = result.timings
+        elapsed = time.perf_counter() - start
+    finally:
+        shutil.rmtree(output_folder, ignore_errors=True)
+    return {
+        "frames": frames,
+        "seconds": elapsed,
+        "fps": frames / elapsed if elapsed else 0.0,
+        "bytes_written": bytes_written,
+        "peak_rss": peak_rss(),
+        "stages": timer.to_dict() if timer is not None else {},
+    }
+
+
+def run_isolated(name, path, width, height):
+    """Run one case in a fresh interpreter and return its measurements"""
+    command = [sys.executable, "-m", "benchmarks.suite", "case", name, path,
+               str(width), str(height)]
+    proc = subprocess.run(command, cwd=REPO_ROOT, capture_output=True, text=True)
+    if proc.returncode != 0:
+        lines = proc.stderr.strip().splitlines()
+        raise RuntimeError(lines[-1] if lines else f"exit status {proc.returncode}")
+    return json.loads(proc.stdout.strip().splitlines()[-1])
+
+
+def summarize(runs):
+    """Combine repeated runs: median fps and seconds, highest peak RSS, median stage times"""
+    rss = [run["peak_rss"] for run in runs if run["peak_rss"] is not None]
+    stages = {}
+    for stage, first in runs[0]["stages"].items():
+        # A stage such as "seek" can be missing from a run that never needed it
+        values = [run["stages"][stage] for run in runs if stage in run["stages"]]
+        stages[stage] = {field: statistics.median(value[field] for value in values)
+                         for field in first}
+    return {
+        "frames": runs[0]["frames"],
+        "seconds": statistics.median(run["seconds"] for run in runs),
+        "fps": statistics.median(run["fps"] for run in runs),
+        "bytes_written": runs[0]["bytes_written"],
+        "peak_rss": max(rss) if rss else None,
+        "stages": stages,
+        "runs": [run["fps"] for run in runs],
+    }
+
+
+def busiest_stages(stages, count=3):
+    """The stages with the largest total time and their share of all stage time"""
+    total = sum(stage["total"] for stage in stages.values())
+    ranked = sorted(stages.items(), key=lambda item: -item[1]["total"])[:count]
+    return ", ".join(f"{name} {stage['total'] / total:.0%}" for name, stage in ranked) if total else ""
+
+
+def machine_info():
+    return {
+        "platform": platform.platform(),
+        "processor": platform.processor() or platform.machine(),
+        "cpu_count": os.cpu_count(),
+        "python": platform.python_version(),
+        "opencv": cv2.__version__,
+        "numpy": np.__version__,
+        "ffmpeg": find_ffmpeg() is not None,
+    }
+
+
+def run_suite(profile, patterns, repeat):
+    """Run every selected case of profile and return the results document"""
+    has_ffmpeg = find_ffmpeg() is not None
+    results = {}
+    print(f"{'case':<44} {'frames':>7} {'fps':>9} {'peak RSS MB':>12}  busiest stages")
+    for clip in PROFILES[profile]:
+        width, height = clip[:2]
+        prefix = clip_name(clip)
+        names = [name for name in case_names()
+                 if not patterns or any(fnmatch.fnmatch(name, p) for p in patterns)]
+        if not names:
+            continue
+        path = make_clip(*clip[:4], codec=clip[4], ext=clip[5])
+        for name in names:
+            key = f"{prefix}/{name}"
+            if name.startswith("crop-ffmpeg") and not has_ffmpeg:
+                results[key] = {"skipped": "ffmpeg not found on PATH"}
+                print(f"{key:<44} skipped: ffmpeg not found on PATH")
+                continue
+            try:
+                runs = [run_isolated(name, path, width, height) for _ in range(repeat)]
+            except RuntimeError as e:
+                results[key] = {"error": str(e)}
+                print(f"{key:<44} failed: {e}")
+                continue
+            result = results[key] = summarize(runs)
+            rss = f"{result['peak_rss'] / 2**20:.0f}" if result["peak_rss"] is not None else "-"
+            print(f"{key:<44} {result['frames']:>7} {result['fps']:>9.1f} {rss:>12}  "
+                  f"{busiest_stages(result['stages'])}")
+    return {
+        "schema": SCHEMA,
+        "created": datetime.datetime.now(datetime.timezone.utc).isoformat(timespec="seconds"),
+        "profile": profile,
+        "repeat": repeat,
+        "machine": machine_info(),
+        "results": results,
+    }
+
+
+def compare(baseline, current, tolerance):
+    """Print a comparison of two results documents; return the number of regressions.
+
+    A case regresses when its fps drops, or its peak RSS grows, by more
+    than tolerance percent. A case that fails in current but ran in
+    baseline counts as a regression too.
+    """
+    if baseline["machine"] != current["machine"]:
+        print("Warning: the results come from different machines or library versions; "
+              "differences may not be caused by the code.\n")
+    regressions = 0
+    print(f"{'case':<44} {'base fps':>9} {'fps':>9} {'change':>8} "
+          f"{'base MB':>8} {'MB':>8} {'change':>8}")
+    for key, old in baseline["results"].items():
+        new = current["results"].get(key)
+        if new is None or "fps" not in old:
+            continue
+        if "fps" not in new:
+            regressions += "error" in new
+            print(f"{key:<44} {new.get('error') or new.get('skipped')}")
+            continue
+        fps_change = (new["fps"] / old["fps"] - 1) * 100 if old["fps"] else 0.0
+        flags = []
+        if fps_change < -tolerance:
+            flags.append("SLOWER")
+        rss_cells = f"{'-':>8} {'-':>8} {'':>8}"
+        if old["peak_rss"] and new["peak_rss"]:
+            rss_change = (new["peak_rss"] / old["peak_rss"] - 1) * 100
+            rss_cells = (f"{old['peak_rss'] / 2**20:>8.0f} {new['peak_rss'] / 2**20:>8.0f} "
+                         f"{rss_change:>+7.1f}%")
+            if rss_change > tolerance:
+                flags.append("MORE MEMORY")
+        regressions += bool(flags)
+        print(f"{key:<44} {old['fps']:>9.1f} {new['fps']:>9.1f} {fps_change:>+7.1f}% "
+              f"{rss_cells} {' '.join(flags)}")
+    missing = sorted(set(current["results"]) - set(baseline["results"]))
+    if missing:
+        print(f"\n{len(missing)} case(s) not in the baseline: {', '.join(missing)}")
+    print(f"\n{regressions} regression(s) beyond {tolerance:g}%")
+    return regressions
+
+
+def load(path):
+    with open(path, encoding="utf-8") as f:
+        document = json.load(f)
+    if document.get("schema") != SCHEMA:
+        raise SystemExit(f"{path}: unsupported results schema {document.get('schema')}")
+    return document
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run = commands.add_parser("run", help="Run the suite and write the results as JSON")
+    run.add_argument("--profile", choices=sorted(PROFILES), default="standard",
+                     help="Set of clips to run on (default: standard)")
+    run.add_argument("--cases", action="append", metavar="PATTERN",
+                     help="Only run cases matching this glob, e.g. 'crop-*' (repeatable)")
+    run.add_argument("--repeat", type=int, default=3,
+                     help="Runs per case; the median is kept (default: 3)")
+    run.add_argument("--output", default="benchmark_results.json",
+                     help="Results file (default: benchmark_results.json)")
+    run.add_argument("--baseline", help="Compare with this results file afterwards")
+    run.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE,
+                     help=f"Percent change flagged as a regression (default: {DEFAULT_TOLERANCE})")
+
+    cmp = commands.add_parser("compare", help="Flag regressions between two results files")
+    cmp.add_argument("baseline")
+    cmp.add_argument("current")
+    cmp.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE,
+                     help=f"Percent change flagged as a regression (default: {DEFAULT_TOLERANCE})")
+
+    # Internal: one case in this interpreter, measurements printed as JSON
+    case = commands.add_parser("case")
+    case.add_argument("name")
+    case.add_argument("path")
+    case.add_argument("width", type=int)
+    case.add_argument("height", type=int)
+    args = parser.parse_args(argv)
+
+    if args.command == "case":
+        print(json.dumps(run_case(args.name, args.path, args.width, args.height)))
+        return 0
+    if args.command == "compare":
+        return 1 if compare(load(args.baseline), load(args.current), args.tolerance) else 0
+
+    if args.repeat < 1:
+        parser.error("--repeat must be at least 1")
+    document = run_suite(args.profile, args.cases, args.repeat)
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(document, f, indent=2)
+    print(f"\nResults written to {args.output}")
+    if args.baseline:
+        print()
+        return 1 if compare(load(args.baseline), document, args.tolerance) else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
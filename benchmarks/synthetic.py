@@ -0,0 +1,86 @@
+"""Synthetic test clips generated locally with cv2.VideoWriter.
+
+Clips are cached in a temp directory keyed by their parameters so repeated
+benchmark runs do not pay for generation again.
+"""
+import os
+import tempfile
+
+import cv2
+import numpy as np
+
+CACHE_DIR = os.path.join(tempfile.gettempdir(), "frame_extractor_bench")
+
+
+def clip_path(width, height, fps, seconds, codec="mp4v", ext=".mp4"):
+    name = f"synthetic_{width}x{height}_{fps}fps_{seconds}s_{codec}{ext}"
+    return os.path.join(CACHE_DIR, name)
+
+
+def make_clip(width=320, height=180, fps=30, seconds=10, codec="mp4v", ext=".mp4"):
+    """Return the path of a synthetic clip, generating it if needed.
+
+    Every frame has a moving gradient plus the frame number drawn on it, so
+    consecutive frames differ and encoders cannot collapse them.
+    """
+    path = clip_path(width, height, fps, seconds, codec, ext)
+    if os.path.exists(path):
+        return path
+    os.makedirs(CACHE_DIR, exist_ok=True)
+
+    tmp_path = path + ".part" + ext
+    out = cv2.VideoWriter(tmp_path, cv2.VideoWriter.fourcc(*codec), fps, (width, height))
+    if not out.isOpened():
+        raise RuntimeError(f"Could not create synthetic clip with codec {codec}")
+
+    x = np.arange(width, dtype=np.uint16)
+    y = np.arange(height, dtype=np.uint16)[:, None]
+    frame = np.empty((height, width, 3), dtype=np.uint8)
+    scale = max(height / 360, 0.4)
+    for i in range(int(fps * seconds)):
+        phase = i & 0xFF
+        frame[..., 0] = (x + phase) & 0xFF
+        frame[..., 1] = (y + 2 * phase) & 0xFF
+        frame[..., 2] = (x // 2 + y // 2 + 3 * phase) & 0xFF
+        cv2.putText(frame, str(i), (8, int(40 * scale) + 8), cv2.FONT_HERSHEY_SIMPLEX,
+                    scale, (255, 255, 255), max(1, int(2 * scale)))
+        out.write(frame)
+    out.release()
+    os.replace(tmp_path, path)
+    return path
+
+
+def make_slides_clip(width=1280, height=720, fps=30, seconds=60, slide_seconds=5, codec="mp4v"):
+    """Return the path of a lecture-style clip, generating it if needed.
+
+    The picture changes every slide_seconds and is otherwise static apart
+    from light per-frame noise, like a camera pointed at a projector.
+    """
+    path = os.path.join(CACHE_DIR, f"slides_{width}x{height}_{fps}fps_{seconds}s_"
+                                   f"{slide_seconds}s_{codec}.mp4")
+    if os.path.exists(path):
+        return path
+    os.makedirs(CACHE_DIR, exist_ok=True)
+
+    tmp_path = path + ".part.mp4"
+    out = cv2.VideoWriter(tmp_path, cv2.VideoWriter.fourcc(*codec), fps, (width, height))
+    if not out.isOpened():
+        raise RuntimeError(f"Could not create synthetic clip with codec {codec}")
+
+    rng = np.random.default_rng(0)
+    scale = max(height / 360, 0.4)
+    slide = None
+    for i in range(int(fps * seconds)):
+        if i % int(fps * slide_seconds) == 0:
+            number = i // int(fps * slide_seconds)
+            slide = np.full((height, width, 3), 235, dtype=np.uint8)
+            for line in range(6):
+                y = int((60 + 45 * line) * scale)
+                cv2.putText(slide, f"Slide {number} line {line} " + "x" * int(rng.integers(5, 30)),
+                            (int(20 * scale), y), cv2.FONT_HERSHEY_SIMPLEX, 0.7 * scale,
+                            (40, 40, 40), max(1, int(scale)))
+        noise = rng.integers(-3, 4, size=(height, width, 1), dtype=np.int16)
+        out.write(np.clip(slide + noise, 0, 255).astype(np.uint8))
+    out.release()
+    os.replace(tmp_path, path)
+    return path
@@ -0,0 +1,35 @@
+"""Headless frame extraction engine shared by the GUI and the command line.
+
+Attributes are loaded on first use so that importing the package (for
+example to build the CLI parser) does not pay for importing cv2.
+"""
+import importlib
+
+_EXPORTS = {
+    "ExtractionConfig": ".engine",
+    "ExtractionError": ".engine",
+    "ExtractionResult": ".engine",
+    "extract_frames": ".engine",
+    "ShardReader": ".containers",
+    "CropConfig": ".cropper",
+    "export_crop": ".cropper",
+    "find_videos": ".batch",
+    "extract_batch": ".batch",
+    "export_crop_batch": ".batch",
+    "FrameStream": ".stream",
+    "iter_frames": ".stream",
+}
+
+__all__ = sorted(_EXPORTS)
+
+
+def __getattr__(name):
+    if name not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(_EXPORTS[name], __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(list(globals()) + __all__)
@@ -0,0 +1,16 @@
+"""Per-user cache directory shared by the extractor and the cropper."""
+import os
+import sys
+
+
+def cache_dir(*parts):
+    """Return (and create) a directory under the per-user cache folder"""
+    if sys.platform == "win32":
+        base = os.environ.get("LOCALAPPDATA") or os.path.expanduser("~\\AppData\\Local")
+    elif sys.platform == "darwin":
+        base = os.path.expanduser("~/Library/Caches")
+    else:
+        base = os.environ.get("XDG_CACHE_HOME") or os.path.expanduser("~/.cache")
+    path = os.path.join(base, "frame-extractor", *parts)
+    os.makedirs(path, exist_ok=True)
+    return path
@@ -0,0 +1,194 @@
+"""Batch extraction and crop export over many videos.
+
+find_videos() expands a mix of files, directories and glob patterns into
+a list of videos. extract_batch() and export_crop_batch() then run one
+job per video on a pool of `jobs` threads. OpenCV releases the GIL while
+decoding and encoding, so jobs overlap on threads without extra processes.
+
+The machine is shared out between concurrent jobs rather than
+oversubscribed: each extraction job gets cpu_count // jobs writer threads
+and memory_budget // jobs bytes of decoded frames in flight, so the batch
+as a whole stays within memory_budget however many jobs run. A crop
+export holds a single decoded frame at a time, and its ffmpeg encoder
+gets cpu_count // jobs threads unless the template sets them. So does the
+PyAV decoder of either kind of job. Larger files are started first so
+that one long video does not run on its own at the end.
+
+Every video gets a BatchItem. A job that raises is recorded as failed and
+the rest of the batch carries on. Videos that were not started, or were
+stopped part-way, when the batch is cancelled are marked skipped.
+
+A template trace_path names a folder; each video's trace is written there
+as <video name>.trace.json.
+"""
+import glob
+import os
+import threading
+import time
+from dataclasses import dataclass, replace
+
+from .cropper import export_crop, file_size
+from .engine import extract_frames
+from .options import VIDEO_EXTENSIONS
+from .pipeline import DEFAULT_MEMORY_BUDGET, default_workers
+
+
+@dataclass
+class BatchItem:
+    """Outcome of one video in a batch"""
+    video_path: str
+    result: object = None  # ExtractionResult or CropResult
+    error: str = None
+    skipped: bool = False
+    seconds: float = 0.0
+
+    @property
+    def ok(self):
+        return self.error is None and not self.skipped
+
+
+def find_videos(inputs):
+    """Expand files, directories and glob patterns into a list of video paths.
+
+    Directories contribute the files with a VIDEO_EXTENSIONS extension
+    (not recursively); plain paths are kept even if they do not exist so
+    they are reported as failures. Duplicates are dropped.
+    """
+    videos = []
+    seen = set()
+    for item in inputs:
+        if os.path.isdir(item):
+            matches = sorted(os.path.join(item, name) for name in os.listdir(item)
+                             if os.path.splitext(name)[1].lower() in VIDEO_EXTENSIONS)
+        elif any(ch in item for ch in "*?["):
+            matches = sorted(path for path in glob.glob(item, recursive=True)
+                             if os.path.isfile(path))
+        else:
+            matches = [item]
+        for path in matches:
+            key = os.path.normcase(os.path.abspath(path))
+            if key not in seen:
+                seen.add(key)
+                videos.append(path)
+    return videos
+
+
+def run_batch(configs, run_job, jobs=1, output_of=None, on_item=None, should_cancel=None):
+    """Run run_job(config, should_cancel) for every config on `jobs` threads.
+
+    output_of(config), if given, names each job's output; a job whose
+    output clashes with an earlier one fails instead of overwriting it.
+    on_item(item, finished, total) is called from the job thread as each
+    video finishes. Returns the BatchItems in the order of configs.
+    """
+    items = [BatchItem(config.video_path) for config in configs]
+    total = len(items)
+    if output_of is not None:
+        owners = {}
+        for item, config in zip(items, configs):
+            key = os.path.normcase(os.path.abspath(output_of(config)))
+            if key in owners:
+                item.error = f"Output clashes with {owners[key]}"
+            else:
+                owners[key] = item.video_path
+
+    order = iter(sorted(range(total), key=lambda i: -file_size(items[i].video_path)))
+    finished = 0
+    lock = threading.Lock()
+
+    def worker():
+        nonlocal finished
+        while True:
+            with lock:
+                index = next(order, None)
+            if index is None:
+                return
+            item = items[index]
+            if item.error is None:
+                if should_cancel and should_cancel():
+                    item.skipped = True
+                else:
+                    start = time.perf_counter()
+                    try:
+                        item.result = run_job(configs[index], should_cancel)
+                        # A job stopped part-way by the cancel counts as skipped, not done
+                        item.skipped = bool(getattr(item.result, "cancelled", False))
+                    except Exception as e:
+                        item.error = str(e) or type(e).__name__
+                    item.seconds = time.perf_counter() - start
+            with lock:
+                finished += 1
+                count = finished
+            if on_item:
+                on_item(item, count, total)
+
+    threads = [threading.Thread(target=worker, name=f"batch-job-{i}", daemon=True)
+               for i in range(max(1, min(jobs, total)))]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return items
+
+
+def _job_config(template, video):
+    """Copy of template for one video, with its own trace file"""
+    config = replace(template, video_path=video)
+    if template.trace_path:
+        os.makedirs(template.trace_path, exist_ok=True)
+        name = os.path.splitext(os.path.basename(video))[0] + ".trace.json"
+        config.trace_path = os.path.join(template.trace_path, name)
+    return config
+
+
+def _decode_threads(template, parallel):
+    """PyAV decoder threads for each of `parallel` concurrent jobs, unless the template sets them"""
+    if template.decode_threads or template.decoder != "pyav" or parallel == 1:
+        return template.decode_threads
+    return max(1, default_workers() // parallel)
+
+
+def extract_batch(template, videos, jobs=1, memory_budget=DEFAULT_MEMORY_BUDGET,
+                  progress=None, on_item=None, should_cancel=None):
+    """Extract frames from every video with the settings of template (an ExtractionConfig).
+
+    progress(video_path, snapshot) receives each job's progress snapshots.
+    """
+    parallel = max(1, min(jobs, len(videos))) * template.processes
+    workers = template.workers or max(1, default_workers() // parallel)
+    job_template = replace(template, workers=workers,
+                           memory_budget=max(1, memory_budget // parallel),
+                           decode_threads=_decode_threads(template, parallel))
+    configs = [_job_config(job_template, video) for video in videos]
+
+    def run(config, cancel):
+        callback = None
+        if progress:
+            def callback(snapshot):
+                progress(config.video_path, snapshot)
+        return extract_frames(config, callback, cancel)
+
+    return run_batch(configs, run, jobs, lambda config: config.output_dir,
+                     on_item, should_cancel)
+
+
+def export_crop_batch(template, videos, jobs=1, progress=None, on_item=None, should_cancel=None):
+    """Crop every video with the rectangle and settings of template (a CropConfig).
+
+    progress(video_path, snapshot) receives each job's progress snapshots.
+    """
+    parallel = max(1, min(jobs, len(videos)))
+    threads = template.threads or (max(1, default_workers() // parallel) if parallel > 1 else 0)
+    job_template = replace(template, threads=threads,
+                           decode_threads=_decode_threads(template, parallel))
+    configs = [_job_config(job_template, video) for video in videos]
+
+    def run(config, cancel):
+        callback = None
+        if progress:
+            def callback(snapshot):
+                progress(config.video_path, snapshot)
+        return export_crop(config, callback, cancel)
+
+    return run_batch(configs, run, jobs, lambda config: config.output_path,
+                     on_item, should_cancel)
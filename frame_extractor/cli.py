@@ -0,0 +1,356 @@
+"""Command line interface: ``frame-extractor extract VIDEO...`` and ``frame-extractor crop VIDEO...``"""
+import argparse
+import os
+import sys
+
+from .options import (ASPECTS, CODECS, CONTAINERS, DECODERS, DEFAULT_CRF,
+                      DEFAULT_DEDUP_THRESHOLD, DEFAULT_PRESET, ENCODERS, FORMATS, INTERPOLATIONS,
+                      MODES, PRESETS, SEEK_POLICIES, THREAD_TYPES, bound_fields, parse_position,
+                      parse_rect, parse_size)
+
+
+def _progress_printer(label):
+    def print_progress(snapshot):
+        line = f"{label}... {snapshot.format()}"
+        if sys.stderr.isatty():
+            sys.stderr.write(f"\r{line}\x1b[K")
+            if snapshot.finished:
+                sys.stderr.write("\n")
+        else:
+            sys.stderr.write(line + "\n")
+        sys.stderr.flush()
+    return print_progress
+
+
+def _position(text):
+    """argparse type for --start/--end"""
+    try:
+        return parse_position(text)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid position {text!r}; use SECONDS, "
+                                         "[HH:]MM:SS[.ms] or a frame number like 2700f")
+
+
+def _rect(text):
+    """argparse type for --rect"""
+    try:
+        return parse_rect(text)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid rectangle {text!r}; use X,Y,WIDTH,HEIGHT")
+
+
+def _size(text):
+    """argparse type for --size"""
+    try:
+        return parse_size(text)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid size {text!r}; use WIDTHxHEIGHT")
+
+
+def _add_range_arguments(parser):
+    parser.add_argument("--start", type=_position, default=None, metavar="POSITION",
+                        help="Start of the range to process: seconds, [HH:]MM:SS[.ms], or a "
+                             "frame number such as 2700f (default: the first frame)")
+    parser.add_argument("--end", type=_position, default=None, metavar="POSITION",
+                        help="End of the range, exclusive, in the same forms as --start "
+                             "(default: the last frame)")
+
+
+def _add_decoder_arguments(parser):
+    parser.add_argument("--decoder", choices=DECODERS, default="opencv",
+                        help="Decode with OpenCV, or with PyAV (pip install av) for decoder "
+                             "threading control and exact timestamps (default: opencv)")
+    parser.add_argument("--decode-threads", type=int, default=0, metavar="N",
+                        help="PyAV decoder threads (default: 0 = FFmpeg decides)")
+    parser.add_argument("--thread-type", choices=THREAD_TYPES, default="auto",
+                        help="PyAV threading: frame (fastest for sequential reads), slice "
+                             "(no extra latency after a seek) or auto, both (default: auto)")
+
+
+def _add_timing_arguments(parser):
+    parser.add_argument("--timings", action="store_true",
+                        help="Time every stage of every frame and print a one-line summary "
+                             "of the per-stage latencies at the end")
+    parser.add_argument("--trace", default=None, metavar="FILE",
+                        help="Also write the stage timings as Chrome trace JSON for "
+                             "chrome://tracing or ui.perfetto.dev (a folder for batches)")
+
+
+def _is_batch(inputs):
+    """More than one input, or a directory or glob, is run as a batch"""
+    return len(inputs) > 1 or os.path.isdir(inputs[0]) or any(ch in inputs[0] for ch in "*?[")
+
+
+def _run_batch(inputs, run, describe):
+    """Run a batch, printing one line per video; return the exit code"""
+    from .batch import find_videos
+
+    videos = find_videos(inputs)
+    if not videos:
+        print("Error: no videos found", file=sys.stderr)
+        return 1
+
+    def on_item(item, finished, total):
+        if item.ok:
+            status = f"ok      {item.video_path}: {describe(item.result)} ({item.seconds:.1f}s)"
+        elif item.skipped:
+            status = f"skipped {item.video_path}"
+        else:
+            status = f"FAILED  {item.video_path}: {item.error}"
+        print(f"[{finished}/{total}] {status}", flush=True)
+        if item.ok and item.result.timings:
+            print(f"    {item.result.timings.summary()}", flush=True)
+
+    try:
+        items = run(videos, on_item)
+    except KeyboardInterrupt:
+        print("\nBatch cancelled", file=sys.stderr)
+        return 130
+    failed = [item for item in items if not item.ok]
+    print(f"{len(items) - len(failed)}/{len(items)} videos done"
+          + (f", {len(failed)} failed" if failed else ""))
+    return 1 if failed else 0
+
+
+def cmd_extract(args):
+    # Imported here so --help and argument errors do not wait for cv2
+    from .engine import ExtractionConfig, ExtractionError, extract_frames
+
+    if args.progress_interval is None:
+        args.progress_interval = 0.2 if sys.stderr.isatty() else 5.0
+    config = ExtractionConfig(
+        video_path=args.videos[0],
+        output_folder=args.output,
+        mode=args.mode,
+        interval=args.interval,
+        frame_count=args.count,
+        seek=args.seek,
+        decoder=args.decoder,
+        decode_threads=args.decode_threads,
+        thread_type=args.thread_type,
+        crop=args.rect,
+        sizes=tuple(args.size) if args.size else None,
+        scale=args.scale,
+        aspect=args.aspect,
+        interpolation=args.interpolation,
+        workers=args.workers,
+        memory_budget=args.memory_budget * 1024 * 1024,
+        processes=args.processes,
+        image_format=args.format,
+        quality=args.quality,
+        png_compression=args.png_level,
+        container=args.container,
+        shard_size=args.shard_size * 1024 * 1024,
+        progress_interval=args.progress_interval,
+        resume=not args.no_resume,
+        dedup=args.dedup,
+        timings=args.timings,
+        trace_path=args.trace,
+        use_gpu=args.gpu,
+        **bound_fields(args.start, args.end),
+    )
+
+    if _is_batch(args.videos):
+        from .batch import extract_batch
+        return _run_batch(
+            args.videos,
+            lambda videos, on_item: extract_batch(config, videos, args.jobs,
+                                                  config.memory_budget, on_item=on_item),
+            lambda result: f"{result.extracted_count} frames to {result.output_dir}"
+                           + (f", {result.dropped_count} duplicates dropped"
+                              if result.dropped_count else ""))
+
+    progress = None if args.quiet else _progress_printer("Extracting frames")
+    try:
+        result = extract_frames(config, progress=progress)
+    except (ValueError, ExtractionError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+    except KeyboardInterrupt:
+        print("\nExtraction cancelled", file=sys.stderr)
+        return 130
+    extra = ""
+    if result.reused_count:
+        extra += f", {result.reused_count} reused"
+    if result.dropped_count:
+        extra += f", {result.dropped_count} duplicates dropped"
+    print(f"Extracted {result.extracted_count} frames to {result.output_dir} "
+          f"({result.bytes_written / 1e6:.1f} MB, {result.encode_seconds:.1f}s encoding{extra})")
+    if result.timings:
+        print(result.timings.summary())
+    return 0
+
+
+def cmd_crop(args):
+    from .cropper import CropConfig, export_crop
+    from .engine import ExtractionError
+
+    if args.progress_interval is None:
+        args.progress_interval = 0.2 if sys.stderr.isatty() else 5.0
+    x, y, width, height = args.rect
+    config = CropConfig(
+        video_path=args.videos[0],
+        x=x, y=y, width=width, height=height,
+        output_folder=args.output,
+        codec=args.codec,
+        encoder=args.encoder,
+        crf=args.crf,
+        preset=args.preset,
+        threads=args.threads,
+        decoder=args.decoder,
+        decode_threads=args.decode_threads,
+        thread_type=args.thread_type,
+        stream_copy=not args.reencode,
+        progress_interval=args.progress_interval,
+        timings=args.timings,
+        trace_path=args.trace,
+        use_gpu=args.gpu,
+        **bound_fields(args.start, args.end),
+    )
+
+    if _is_batch(args.videos):
+        from .batch import export_crop_batch
+        return _run_batch(
+            args.videos,
+            lambda videos, on_item: export_crop_batch(config, videos, args.jobs, on_item=on_item),
+            lambda result: f"{result.frames_written} frames to {result.output_path}")
+
+    progress = None if args.quiet else _progress_printer("Exporting cropped video")
+    try:
+        result = export_crop(config, progress=progress)
+    except (ValueError, ExtractionError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+    except KeyboardInterrupt:
+        print("\nExport cancelled", file=sys.stderr)
+        return 130
+    print(f"Wrote {result.frames_written} frames to {result.output_path} "
+          f"({result.bytes_written / 1e6:.1f} MB, {result.encoder})")
+    if result.timings:
+        print(result.timings.summary())
+    return 0
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="frame-extractor",
+                                     description="Extract frames from video files.")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    extract = sub.add_parser("extract", help="Extract frames from one or more videos")
+    extract.add_argument("videos", nargs="+", metavar="VIDEO",
+                         help="Input video; several videos, a directory or a glob "
+                              "pattern runs a batch")
+    extract.add_argument("-o", "--output", default="Extraction",
+                         help="Output root folder (default: Extraction)")
+    extract.add_argument("-m", "--mode", choices=MODES, default="interval",
+                         help="Extract one frame every --interval seconds, exactly --count "
+                              "evenly spaced frames, all frames, or only the keyframes "
+                              "(with --decoder pyav, non-key frames are never decoded)")
+    extract.add_argument("-i", "--interval", type=float, default=1.0,
+                         help="Seconds between extracted frames in interval mode (default: 1.0)")
+    extract.add_argument("-n", "--count", type=int, default=10,
+                         help="Number of evenly spaced frames in count mode (default: 10)")
+    extract.add_argument("--seek", choices=SEEK_POLICIES, default="auto",
+                         help="Cross large gaps by seeking instead of decoding; auto "
+                              "measures which is faster for this file (default: auto)")
+    _add_range_arguments(extract)
+    extract.add_argument("--rect", type=_rect, default=None, metavar="X,Y,WIDTH,HEIGHT",
+                         help="Save only this rectangle of each frame, in source pixels "
+                              "(e.g. the rectangle chosen in the Video Cropper)")
+    extract.add_argument("--size", type=_size, action="append", default=None,
+                         metavar="WIDTHxHEIGHT",
+                         help="Resize frames to this size before encoding; repeat to write "
+                              "several sizes from each decoded frame, one subfolder each")
+    extract.add_argument("--scale", type=float, default=None,
+                         help="Resize frames by this factor instead of to a --size")
+    extract.add_argument("--aspect", choices=ASPECTS, default="fit",
+                         help="How --size treats the aspect ratio: fit inside it, fill it and "
+                              "crop the overflow, fit and pad to it, or stretch (default: fit)")
+    extract.add_argument("--interpolation", choices=INTERPOLATIONS, default="auto",
+                         help="Resampling filter; auto is area when shrinking and cubic "
+                              "when enlarging (default: auto)")
+    extract.add_argument("-f", "--format", choices=FORMATS, default="png",
+                         help="Output image format (default: png)")
+    extract.add_argument("--quality", type=int, default=None,
+                         help="JPEG/WebP quality 0-100; WebP is lossless when omitted")
+    extract.add_argument("--png-level", type=int, default=None, choices=range(10), metavar="0-9",
+                         help="PNG compression level (default: OpenCV default)")
+    extract.add_argument("--container", choices=CONTAINERS, default="files",
+                         help="Store frames as one file each, in tar shards with an index, "
+                              "or in one memory-mapped .npy array (default: files)")
+    extract.add_argument("--shard-size", type=int, default=1024, metavar="MB",
+                         help="Size at which tar shards roll over, in MiB (default: 1024)")
+    extract.add_argument("-j", "--workers", type=int, default=0,
+                         help="Encoder/writer threads (default: one per CPU core)")
+    extract.add_argument("--memory-budget", type=int, default=512, metavar="MB",
+                         help="Decoded frames allowed in flight, in MiB (default: 512)")
+    extract.add_argument("-p", "--processes", type=int, default=1,
+                         help="Split the video into this many segments, each decoded "
+                              "by its own process (default: 1)")
+    extract.add_argument("--dedup", type=int, nargs="?", const=DEFAULT_DEDUP_THRESHOLD,
+                         default=None, metavar="THRESHOLD",
+                         help="Drop frames where no part of the picture changed by more than "
+                              "THRESHOLD grey levels (0-255) since the last kept frame "
+                              f"(default when given: {DEFAULT_DEDUP_THRESHOLD})")
+    extract.add_argument("--no-resume", action="store_true",
+                         help="Extract everything again instead of reusing frames already "
+                              "in the output folder")
+    extract.add_argument("--gpu", action="store_true",
+                         help="Route frames through the GPU when CUDA is available")
+    extract.add_argument("--progress-interval", type=float, default=None, metavar="SECONDS",
+                         help="Minimum seconds between progress lines (default: 0.2 on a "
+                              "terminal, 5 when writing to a log)")
+    extract.add_argument("-J", "--jobs", type=int, default=1,
+                         help="Videos processed at the same time in a batch; threads and "
+                              "--memory-budget are shared between them (default: 1)")
+    _add_decoder_arguments(extract)
+    _add_timing_arguments(extract)
+    extract.add_argument("-q", "--quiet", action="store_true", help="Do not print progress")
+    extract.set_defaults(func=cmd_extract)
+
+    crop = sub.add_parser("crop", help="Export cropped copies of one or more videos")
+    crop.add_argument("videos", nargs="+", metavar="VIDEO",
+                      help="Input video; several videos, a directory or a glob pattern "
+                           "runs a batch")
+    crop.add_argument("--rect", type=_rect, required=True, metavar="X,Y,WIDTH,HEIGHT",
+                      help="Crop rectangle in source pixels")
+    crop.add_argument("-o", "--output", default="Extraction",
+                      help="Output folder (default: Extraction)")
+    _add_range_arguments(crop)
+    crop.add_argument("--codec", choices=CODECS, default="h264",
+                      help="Output codec (default: h264)")
+    crop.add_argument("--encoder", choices=ENCODERS, default="auto",
+                      help="Encode with ffmpeg or cv2.VideoWriter; auto uses ffmpeg when it "
+                           "is on PATH (default: auto)")
+    crop.add_argument("--crf", type=int, default=DEFAULT_CRF, metavar="0-51",
+                      help=f"ffmpeg quality, lower is better; 0 is lossless (default: {DEFAULT_CRF})")
+    crop.add_argument("--preset", choices=PRESETS, default=DEFAULT_PRESET,
+                      help=f"ffmpeg encoder speed preset (default: {DEFAULT_PRESET})")
+    crop.add_argument("--threads", type=int, default=0,
+                      help="ffmpeg encoder threads (default: ffmpeg decides; shared out "
+                           "between --jobs in a batch)")
+    crop.add_argument("--reencode", action="store_true",
+                      help="Re-encode uncropped video instead of trimming it with a "
+                           "keyframe-aligned ffmpeg stream copy")
+    crop.add_argument("--gpu", action="store_true",
+                      help="Route frames through the GPU when CUDA is available")
+    crop.add_argument("--progress-interval", type=float, default=None, metavar="SECONDS",
+                      help="Minimum seconds between progress lines (default: 0.2 on a "
+                           "terminal, 5 when writing to a log)")
+    crop.add_argument("-J", "--jobs", type=int, default=1,
+                      help="Videos exported at the same time in a batch (default: 1)")
+    _add_decoder_arguments(crop)
+    _add_timing_arguments(crop)
+    crop.add_argument("-q", "--quiet", action="store_true", help="Do not print progress")
+    crop.set_defaults(func=cmd_crop)
+    return parser
+
+
+def main(argv=None):
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,300 @@
+"""Output containers: where encoded frames are stored.
+
+"files" writes one image per frame, as the extractor always has. For
+very long jobs that creates hundreds of thousands of files, so two packed
+containers are available:
+
+"tar"  Append-only WebDataset-style tar shards. Member names are the
+       usual <video>_<seq>.<ext> keys, shards are filled in sequence
+       order and rolled over at shard_size bytes. Each shard
+       <video>_<first seq>.tar has an index <video>_<first seq>.idx.npy of
+       (seq, data offset, size) rows, so a frame can be read with one
+       seek without scanning the tar.
+
+"npy"  A single memory-mappable <video>.npy array of shape
+       (frames, height, width, 3) with a <video>.valid.npy bool mask.
+       Frame seq lives at row seq - 1. Frames are stored raw, so
+       image_format does not apply.
+
+Containers are written concurrently by the writer threads of a
+FramePipeline and, in segmented mode, by several processes. Each process
+gets its own tar shards; all processes share the npy array, which is
+created by the parent before workers start. Packed containers are always
+written from scratch: the parent also removes the tar shards of an
+earlier run, whose boundaries need not match the new ones.
+"""
+import bisect
+import glob
+import io
+import itertools
+import os
+import re
+import tarfile
+import threading
+import time
+
+import cv2
+import numpy as np
+
+from .options import CONTAINERS  # noqa: F401 (re-exported)
+
+DEFAULT_SHARD_SIZE = 1024 * 1024 * 1024
+TAR_BLOCK = tarfile.BLOCKSIZE
+
+
+class FileContainer:
+    """One image file per frame"""
+
+    def __init__(self, writer, output_dir, video_name):
+        self.writer = writer
+        self.path_prefix = os.path.join(output_dir, video_name)
+
+    @property
+    def stats(self):
+        return self.writer.stats
+
+    def write(self, seq, frame):
+        # Create filename with zero-padding (6 digits)
+        self.writer.write(f"{self.path_prefix}_{seq:06d}", frame)
+
+    def skip(self, seq):
+        pass
+
+    def close(self):
+        pass
+
+
+class TarShardContainer:
+    """Append-only tar shards with a per-shard offset index.
+
+    Frames may be encoded out of order by the writer pool; encoded frames
+    wait in a small reorder buffer so each shard holds its run of sequence
+    numbers (seqs, in the order they will be submitted) in order, which
+    keeps streaming readers sequential.
+    """
+
+    def __init__(self, writer, output_dir, video_name, seqs=None,
+                 shard_size=DEFAULT_SHARD_SIZE):
+        self.writer = writer
+        self.output_dir = output_dir
+        self.video_name = video_name
+        self.shard_size = shard_size
+        self._seqs = iter(seqs) if seqs is not None else itertools.count(1)
+        self._next_seq = next(self._seqs, None)
+        self._pending = {}
+        self._tar = None
+        self._shard_stem = None
+        self._index = []
+        self._lock = threading.Lock()
+
+    @property
+    def stats(self):
+        return self.writer.stats
+
+    def write(self, seq, frame):
+        data = self.writer.encode_frame(frame)
+        with self._lock:
+            self._pending[seq] = data
+            self._flush_pending()
+
+    def skip(self, seq):
+        """Mark seq as deliberately not written so later frames are not held back"""
+        with self._lock:
+            self._pending[seq] = None
+            self._flush_pending()
+
+    def close(self):
+        with self._lock:
+            # Anything left follows a gap (a frame that failed); keep it anyway
+            for seq in sorted(self._pending):
+                data = self._pending.pop(seq)
+                if data is not None:
+                    self._append(seq, data)
+            self._close_shard()
+
+    def _flush_pending(self):
+        while self._next_seq in self._pending:
+            data = self._pending.pop(self._next_seq)
+            if data is not None:
+                self._append(self._next_seq, data)
+            self._next_seq = next(self._seqs, None)
+
+    def _append(self, seq, data):
+        start = time.perf_counter()
+        if self._tar is None:
+            self._open_shard(seq)
+        name = f"{self.video_name}_{seq:06d}{self.writer.extension}"
+        info = tarfile.TarInfo(name)
+        info.size = len(data)
+        info.mtime = int(time.time())
+        self._tar.addfile(info, _BufferReader(data))
+        # addfile pads the data to whole blocks; the data ends the archive so far
+        data_offset = self._tar.offset - _padded(info.size)
+        self._index.append((seq, data_offset, info.size))
+        self.writer.record_write(info.size, start)
+        if self._tar.offset >= self.shard_size:
+            self._close_shard()
+
+    def _open_shard(self, seq):
+        self._shard_stem = os.path.join(self.output_dir, f"{self.video_name}_{seq:06d}")
+        self._tar = tarfile.open(self._shard_stem + ".tar", "w", format=tarfile.GNU_FORMAT)
+        self._index = []
+
+    def _close_shard(self):
+        if self._tar is None:
+            return
+        self._tar.close()
+        index = np.array(self._index, dtype=np.int64).reshape(-1, 3)
+        _atomic_save(self._shard_stem + ".idx.npy", index)
+        self._tar = None
+
+
+class ArrayContainer:
+    """Fixed-size raw frames in one memory-mapped .npy array"""
+
+    def __init__(self, writer, output_dir, video_name):
+        self.writer = writer
+        path_prefix = os.path.join(output_dir, video_name)
+        self.frames = np.load(path_prefix + ".npy", mmap_mode="r+")
+        self.valid = np.load(path_prefix + ".valid.npy", mmap_mode="r+")
+
+    @property
+    def stats(self):
+        return self.writer.stats
+
+    def write(self, seq, frame):
+        start = time.perf_counter()
+        row = seq - 1
+        if frame.shape != self.frames.shape[1:]:
+            raise ValueError(f"Frame shape {frame.shape} does not match the array "
+                             f"container shape {self.frames.shape[1:]}")
+        self.frames[row] = frame
+        self.valid[row] = True
+        self.writer.record_write(frame.nbytes, start)
+
+    def skip(self, seq):
+        pass  # The row stays marked invalid
+
+    def close(self):
+        self.frames.flush()
+        self.valid.flush()
+
+
+def prepare_container(container, output_dir, video_name, frame_count, frame_shape):
+    """Create shared container files before any frame is written.
+
+    For npy the array is sized up front so every writer (thread or
+    process) can fill its rows independently. For tar the shards and
+    indexes of an earlier run are removed, so ShardReader never mixes
+    them with the new ones.
+    """
+    if container == "tar":
+        _remove_shards(output_dir, video_name)
+    if container != "npy":
+        return
+    path_prefix = os.path.join(output_dir, video_name)
+    frames = np.lib.format.open_memmap(path_prefix + ".npy", mode="w+", dtype=np.uint8,
+                                       shape=(frame_count,) + tuple(frame_shape))
+    del frames
+    valid = np.lib.format.open_memmap(path_prefix + ".valid.npy", mode="w+", dtype=np.bool_,
+                                      shape=(frame_count,))
+    del valid
+
+
+def open_container(container, writer, output_dir, video_name, seqs=None,
+                   shard_size=DEFAULT_SHARD_SIZE):
+    """Return the container object the pipeline writes frames into.
+
+    seqs are the sequence numbers that will be written, in submission
+    order (by default 1, 2, 3, ...).
+    """
+    if container == "files":
+        return FileContainer(writer, output_dir, video_name)
+    if container == "tar":
+        return TarShardContainer(writer, output_dir, video_name, seqs, shard_size)
+    if container == "npy":
+        return ArrayContainer(writer, output_dir, video_name)
+    raise ValueError(f"Unknown output container: {container}")
+
+
+class ShardReader:
+    """Random access to frames in tar shards written by TarShardContainer.
+
+    Loads every shard index once; read(seq) is then a single seek + read.
+    """
+
+    def __init__(self, output_dir):
+        self._shards = []
+        for idx_path in sorted(glob.glob(os.path.join(output_dir, "*.idx.npy"))):
+            index = np.load(idx_path)
+            if len(index):
+                tar_path = idx_path[:-len(".idx.npy")] + ".tar"
+                self._shards.append((int(index[0, 0]), tar_path, index))
+        self._shards.sort(key=lambda shard: shard[0])
+        self._starts = [shard[0] for shard in self._shards]
+
+    def __len__(self):
+        return sum(len(index) for _, _, index in self._shards)
+
+    def __iter__(self):
+        for _, _, index in self._shards:
+            for seq in index[:, 0]:
+                yield int(seq)
+
+    def _locate(self, seq):
+        pos = bisect.bisect_right(self._starts, seq) - 1
+        if pos < 0:
+            raise KeyError(seq)
+        first, tar_path, index = self._shards[pos]
+        row = seq - first
+        # Rows are contiguous unless a frame failed; fall back to a search
+        if row >= len(index) or index[row, 0] != seq:
+            row = int(np.searchsorted(index[:, 0], seq))
+            if row >= len(index) or index[row, 0] != seq:
+                raise KeyError(seq)
+        return tar_path, int(index[row, 1]), int(index[row, 2])
+
+    def read_bytes(self, seq):
+        tar_path, offset, size = self._locate(seq)
+        with open(tar_path, "rb") as f:
+            f.seek(offset)
+            return f.read(size)
+
+    def read(self, seq):
+        """Return frame seq as a BGR ndarray"""
+        data = self.read_bytes(seq)
+        if data[:6] == b"\x93NUMPY":
+            return np.load(io.BytesIO(data), allow_pickle=False)
+        return cv2.imdecode(np.frombuffer(data, dtype=np.uint8), cv2.IMREAD_UNCHANGED)
+
+
+def _remove_shards(output_dir, video_name):
+    shard_name = re.compile(re.escape(video_name) + r"_\d{6,}(\.tar|\.idx\.npy)")
+    for path in glob.glob(os.path.join(glob.escape(output_dir), "*")):
+        if shard_name.fullmatch(os.path.basename(path)):
+            os.remove(path)
+
+
+def _padded(size):
+    return (size + TAR_BLOCK - 1) // TAR_BLOCK * TAR_BLOCK
+
+
+def _atomic_save(path, array):
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "wb") as f:
+        np.save(f, array)
+    os.replace(tmp_path, path)
+
+
+class _BufferReader:
+    """Minimal file object over a bytes-like buffer, without copying it"""
+
+    def __init__(self, data):
+        self._view = memoryview(data).cast("B")
+        self._pos = 0
+
+    def read(self, size=-1):
+        end = len(self._view) if size is None or size < 0 else self._pos + size
+        chunk = self._view[self._pos:end]
+        self._pos += len(chunk)
+        return bytes(chunk)
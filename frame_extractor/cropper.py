@@ -0,0 +1,275 @@
+"""Headless crop export engine.
+
+Writes a copy of a video cropped to a rectangle, the same output the
+Video Cropper produces, without needing a display. Used by batch
+export; see batch.py. Encoding goes through ffmpeg when it is installed
+and cv2.VideoWriter otherwise; see encoders.py.
+
+A start/end range limits the export to part of the video. Decoding
+starts with a seek to the start frame. With ffmpeg, an uncropped export
+is a stream copy, which trims at keyframes without decoding anything.
+"""
+import os
+import time
+from dataclasses import dataclass
+from pathlib import Path
+
+import cv2
+import numpy as np
+
+from .encoders import ffmpeg_copy, ffmpeg_crop, open_writer, resolve_encoder
+from .engine import ExtractionError, check_bounds, check_decoder, frame_bounds
+from .gpu import cuda_device, empty_cuda_cache
+from .options import CODECS, DEFAULT_CRF, DEFAULT_PRESET, ENCODERS, PRESETS
+from .progress import DEFAULT_INTERVAL, ProgressReporter
+from .readers import config_reader
+from .scheduler import seek_to
+from .timing import finish_job_timer, job_timer
+
+
+def file_size(path):
+    """Return the size of path in bytes, or 0 if it does not exist yet"""
+    try:
+        return os.path.getsize(path)
+    except OSError:
+        return 0
+
+
+@dataclass
+class CropConfig:
+    """Settings for a single crop export job"""
+    video_path: str
+    x: int = 0
+    y: int = 0
+    width: int = None  # None = to the right edge
+    height: int = None  # None = to the bottom edge
+    output_folder: str = "Extraction"
+    codec: str = "h264"  # "h264" or "h265"
+    encoder: str = "auto"  # "auto" (ffmpeg if installed), "ffmpeg" or "opencv"
+    crf: int = DEFAULT_CRF  # ffmpeg only: 0 = lossless, 51 = worst
+    preset: str = DEFAULT_PRESET  # ffmpeg only: x264/x265 speed preset
+    threads: int = 0  # ffmpeg only: encoder threads, 0 = ffmpeg decides
+    progress_interval: float = DEFAULT_INTERVAL  # minimum seconds between progress callbacks
+    use_gpu: bool = False
+    start_time: float = None  # seconds; None = from the first frame
+    end_time: float = None  # seconds, exclusive; None = to the last frame
+    start_frame: int = None  # instead of start_time
+    end_frame: int = None  # instead of end_time, exclusive
+    stream_copy: bool = True  # ffmpeg only: copy uncropped video instead of re-encoding it
+    timings: bool = False  # collect per-stage timings into CropResult.timings
+    trace_path: str = None  # also write them as Chrome trace JSON here; implies timings
+    decoder: str = "opencv"  # "opencv" or "pyav" for frames decoded in Python; see readers.py
+    decode_threads: int = 0  # pyav only: decoder threads, 0 = FFmpeg decides
+    thread_type: str = "auto"  # pyav only: "auto", "frame" or "slice" threading
+
+    def validate(self):
+        """Raise ValueError if the settings cannot be used"""
+        if not self.video_path:
+            raise ValueError("Please select a video file first.")
+        if not os.path.exists(self.video_path):
+            raise ValueError("Selected video file does not exist.")
+        if self.x < 0 or self.y < 0:
+            raise ValueError("Invalid crop coordinates.")
+        if (self.width is not None and self.width <= 0) or (self.height is not None and self.height <= 0):
+            raise ValueError("Invalid crop dimensions.")
+        check_bounds(self)
+        if self.codec not in CODECS:
+            raise ValueError(f"Unknown codec: {self.codec}")
+        if self.encoder not in ENCODERS:
+            raise ValueError(f"Unknown encoder: {self.encoder}")
+        if not 0 <= self.crf <= 51:
+            raise ValueError("CRF must be between 0 and 51.")
+        if self.preset not in PRESETS:
+            raise ValueError(f"Unknown preset: {self.preset}")
+        if self.threads < 0:
+            raise ValueError("Threads cannot be negative.")
+        check_decoder(self)
+        if self.progress_interval < 0:
+            raise ValueError("Progress interval cannot be negative.")
+
+    @property
+    def output_path(self):
+        path = Path(self.video_path)
+        return os.path.join(self.output_folder, f"framed_{path.stem}{path.suffix}")
+
+    def crop_rect(self, frame_width, frame_height):
+        """Return (x, y, width, height) with even dimensions, or raise ValueError"""
+        width = frame_width - self.x if self.width is None else self.width
+        height = frame_height - self.y if self.height is None else self.height
+        if width <= 0 or height <= 0:
+            raise ValueError("Invalid crop dimensions.")
+        if self.x + width > frame_width or self.y + height > frame_height:
+            raise ValueError("Crop area exceeds video boundaries.")
+        # Ensure even dimensions for encoding
+        return self.x, self.y, width - width % 2, height - height % 2
+
+    def is_uncropped(self, frame_width, frame_height):
+        """Whether the rectangle covers the whole frame"""
+        return (self.x == 0 and self.y == 0 and self.width in (None, frame_width)
+                and self.height in (None, frame_height))
+
+    @property
+    def needs_frames(self):
+        """Whether frames must pass through Python, ruling out the ffmpeg crop filter"""
+        return self.use_gpu
+
+
+@dataclass
+class CropResult:
+    """Outcome of a crop export job"""
+    frames_written: int
+    total_frames: int
+    output_path: str
+    cancelled: bool = False
+    bytes_written: int = 0
+    encoder: str = "opencv"  # "ffmpeg-copy", "ffmpeg-filter", "ffmpeg" or "opencv"
+    timings: object = None  # timing.StageTimer if config.timings or config.trace_path
+
+
+def export_crop(config, progress=None, should_cancel=None):
+    """Write config.video_path cropped to the configured rectangle.
+
+    With ffmpeg and no per-frame Python processing the crop runs entirely
+    inside ffmpeg, as a stream copy if nothing is cropped away and
+    config.stream_copy is set. Otherwise the source is decoded sequentially
+    on its own capture, from the start of the range, and each frame is
+    written to ffmpeg or cv2.VideoWriter.
+    progress is called with a ProgressSnapshot at most every
+    config.progress_interval seconds. should_cancel is polled once per
+    frame; a cancelled export removes its incomplete output file.
+
+    With config.timings or config.trace_path set, each stage of each
+    frame is timed (see timing.py) and the StageTimer is returned as
+    result.timings. When ffmpeg does all the work there are no frames in
+    Python, so the whole run is one "ffmpeg" stage.
+    """
+    config.validate()
+    timer = job_timer(config)
+    encoder = resolve_encoder(config.encoder)
+    os.makedirs(config.output_folder, exist_ok=True)
+    output_path = config.output_path
+
+    cap = config_reader(config)
+    if not cap.isOpened():
+        raise ExtractionError("Could not open video file.")
+
+    device = None
+    out = None
+    try:
+        video_frames = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
+        fps = cap.get(cv2.CAP_PROP_FPS)
+        frame_width = int(cap.get(cv2.CAP_PROP_FRAME_WIDTH))
+        frame_height = int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
+        x, y, width, height = config.crop_rect(frame_width, frame_height)
+        first, stop = frame_bounds(config, video_frames, fps)
+        total_frames = stop - first
+        trimmed = total_frames != video_frames
+        reporter = ProgressReporter(progress, config.progress_interval,
+                                    bytes_source=lambda: file_size(output_path))
+        reporter.start(total_frames)
+
+        if encoder == "ffmpeg" and not config.needs_frames:
+            cap.release()
+            run_start = time.perf_counter()
+            start = first / fps if first and fps else None
+            if config.stream_copy and config.is_uncropped(frame_width, frame_height):
+                encoder = "ffmpeg-copy"
+                duration = total_frames / fps if trimmed and fps else None
+                written, cancelled = ffmpeg_copy(config.video_path, output_path, fps, start,
+                                                 duration, reporter.update, should_cancel)
+            else:
+                encoder = "ffmpeg-filter"
+                written, cancelled = ffmpeg_crop(config.video_path, output_path,
+                                                 (x, y, width, height), config.codec, config.crf,
+                                                 config.preset, config.threads, reporter.update,
+                                                 should_cancel, start,
+                                                 total_frames if trimmed else None)
+            if timer is not None:
+                timer.record("ffmpeg", run_start)
+        else:
+            out = open_writer(encoder, output_path, fps, (width, height), config.codec,
+                              config.crf, config.preset, config.threads)
+            device = cuda_device() if config.use_gpu else None
+            # Seek straight to the start of the range, then decode sequentially
+            start = time.perf_counter()
+            position = seek_to(cap, first)
+            while position < first and cap.grab():
+                position += 1
+            if timer is not None:
+                timer.record("seek", start)
+            written, cancelled = _write_frames(cap, out, (x, y, width, height),
+                                               total_frames if trimmed else None,
+                                               device, reporter, should_cancel, timer)
+            start = time.perf_counter()
+            out.release()
+            out = None
+            if timer is not None:
+                timer.record("flush", start)  # ffmpeg finishing the frames still in its pipeline
+        reporter.finish()
+        finish_job_timer(timer, config)
+
+        if cancelled:
+            # Remove incomplete file
+            if os.path.exists(output_path):
+                os.remove(output_path)
+            return CropResult(written, total_frames, output_path, cancelled=True, encoder=encoder,
+                              timings=timer)
+        return CropResult(written, total_frames, output_path,
+                          bytes_written=file_size(output_path), encoder=encoder, timings=timer)
+    finally:
+        if out is not None:
+            try:
+                out.release()
+            except ExtractionError:
+                pass  # Already failing; keep the original error
+        cap.release()
+        empty_cuda_cache(device)
+
+
+def _write_frames(cap, out, rect, count, device, reporter, should_cancel, timer=None):
+    """Decode count frames (None = to the end) from cap, writing the crop of each.
+
+    timer, a timing.StageTimer, receives the "decode", "convert", "crop",
+    "gpu", "encode" (the writer call; for the ffmpeg pipe, time blocked on
+    ffmpeg) and "progress" stages. Returns (written, cancelled).
+    """
+    x, y, width, height = rect
+    # Decode into one reused frame and copy the crop into one reused contiguous
+    # buffer: a strided view would make the writer copy it anyway
+    frame = None
+    cropped = np.empty((height, width, 3), dtype=np.uint8)
+    written = 0
+    while count is None or written < count:
+        if should_cancel and should_cancel():
+            return written, True
+        start = time.perf_counter() if timer is not None else None
+        # grab() + retrieve() is what read() does; split so the two can be timed
+        if not cap.grab():
+            return written, False
+        if timer is not None:
+            start = timer.record("decode", start)
+        ret, frame = cap.retrieve(image=frame)
+        if not ret:
+            return written, False
+        if timer is not None:
+            start = timer.record("convert", start)
+        np.copyto(cropped, frame[y:y + height, x:x + width])
+        output = cropped
+        if timer is not None:
+            start = timer.record("crop", start)
+        if device is not None:
+            try:
+                import torch
+                output = torch.from_numpy(cropped).to(device).cpu().numpy()
+            except Exception:
+                pass  # Fallback to the CPU frame
+            if timer is not None:
+                start = timer.record("gpu", start)
+        out.write(output)
+        if timer is not None:
+            start = timer.record("encode", start)
+        written += 1
+        reporter.update(written)
+        if timer is not None:
+            timer.record("progress", start)
+    return written, False
@@ -0,0 +1,66 @@
+"""Near-duplicate frame suppression.
+
+Static scenes (slides, surveillance footage) yield long runs of frames
+that are identical apart from sensor and compression noise. Each candidate
+frame is reduced to a small grayscale thumbnail and compared with the
+thumbnail of the last frame that was kept. If no thumbnail cell changed by
+more than the threshold (in 0-255 grey levels) the frame is dropped
+before it reaches the encoder.
+
+Each cell averages a few dozen pixels, which smooths noise away, while
+a real change such as a new line of text on a slide moves at least one
+cell by tens of levels. Taking the largest cell change rather than the
+mean keeps small, local changes from being averaged out.
+
+The thumbnail is built from a strided view of the frame, so its cost
+barely depends on resolution: well under a millisecond, against tens of
+milliseconds for the PNG encode it saves. See benchmarks/bench_dedup.py.
+
+A Deduplicator only knows the frames it has seen. Each segment of a
+multi-process job (see segments.py) and each resumed run has its own,
+so its first frame is always kept, even when it matches the last frame
+kept before it. Such a job can keep a few more frames than a single
+uninterrupted run, one per segment at most.
+"""
+import cv2
+import numpy as np
+
+from .options import DEFAULT_DEDUP_THRESHOLD as DEFAULT_THRESHOLD
+
+THUMBNAIL_SIZE = 32
+
+# Source pixels sampled per thumbnail cell along each axis
+SAMPLES_PER_CELL = 4
+
+
+def thumbnail(frame, size=THUMBNAIL_SIZE):
+    """Return a size x size grayscale int16 thumbnail of a BGR frame"""
+    step = max(1, min(frame.shape[:2]) // (size * SAMPLES_PER_CELL))
+    small = cv2.resize(frame[::step, ::step], (size, size), interpolation=cv2.INTER_AREA)
+    if small.ndim == 3:
+        small = cv2.cvtColor(small, cv2.COLOR_BGR2GRAY)
+    return small.astype(np.int16)
+
+
+def difference(a, b):
+    """Largest absolute difference between two thumbnails' cells, 0-255"""
+    return int(np.abs(a - b).max())
+
+
+class Deduplicator:
+    """Decide frame by frame whether to keep it; used from a single thread"""
+
+    def __init__(self, threshold=DEFAULT_THRESHOLD, size=THUMBNAIL_SIZE):
+        self.threshold = threshold
+        self.size = size
+        self.dropped = 0
+        self._last = None
+
+    def keep(self, frame):
+        """Return False if frame is within threshold of the last kept frame"""
+        thumb = thumbnail(frame, self.size)
+        if self._last is not None and difference(thumb, self._last) <= self.threshold:
+            self.dropped += 1
+            return False
+        self._last = thumb
+        return True
@@ -0,0 +1,202 @@
+"""Video encoder backends for crop export.
+
+cv2.VideoWriter can only pick a fourcc: it has no rate control, so the
+Quality setting had nothing to act on, and its mp4v output is both slow
+to produce and large. When an ffmpeg binary is on PATH the cropper uses
+it instead, in one of two ways:
+
+- FfmpegWriter streams raw BGR frames into ``ffmpeg -f rawvideo -i -``
+  over a pipe and encodes them with libx264/libx265 at the requested CRF
+  and preset. It has the same write()/release() interface as
+  cv2.VideoWriter, so it is used whenever frames have to pass through
+  Python (e.g. the GPU round-trip).
+- ffmpeg_crop() hands the whole job to ffmpeg's own crop filter, so
+  frames are never decoded into Python at all. This is the fast path
+  whenever no per-frame Python processing is requested.
+- ffmpeg_copy() trims without cropping by copying packets, with no
+  decode or encode at all, so its cost is close to plain file I/O.
+
+Without ffmpeg, open_writer() falls back to cv2.VideoWriter and the CRF,
+preset and thread settings are ignored.
+"""
+import os
+import shutil
+import subprocess
+import tempfile
+
+import cv2
+
+from .engine import ExtractionError
+from .options import DEFAULT_CRF, DEFAULT_PRESET
+
+FOURCC = {"h264": "mp4v", "h265": "HEVC"}
+LIBRARIES = {"h264": "libx264", "h265": "libx265"}
+
+# Lines of ffmpeg's stderr quoted in error messages
+ERROR_LINES = 5
+
+
+def find_ffmpeg():
+    """Return the path of the ffmpeg binary, or None if it is not on PATH"""
+    return shutil.which("ffmpeg")
+
+
+def resolve_encoder(encoder):
+    """Map "auto" to "ffmpeg" or "opencv"; raise ExtractionError if ffmpeg was asked for but is missing"""
+    if encoder == "opencv":
+        return "opencv"
+    if find_ffmpeg() is not None:
+        return "ffmpeg"
+    if encoder == "ffmpeg":
+        raise ExtractionError("ffmpeg was not found on PATH.")
+    return "opencv"
+
+
+def _codec_args(output_path, codec, crf, preset, threads):
+    args = ["-c:v", LIBRARIES[codec], "-preset", preset, "-crf", str(crf),
+            "-pix_fmt", "yuv420p"]
+    if threads:
+        args += ["-threads", str(threads)]
+    if codec == "h265" and os.path.splitext(output_path)[1].lower() in (".mp4", ".mov"):
+        args += ["-tag:v", "hvc1"]  # lets QuickTime and browsers play HEVC in MP4
+    return args
+
+
+def _error_tail(stderr):
+    stderr.seek(0)
+    lines = stderr.read().decode(errors="replace").strip().splitlines()
+    return "\n".join(lines[-ERROR_LINES:])
+
+
+class FfmpegWriter:
+    """cv2.VideoWriter look-alike that pipes raw BGR frames into ffmpeg"""
+
+    def __init__(self, output_path, fps, size, codec="h264", crf=DEFAULT_CRF,
+                 preset=DEFAULT_PRESET, threads=0):
+        width, height = size
+        command = [find_ffmpeg() or "ffmpeg", "-hide_banner", "-loglevel", "error", "-y",
+                   "-f", "rawvideo", "-pix_fmt", "bgr24", "-s", f"{width}x{height}",
+                   "-r", str(fps), "-i", "-", "-an",
+                   *_codec_args(output_path, codec, crf, preset, threads), output_path]
+        self._stderr = tempfile.TemporaryFile()
+        try:
+            self._proc = subprocess.Popen(command, stdin=subprocess.PIPE,
+                                          stdout=subprocess.DEVNULL, stderr=self._stderr)
+        except OSError as e:
+            self._stderr.close()
+            raise ExtractionError(f"Could not start ffmpeg: {e}")
+
+    def isOpened(self):
+        return self._proc.poll() is None
+
+    def write(self, frame):
+        """Write one contiguous BGR frame of the size given to the constructor"""
+        try:
+            self._proc.stdin.write(frame.data)
+        except (BrokenPipeError, ValueError):
+            self._proc.wait()
+            raise ExtractionError(f"ffmpeg stopped: {_error_tail(self._stderr)}")
+
+    def release(self):
+        """Finish the file; raise ExtractionError if ffmpeg failed"""
+        if self._proc.stdin.closed:
+            return
+        try:
+            self._proc.stdin.close()
+        except BrokenPipeError:
+            pass
+        code = self._proc.wait()
+        try:
+            if code != 0:
+                raise ExtractionError(f"ffmpeg failed: {_error_tail(self._stderr)}")
+        finally:
+            self._stderr.close()
+
+
+def open_writer(encoder, output_path, fps, size, codec="h264", crf=DEFAULT_CRF,
+                preset=DEFAULT_PRESET, threads=0):
+    """Return an opened writer for a resolved encoder ("ffmpeg" or "opencv")"""
+    if encoder == "ffmpeg":
+        return FfmpegWriter(output_path, fps, size, codec, crf, preset, threads)
+    out = cv2.VideoWriter(output_path, cv2.VideoWriter.fourcc(*FOURCC[codec]), fps, size)
+    if not out.isOpened():
+        raise ExtractionError("Could not create output video file.")
+    return out
+
+
+def _input_args(video_path, start):
+    args = [find_ffmpeg() or "ffmpeg", "-hide_banner", "-loglevel", "error", "-nostats", "-y"]
+    if start:
+        args += ["-ss", f"{start:.6f}"]  # before -i: seek the input rather than decode up to start
+    return args + ["-i", video_path, "-map", "0:v:0"]
+
+
+def ffmpeg_crop(video_path, output_path, rect, codec="h264", crf=DEFAULT_CRF,
+                preset=DEFAULT_PRESET, threads=0, on_frame=None, should_cancel=None,
+                start=None, frames=None):
+    """Crop video_path into output_path with ffmpeg's crop filter.
+
+    start (seconds) and frames limit the output to part of the video.
+    on_frame(frames_written) is called each time ffmpeg reports progress
+    (about twice a second); should_cancel is polled at the same rate and
+    stops ffmpeg. Returns (frames_written, cancelled).
+    """
+    x, y, width, height = rect
+    command = [*_input_args(video_path, start), "-vf", f"crop={width}:{height}:{x}:{y}",
+               *_codec_args(output_path, codec, crf, preset, threads)]
+    if frames is not None:
+        command += ["-frames:v", str(frames)]
+    return _run(command + ["-progress", "pipe:1", output_path], on_frame, should_cancel)
+
+
+def ffmpeg_copy(video_path, output_path, fps, start=None, duration=None, on_frame=None,
+                should_cancel=None):
+    """Trim video_path into output_path by copying the video stream, without re-encoding.
+
+    Cuts are keyframe-aligned: the output begins at the last keyframe at
+    or before start (seconds), so it can include a few frames more than
+    asked for. duration is in seconds. A stream copy does not count
+    frames, so frames_written is estimated from the output duration and fps.
+    Returns (frames_written, cancelled), like ffmpeg_crop().
+    """
+    command = _input_args(video_path, start)
+    if duration is not None:
+        command += ["-t", f"{duration:.6f}"]
+    command += ["-c", "copy", "-avoid_negative_ts", "make_zero", "-progress", "pipe:1", output_path]
+    return _run(command, on_frame, should_cancel, fps)
+
+
+def _run(command, on_frame, should_cancel, fps=None):
+    """Run an ffmpeg command that reports -progress on stdout; return (frames_written, cancelled).
+
+    With fps given, frames are counted from the output time instead of
+    ffmpeg's frame counter, which stream copies leave at zero.
+    """
+    with tempfile.TemporaryFile() as stderr:
+        try:
+            proc = subprocess.Popen(command, stdout=subprocess.PIPE, stderr=stderr,
+                                    stdin=subprocess.DEVNULL)
+        except OSError as e:
+            raise ExtractionError(f"Could not start ffmpeg: {e}")
+        written = 0
+        cancelled = False
+        try:
+            # -progress writes key=value blocks: "frame=" is the output frame
+            # count and "out_time_us=" the output duration
+            count_key = "out_time_us" if fps else "frame"
+            for line in proc.stdout:
+                key, _, value = line.decode(errors="replace").strip().partition("=")
+                if key == count_key and value.isdigit():
+                    written = int(value) if not fps else int(round(int(value) * fps / 1e6))
+                    if on_frame:
+                        on_frame(written)
+                if should_cancel and should_cancel():
+                    cancelled = True
+                    proc.terminate()
+                    break
+        finally:
+            proc.stdout.close()
+            code = proc.wait()
+        if code != 0 and not cancelled:
+            raise ExtractionError(f"ffmpeg failed: {_error_tail(stderr)}")
+    return written, cancelled
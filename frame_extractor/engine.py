@@ -0,0 +1,512 @@
+"""Headless frame extraction engine.
+
+Everything in here is plain Python + OpenCV so it can run on machines
+without a display. The Tk front end in main.py and the command line
+interface in cli.py are both thin clients of extract_frames().
+"""
+import os
+import time
+from dataclasses import dataclass
+from pathlib import Path
+
+import cv2
+
+from .containers import DEFAULT_SHARD_SIZE, open_container, prepare_container
+from .dedup import Deduplicator
+from .gpu import cuda_device, empty_cuda_cache
+from .manifest import Manifest, source_fingerprint
+from .options import (ASPECTS, CONTAINERS, DECODERS, FORMATS, INTERPOLATIONS, MODES,
+                      SEEK_POLICIES, THREAD_TYPES)
+from .pipeline import DEFAULT_MEMORY_BUDGET, FramePipeline, FramePool
+from .planner import plan_seek_threshold
+from .progress import DEFAULT_INTERVAL, ProgressReporter
+from .readers import config_reader, keyframe_indices, pyav_available
+from .resize import make_resizers
+from .scheduler import FrameScheduler, seek_to
+from .timing import finish_job_timer, job_timer
+from .writers import WriteStats, make_writer
+
+
+class ExtractionError(Exception):
+    """Raised when a video cannot be opened or extraction cannot start"""
+
+
+@dataclass
+class ExtractionConfig:
+    """Settings for a single extraction job"""
+    video_path: str
+    output_folder: str = "Extraction"
+    mode: str = "interval"  # "interval", "count", "all" or "keyframes"
+    interval: float = 1.0  # seconds between frames in interval mode
+    frame_count: int = 10  # number of evenly spaced frames in count mode
+    start_time: float = None  # seconds; None = from the first frame
+    end_time: float = None  # seconds, exclusive; None = to the last frame
+    start_frame: int = None  # instead of start_time
+    end_frame: int = None  # instead of end_time, exclusive
+    crop: tuple = None  # (x, y, width, height) in source pixels; None = the full frame
+    sizes: tuple = None  # ((width, height), ...) to resize to after cropping; see resize.py
+    scale: float = None  # instead of sizes: multiply both sides by this
+    aspect: str = "fit"  # how sizes treat the aspect ratio: "fit", "fill", "pad" or "stretch"
+    interpolation: str = "auto"  # one of INTERPOLATIONS; "auto" picks by direction
+    seek: str = "auto"  # "auto", "always" or "never"; see planner.py
+    decoder: str = "opencv"  # "opencv" or "pyav"; see readers.py
+    decode_threads: int = 0  # pyav only: decoder threads, 0 = FFmpeg decides
+    thread_type: str = "auto"  # pyav only: "auto", "frame" or "slice" threading
+    workers: int = 0  # encoder/writer threads; 0 = one per CPU core
+    memory_budget: int = DEFAULT_MEMORY_BUDGET  # bytes of decoded frames in flight
+    processes: int = 1  # decoder processes, each handling one segment of the video
+    image_format: str = "png"  # one of writers.FORMATS
+    quality: int = None  # jpg/webp quality; webp is lossless when None
+    png_compression: int = None  # 0-9; None keeps the OpenCV default
+    container: str = "files"  # "files", "tar" or "npy"; see containers.py
+    shard_size: int = DEFAULT_SHARD_SIZE  # bytes per tar shard
+    progress_interval: float = DEFAULT_INTERVAL  # minimum seconds between progress callbacks
+    resume: bool = True  # reuse frames already in output_dir; see manifest.py
+    dedup: int = None  # drop frames within this difference of the last kept one; see dedup.py
+    timings: bool = False  # collect per-stage timings into ExtractionResult.timings
+    trace_path: str = None  # also write them as Chrome trace JSON here; implies timings
+    use_gpu: bool = False
+
+    def validate(self):
+        """Raise ValueError if the settings cannot be used"""
+        if not self.video_path:
+            raise ValueError("Please select a video file first.")
+        if not os.path.exists(self.video_path):
+            raise ValueError("Selected video file does not exist.")
+        if self.mode not in MODES:
+            raise ValueError(f"Unknown extraction mode: {self.mode}")
+        if self.mode == "interval" and not self.interval > 0:
+            raise ValueError("Please enter a valid interval (positive number).")
+        if self.mode == "count" and not self.frame_count > 0:
+            raise ValueError("Please enter a valid frame count (positive whole number).")
+        check_bounds(self)
+        if self.crop is not None:
+            if len(self.crop) != 4:
+                raise ValueError("The crop rectangle must be (x, y, width, height).")
+            x, y, width, height = self.crop
+            if x < 0 or y < 0 or width <= 0 or height <= 0:
+                raise ValueError("Invalid crop rectangle.")
+        if self.sizes is not None and self.scale is not None:
+            raise ValueError("Give output sizes or a scale, not both.")
+        if self.sizes is not None:
+            if any(len(size) != 2 or min(size) <= 0 for size in self.sizes):
+                raise ValueError("Output sizes must be positive (width, height) pairs.")
+            if len({tuple(size) for size in self.sizes}) != len(self.sizes):
+                raise ValueError("Each output size can only be given once.")
+        if self.scale is not None and not self.scale > 0:
+            raise ValueError("Scale must be positive.")
+        if self.aspect not in ASPECTS:
+            raise ValueError(f"Unknown aspect policy: {self.aspect}")
+        if self.interpolation not in INTERPOLATIONS:
+            raise ValueError(f"Unknown interpolation: {self.interpolation}")
+        if self.seek not in SEEK_POLICIES:
+            raise ValueError(f"Unknown seek policy: {self.seek}")
+        check_decoder(self)
+        if self.workers < 0:
+            raise ValueError("Worker count cannot be negative.")
+        if self.memory_budget <= 0:
+            raise ValueError("Memory budget must be positive.")
+        if self.processes < 1:
+            raise ValueError("Process count must be at least 1.")
+        if self.image_format not in FORMATS:
+            raise ValueError(f"Unknown image format: {self.image_format}")
+        if self.quality is not None and not 0 <= self.quality <= 100:
+            raise ValueError("Quality must be between 0 and 100.")
+        if self.png_compression is not None and not 0 <= self.png_compression <= 9:
+            raise ValueError("PNG compression level must be between 0 and 9.")
+        if self.container not in CONTAINERS:
+            raise ValueError(f"Unknown output container: {self.container}")
+        if self.shard_size <= 0:
+            raise ValueError("Shard size must be positive.")
+        if self.progress_interval < 0:
+            raise ValueError("Progress interval cannot be negative.")
+        if self.dedup is not None and self.dedup < 0:
+            raise ValueError("Duplicate threshold cannot be negative.")
+        if self.processes > 1 and self.use_gpu:
+            raise ValueError("GPU processing cannot be combined with multiple processes.")
+
+    @property
+    def video_name(self):
+        return Path(self.video_path).stem
+
+    @property
+    def output_dir(self):
+        return os.path.join(self.output_folder, self.video_name)
+
+
+@dataclass
+class ExtractionResult:
+    """Outcome of an extraction job"""
+    extracted_count: int
+    total_to_extract: int
+    output_dir: str
+    cancelled: bool = False
+    bytes_written: int = 0
+    encode_seconds: float = 0.0
+    reused_count: int = 0  # frames kept from a previous run, included in extracted_count
+    dropped_count: int = 0  # near-duplicate frames not written (config.dedup), this run or before
+    timings: object = None  # timing.StageTimer if config.timings or config.trace_path
+
+
+def check_bounds(config):
+    """Raise ValueError if the start/end settings of an extraction or crop config are invalid"""
+    if config.start_time is not None and config.start_frame is not None:
+        raise ValueError("Give the start as a time or a frame number, not both.")
+    if config.end_time is not None and config.end_frame is not None:
+        raise ValueError("Give the end as a time or a frame number, not both.")
+    for value in (config.start_time, config.end_time, config.start_frame, config.end_frame):
+        if value is not None and value < 0:
+            raise ValueError("Start and end cannot be negative.")
+
+
+def check_decoder(config):
+    """Raise ValueError if the decoder settings of an extraction or crop config are invalid"""
+    if config.decoder not in DECODERS:
+        raise ValueError(f"Unknown decoder: {config.decoder}")
+    if config.decoder == "pyav" and not pyav_available():
+        raise ValueError("The pyav decoder needs PyAV: pip install av")
+    if config.decode_threads < 0:
+        raise ValueError("Decoder threads cannot be negative.")
+    if config.thread_type not in THREAD_TYPES:
+        raise ValueError(f"Unknown decoder thread type: {config.thread_type}")
+
+
+def check_crop(crop, frame_width, frame_height):
+    """Return crop as (x, y, width, height) ints, or None; raise ValueError if it leaves the frame"""
+    if crop is None:
+        return None
+    x, y, width, height = (int(v) for v in crop)
+    if x < 0 or y < 0 or width <= 0 or height <= 0:
+        raise ValueError("Invalid crop rectangle.")
+    if x + width > frame_width or y + height > frame_height:
+        raise ValueError("Crop area exceeds video boundaries.")
+    return x, y, width, height
+
+
+def frame_size(config, cap):
+    """Return the (width, height) of cap's frames after config.crop; raise ValueError if it does not fit"""
+    width = int(cap.get(cv2.CAP_PROP_FRAME_WIDTH))
+    height = int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
+    if config.crop is None:
+        return width, height
+    _, _, width, height = check_crop(config.crop, width, height)
+    return width, height
+
+
+def resize_outputs(config, frame_width, frame_height):
+    """Return [(output_dir, resizer)], one per output size of the config.
+
+    resizer is a resize.Resizer, or None for frames kept at their size.
+    With several sizes, each one is written to a subfolder of
+    config.output_dir named after it (e.g. 224x224).
+    """
+    resizers = make_resizers(frame_width, frame_height, config.sizes, config.scale,
+                             config.aspect, config.interpolation)
+    if len(resizers) == 1:
+        return [(config.output_dir, resizers[0])]
+    return [(os.path.join(config.output_dir, resizer.label), resizer) for resizer in resizers]
+
+
+def _bound(frame, seconds, fps, default):
+    if frame is not None:
+        return int(frame)
+    if seconds is not None:
+        return int(round(seconds * fps))
+    return default
+
+
+def frame_bounds(config, total_frames, fps):
+    """Return (first, stop), the half-open range of frames the config's start/end select"""
+    first = min(_bound(config.start_frame, config.start_time, fps, 0), total_frames)
+    stop = min(_bound(config.end_frame, config.end_time, fps, total_frames), total_frames)
+    bounded = any(value is not None for value in (config.start_time, config.end_time,
+                                                  config.start_frame, config.end_frame))
+    if bounded and first >= stop:
+        raise ValueError("The start must be before the end and inside the video.")
+    return first, stop
+
+
+def frames_to_extract(config, total_frames, fps, keyframes=None):
+    """Return the sorted frame indices selected by the config.
+
+    keyframes, the video's keyframe indices (see readers.keyframe_indices),
+    is only needed in "keyframes" mode.
+    """
+    first, stop = frame_bounds(config, total_frames, fps)
+    if config.mode == "keyframes":
+        return [index for index in keyframes if first <= index < stop]
+    if config.mode == "interval":
+        frame_interval = int(fps * config.interval)
+        if frame_interval == 0:
+            frame_interval = 1
+        return range(first, stop, frame_interval)
+    if config.mode == "count":
+        length = stop - first
+        count = min(config.frame_count, length)
+        return [first + i * length // count for i in range(count)]
+    return range(first, stop)
+
+
+def extract_targets(config, cap, targets, seqs=None, seek_threshold=None, position=0,
+                    on_written=None, should_cancel=None, device=None, journal=None,
+                    timer=None):
+    """Decode targets from an open capture and write them to config.output_dir.
+
+    targets[i] is written with sequence number seqs[i] (by default i + 1).
+    position is the frame index cap will return next. on_written(frames,
+    bytes) is called from writer threads with running totals. journal, if
+    given, records each sequence number once its frame is stored. With
+    config.dedup set, near-duplicates of the last kept frame are dropped
+    before encoding; their sequence numbers are left unused and journaled
+    as dropped. With
+    config.crop set, each frame is cut down to a view of the rectangle just
+    before dedup and encoding, so cropping costs no copy. With config.sizes
+    or config.scale set, writer threads resize the (cropped) frame to each
+    output size before encoding it; every size has its own container. timer,
+    a timing.StageTimer, receives the decode stages, "dedup", "gpu",
+    "queue" (time blocked on the memory budget), "resize" and the writers'
+    stages. Returns the WriteStats of all outputs combined, counting each
+    frame once however many sizes it was written at.
+    """
+    if seqs is None:
+        seqs = range(1, len(targets) + 1)
+    outputs = []
+    for output_dir, resizer in resize_outputs(config, *frame_size(config, cap)):
+        writer = make_writer(config.image_format, config.quality, config.png_compression)
+        writer.timer = timer
+        container = open_container(config.container, writer, output_dir,
+                                   config.video_name, seqs, config.shard_size)
+        outputs.append((container, resizer))
+    containers = [container for container, _ in outputs]
+    resizing = outputs[0][1] is not None
+
+    # Frames go back to the pool once stored, so decoding reuses their memory
+    pool = FramePool()
+
+    if config.crop is not None:
+        x, y, width, height = config.crop
+        crop = (slice(y, y + height), slice(x, x + width))
+    else:
+        crop = (slice(None), slice(None))
+
+    def resize(resizer, image):
+        start = time.perf_counter() if timer is not None else None
+        resized = resizer(image)
+        if timer is not None:
+            timer.record("resize", start)
+        return resized
+
+    def write_frame(seq, frame):
+        # The whole decoded frame is queued and returned to the pool; only the
+        # encoder (or resizer) sees the cropped view, which OpenCV reads
+        # through its strides
+        view = frame[crop]
+        if not resizing:
+            containers[0].write(seq, view)
+            pool.release(frame)
+        else:
+            images = [resize(resizer, view) for _, resizer in outputs]
+            # The resized copies are all the encoders need, so decoding can
+            # reuse the frame while they run
+            pool.release(frame)
+            for container, image in zip(containers, images):
+                container.write(seq, image)
+        if journal is not None:
+            journal.record(seq)
+
+    dedup = Deduplicator(config.dedup) if config.dedup is not None else None
+
+    def frame_written(written):
+        if on_written:
+            # Dropped frames count as done for progress
+            on_written(written + (dedup.dropped if dedup else 0),
+                       sum(container.stats.bytes_written for container in containers))
+
+    scheduler = FrameScheduler(targets, seek_threshold, position)
+    pipeline = FramePipeline(write_frame, config.workers or None,
+                             config.memory_budget, frame_written)
+    try:
+        with pipeline:
+            # Targets are strictly increasing, so the scheduler yields one frame per target in order
+            frames = scheduler.frames(cap, should_cancel, pool.acquire, timer)
+            for seq, (_, frame) in zip(seqs, frames):
+                if dedup is not None:
+                    start = time.perf_counter() if timer is not None else None
+                    keep = dedup.keep(frame[crop])
+                    if timer is not None:
+                        timer.record("dedup", start)
+                    if not keep:
+                        pool.release(frame)
+                        for container in containers:
+                            container.skip(seq)
+                        if journal is not None:
+                            journal.record(seq, dropped=True)
+                        pipeline.report()
+                        continue
+                if device is not None:
+                    start = time.perf_counter() if timer is not None else None
+                    try:
+                        import torch
+                        # Round-trip through the GPU (OpenCV requires CPU arrays),
+                        # back into the pooled buffer so the pool stays the same size
+                        frame[...] = torch.from_numpy(frame).to(device).cpu().numpy()
+                    except Exception:
+                        pass  # Fallback to the CPU frame
+                    if timer is not None:
+                        timer.record("gpu", start)
+                start = time.perf_counter() if timer is not None else None
+                pipeline.submit(seq, frame)
+                if timer is not None:
+                    timer.record("queue", start)
+    finally:
+        for container in containers:
+            container.close()
+        if journal is not None:
+            journal.close()
+    stats = WriteStats()
+    for container in containers:
+        stats.merge(container.stats)
+    # Every size is written from the same frames
+    stats.frames = containers[0].stats.frames
+    if dedup is not None:
+        stats.dropped = dedup.dropped
+    return stats
+
+
+def extract_frames(config, progress=None, should_cancel=None):
+    """Extract frames from config.video_path into config.output_dir.
+
+    Frames are decoded on the calling thread and encoded/written by a pool
+    of config.workers threads (see pipeline.py). With config.processes > 1
+    the targets are split into contiguous segments decoded by separate
+    processes instead (see segments.py). progress is called with a
+    ProgressSnapshot at most every config.progress_interval seconds,
+    possibly from a writer thread, and once more when the job ends.
+    should_cancel is polled once per decoded or skipped frame; when it returns True decoding stops, frames
+    already decoded are still written, and the result is marked cancelled.
+
+    With the "files" container, output_dir keeps a manifest of the frames
+    written so far. If config.resume is set, a rerun on the same video with
+    the same output settings skips frames already on disk or already
+    dropped as near-duplicates and seeks past them; frames shared with a different interval or count are renamed
+    rather than decoded again (see manifest.py).
+
+    In "keyframes" mode the targets are the video's keyframes, listed by
+    demuxing the file without decoding it. With config.decoder "pyav" the
+    decoder then discards every other frame unseen (see readers.py).
+
+    config.crop cuts every frame down to a rectangle of the source before
+    it is encoded, in the same decode pass, so cropped stills never go
+    through an intermediate cropped video. config.sizes or config.scale
+    then resize it, also before encoding (see resize.py); with several
+    sizes, each is written to its own subfolder of output_dir.
+
+    With config.timings or config.trace_path set, every stage of every
+    frame is timed (see timing.py) and the StageTimer is returned as
+    result.timings. Segmented jobs only time what runs in this process.
+    """
+    config.validate()
+    timer = job_timer(config)
+    output_dir = config.output_dir
+    os.makedirs(output_dir, exist_ok=True)
+
+    cap = config_reader(config, keyframes_only=config.mode == "keyframes")
+    if not cap.isOpened():
+        raise ExtractionError("Could not open video file.")
+
+    device = None
+    try:
+        total_frames = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
+        fps = cap.get(cv2.CAP_PROP_FPS)
+        width, height = frame_size(config, cap)
+        outputs = resize_outputs(config, width, height)
+        for folder, _ in outputs:
+            os.makedirs(folder, exist_ok=True)
+
+        keyframes = None
+        if config.mode == "keyframes":
+            start = time.perf_counter()
+            keyframes = keyframe_indices(config.video_path, config.decoder, fps)
+            if timer is not None:
+                timer.record("index", start)
+        targets = frames_to_extract(config, total_frames, fps, keyframes)
+        total_to_extract = len(targets)
+
+        manifest = None
+        seqs = range(1, total_to_extract + 1)
+        reused = 0
+        dropped = 0  # by an earlier run
+        if config.container == "files":
+            extension = make_writer(config.image_format, config.quality,
+                                    config.png_compression).extension
+            manifest = Manifest(output_dir, [os.path.join(folder, config.video_name)
+                                             for folder, _ in outputs], extension)
+            source = source_fingerprint(config.video_path, total_frames, fps)
+            targets, seqs, reused, dropped = manifest.prepare(config, targets, source,
+                                                              config.resume)
+
+        reporter = ProgressReporter(progress, config.progress_interval)
+        reporter.start(total_to_extract)
+        reporter.update(reused + dropped)
+
+        cancelled = False
+
+        def cancel_requested():
+            nonlocal cancelled
+            cancelled = bool(should_cancel and should_cancel())
+            return cancelled
+
+        def on_written(written, bytes_written):
+            start = time.perf_counter() if timer is not None else None
+            reporter.update(reused + dropped + written, bytes_written)
+            if timer is not None:
+                timer.record("progress", start)
+
+        seek_threshold = plan_seek_threshold(cap, targets, total_frames, config.seek)
+        # Jump straight to the first target (e.g. the start of a range) instead
+        # of decoding up to it
+        position = 0
+        if targets and config.seek != "never":
+            start = time.perf_counter()
+            position = seek_to(cap, targets[0])
+            if timer is not None:
+                timer.record("seek", start)
+
+        for folder, resizer in outputs:
+            frame_shape = resizer.shape if resizer is not None else (height, width, 3)
+            prepare_container(config.container, folder, config.video_name,
+                              total_to_extract, frame_shape)
+
+        try:
+            if not targets:
+                stats = WriteStats()
+            elif config.processes > 1:
+                from .segments import extract_segmented
+                cap.release()
+                stats = extract_segmented(config, targets, seqs, seek_threshold,
+                                          on_written, cancel_requested,
+                                          journaled=manifest is not None)
+            else:
+                device = cuda_device() if config.use_gpu else None
+                journal = manifest.open_journal() if manifest is not None else None
+                stats = extract_targets(config, cap, targets, seqs,
+                                        seek_threshold=seek_threshold,
+                                        position=position,
+                                        on_written=on_written,
+                                        should_cancel=cancel_requested,
+                                        device=device,
+                                        journal=journal,
+                                        timer=timer)
+        finally:
+            if manifest is not None:
+                manifest.finalize()
+
+        reporter.update(reused + dropped + stats.frames + stats.dropped, stats.bytes_written)
+        reporter.finish()
+        finish_job_timer(timer, config)
+        return ExtractionResult(reused + stats.frames, total_to_extract, output_dir, cancelled,
+                                stats.bytes_written, stats.encode_seconds, reused,
+                                dropped + stats.dropped, timer)
+    finally:
+        cap.release()
+        empty_cuda_cache(device)
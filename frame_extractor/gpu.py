@@ -0,0 +1,137 @@
+"""GPU capability probe without importing torch.
+
+The probe asks nvidia-smi for the device name and CUDA compute capability.
+Importing torch just to call torch.cuda.is_available() costs seconds, so
+torch is only imported once GPU processing is actually used (see
+cuda_device() below). The probe result is cached on disk, keyed by host
+name and the nvidia-smi binary's size and modification time, which
+change when the driver is updated. Machines without nvidia-smi on PATH
+are answered immediately without running anything.
+"""
+import json
+import os
+import platform
+import shutil
+import subprocess
+import threading
+from dataclasses import asdict, dataclass
+
+from .appdirs import cache_dir
+
+CACHE_FILE = "gpu_probe.json"
+PROBE_TIMEOUT = 10
+
+
+@dataclass
+class GpuInfo:
+    """What the GUIs show about the GPU"""
+    has_gpu: bool = False
+    gpu_name: str = "No GPU Available"
+    compute_cap: float = 0.0
+
+    @property
+    def gpu_capability(self):
+        major = int(self.compute_cap)
+        return (major, int(round((self.compute_cap - major) * 10)))
+
+    @property
+    def is_blackwell(self):
+        # Blackwell consumer GPUs report 12.0, data-center GPUs 10.0
+        return self.compute_cap >= 12.0
+
+
+def _driver_key():
+    """Return a cache key for this host and driver, or None if there is no nvidia-smi"""
+    smi = shutil.which("nvidia-smi")
+    if smi is None:
+        return None
+    try:
+        st = os.stat(smi)
+    except OSError:
+        return None
+    return f"{platform.node()}|{smi}|{st.st_size}|{int(st.st_mtime)}"
+
+
+def _cache_path():
+    return os.path.join(cache_dir(), CACHE_FILE)
+
+
+def load_cached_gpu_info():
+    """Return GpuInfo without running anything, or None if a probe is needed"""
+    key = _driver_key()
+    if key is None:
+        return GpuInfo()
+    try:
+        with open(_cache_path(), "r", encoding="utf-8") as f:
+            cached = json.load(f)
+        if cached.get("key") == key:
+            return GpuInfo(**cached["info"])
+    except (OSError, ValueError, TypeError, KeyError):
+        pass
+    return None
+
+
+def probe_gpu():
+    """Run nvidia-smi, cache the result and return GpuInfo"""
+    key = _driver_key()
+    if key is None:
+        return GpuInfo()
+    try:
+        result = subprocess.check_output(
+            ['nvidia-smi', '--query-gpu=name,compute_cap', '--format=csv,noheader'],
+            text=True, timeout=PROBE_TIMEOUT)
+        rows = [line.rsplit(",", 1) for line in result.strip().splitlines() if "," in line]
+        if rows:
+            info = GpuInfo(True, rows[0][0].strip(), max(float(cap) for _, cap in rows))
+        else:
+            info = GpuInfo()
+    except Exception:
+        info = GpuInfo()
+
+    try:
+        tmp_path = _cache_path() + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"key": key, "info": asdict(info)}, f)
+        os.replace(tmp_path, _cache_path())
+    except OSError:
+        pass
+    return info
+
+
+def get_gpu_info_async(callback):
+    """Call callback(GpuInfo) with the cached result now, or from a background probe.
+
+    Returns the cached GpuInfo when there was one, otherwise None.
+    """
+    info = load_cached_gpu_info()
+    if info is not None:
+        callback(info)
+        return info
+
+    thread = threading.Thread(target=lambda: callback(probe_gpu()), name="gpu-probe")
+    thread.daemon = True
+    thread.start()
+    return None
+
+
+def cuda_device():
+    """Import torch and return the first CUDA device, or None if unavailable.
+
+    This is the only place torch gets imported; call it when GPU
+    processing has actually been requested.
+    """
+    try:
+        import torch
+    except ImportError:
+        return None
+    if not torch.cuda.is_available():
+        return None
+    torch.cuda.empty_cache()  # Clear any existing GPU memory
+    return torch.device('cuda:0')
+
+
+def empty_cuda_cache(device):
+    """Release cached GPU memory if device came from cuda_device()"""
+    if device is not None:
+        import torch
+        torch.cuda.empty_cache()
@@ -0,0 +1,263 @@
+"""Per-output manifest for resumable and incremental extraction.
+
+Each output folder of the "files" container holds a manifest.json
+describing the source video (a fingerprint), the output settings, the
+target list of the run that produced it, the frames already written
+(sequence number -> source frame index) and the source frames dropped as
+near-duplicates (see dedup.py). manifest.json is only ever replaced
+atomically.
+
+While a job runs, writer threads append the sequence numbers they finish
+(negated for dropped frames) to an append-only journal (manifest.journal, or one journal per process
+in segmented mode) that is flushed about once a second. At the end of the
+job, or at the start of the next one if the process died, the journals
+are folded back into manifest.json.
+
+On a rerun with the same source and output settings, frames that already
+exist or were dropped are not decoded or encoded again. If the new target list still
+contains them under different sequence numbers (for example the interval
+was halved), the files are renamed to their new names. Files from the
+previous run that are not part of the new target list are removed. When
+a job writes every frame at several sizes (see resize.py), a frame only
+counts as done if the file of each size exists.
+"""
+import bisect
+import glob
+import hashlib
+import json
+import os
+import threading
+import time
+
+MANIFEST_NAME = "manifest.json"
+JOURNAL_NAME = "manifest.journal"
+VERSION = 1
+
+# Seconds between journal flushes
+FLUSH_INTERVAL = 1.0
+
+# Bytes of the source hashed into the fingerprint
+FINGERPRINT_BYTES = 64 * 1024
+
+
+def source_fingerprint(video_path, total_frames, fps):
+    """Return a dict identifying the source video cheaply"""
+    st = os.stat(video_path)
+    with open(video_path, "rb") as f:
+        head = hashlib.sha1(f.read(FINGERPRINT_BYTES)).hexdigest()
+    return {
+        "name": os.path.basename(video_path),
+        "size": st.st_size,
+        "mtime_ns": st.st_mtime_ns,
+        "frames": total_frames,
+        "fps": round(fps, 6),
+        "head_sha1": head,
+    }
+
+
+def output_settings(config):
+    """Settings that must match for existing outputs to be reused"""
+    settings = {
+        "video_name": config.video_name,
+        "image_format": config.image_format,
+        "quality": config.quality,
+        "png_compression": config.png_compression,
+    }
+    # Only when set, so manifests written before cropping and resizing existed still match
+    if config.crop is not None:
+        settings["crop"] = list(config.crop)
+    if config.dedup is not None:
+        settings["dedup"] = config.dedup
+    if config.sizes is not None or config.scale is not None:
+        settings["resize"] = {
+            "sizes": [list(size) for size in config.sizes] if config.sizes is not None else None,
+            "scale": config.scale,
+            "aspect": config.aspect,
+            "interpolation": config.interpolation,
+        }
+    return settings
+
+
+def encode_targets(targets):
+    if isinstance(targets, range):
+        return {"range": [targets.start, targets.stop, targets.step]}
+    return {"list": list(targets)}
+
+
+def decode_targets(spec):
+    if "range" in spec:
+        return range(*spec["range"])
+    return spec["list"]
+
+
+def target_position(targets, frame_index):
+    """Return i such that targets[i] == frame_index, or None"""
+    if isinstance(targets, range):
+        return targets.index(frame_index) if frame_index in targets else None
+    i = bisect.bisect_left(targets, frame_index)
+    if i < len(targets) and targets[i] == frame_index:
+        return i
+    return None
+
+
+class Journal:
+    """Append-only log of finished sequence numbers, safe to call from many threads"""
+
+    def __init__(self, path, flush_interval=FLUSH_INTERVAL):
+        self.path = path
+        self.flush_interval = flush_interval
+        self._pending = []
+        self._last_flush = time.monotonic()
+        self._lock = threading.Lock()
+        self._file = open(path, "a", encoding="ascii")
+
+    def record(self, seq, dropped=False):
+        """Log seq as stored, or as dropped without a file"""
+        with self._lock:
+            self._pending.append(-seq if dropped else seq)
+            if time.monotonic() - self._last_flush >= self.flush_interval:
+                self._flush()
+
+    def close(self):
+        with self._lock:
+            self._flush()
+            self._file.close()
+
+    def _flush(self):
+        if self._pending:
+            self._file.write("".join(f"{seq}\n" for seq in self._pending))
+            self._pending = []
+        self._file.flush()
+        self._last_flush = time.monotonic()
+
+
+class Manifest:
+    """manifest.json plus journals for one output folder"""
+
+    def __init__(self, output_dir, path_prefixes, extension):
+        self.output_dir = output_dir
+        self.path_prefixes = path_prefixes  # one per output size
+        self.extension = extension
+        self.path = os.path.join(output_dir, MANIFEST_NAME)
+        self.state = None
+
+    def frame_paths(self, seq):
+        return [f"{prefix}_{seq:06d}{self.extension}" for prefix in self.path_prefixes]
+
+    def journal_path(self, suffix=""):
+        return os.path.join(self.output_dir, JOURNAL_NAME + (f".{suffix}" if suffix else ""))
+
+    def open_journal(self, suffix=""):
+        return Journal(self.journal_path(suffix))
+
+    def load(self):
+        """Return the previous state with its journals replayed, or None"""
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                state = json.load(f)
+            if state.get("version") != VERSION:
+                return None
+            targets = decode_targets(state["targets"])
+            frames = {int(seq): frame for seq, frame in state["frames"].items()}
+            dropped = set(state.get("dropped", []))  # absent in manifests written before dedup
+        except (OSError, ValueError, KeyError, TypeError):
+            return None
+
+        for journal in self._journals():
+            with open(journal, "r", encoding="ascii", errors="ignore") as f:
+                for line in f:
+                    # A crash can leave a partial last line; skip anything odd
+                    entry = line.strip()
+                    if not line.endswith("\n") or not entry.lstrip("-").isdigit():
+                        continue
+                    seq = abs(int(entry))
+                    if 1 <= seq <= len(targets):
+                        if entry.startswith("-"):
+                            dropped.add(targets[seq - 1])
+                        else:
+                            frames[seq] = targets[seq - 1]
+        state["frames"] = frames
+        state["dropped"] = dropped
+        return state
+
+    def prepare(self, config, targets, source, resume=True):
+        """Reconcile the folder with a new run and return what is left to do.
+
+        Returns (todo_targets, todo_seqs, reused, dropped): the targets that
+        still need extracting, their sequence numbers, how many targets are
+        already on disk under their final names and how many were dropped
+        as near-duplicates by an earlier run.
+        """
+        settings = output_settings(config)
+        done = {}
+        dropped = set()
+        previous = self.load() if resume else None
+        if previous and previous["source"] == source and previous["settings"] == settings:
+            done = self._reuse(previous["frames"], targets)
+            dropped = {frame for frame in previous["dropped"]
+                       if target_position(targets, frame) is not None}
+
+        self.state = {
+            "version": VERSION,
+            "source": source,
+            "settings": settings,
+            "targets": encode_targets(targets),
+            "frames": done,
+            "dropped": dropped,
+        }
+        self._save()
+        for journal in self._journals():
+            os.remove(journal)
+
+        if not done and not dropped:
+            return targets, range(1, len(targets) + 1), 0, 0
+        todo_seqs = [seq for seq in range(1, len(targets) + 1)
+                     if seq not in done and targets[seq - 1] not in dropped]
+        todo_targets = [targets[seq - 1] for seq in todo_seqs]
+        return todo_targets, todo_seqs, len(done), len(dropped)
+
+    def finalize(self):
+        """Fold the journals written during the run into manifest.json"""
+        state = self.load()
+        if state is None:
+            return
+        self.state = state
+        self._save()
+        for journal in self._journals():
+            os.remove(journal)
+
+    def _reuse(self, previous_frames, targets):
+        """Keep, rename or delete the previous outputs; return {new_seq: frame}"""
+        done = {}
+        moves = []
+        for old_seq, frame in previous_frames.items():
+            old_paths = [path for path in self.frame_paths(old_seq) if os.path.exists(path)]
+            position = target_position(targets, frame)
+            if position is None or len(old_paths) < len(self.path_prefixes):
+                # Gone from the targets, or missing a size: extract it again
+                for old_path in old_paths:
+                    os.remove(old_path)
+                continue
+            new_seq = position + 1
+            done[new_seq] = frame
+            if new_seq != old_seq:
+                moves.extend(zip(old_paths, self.frame_paths(new_seq)))
+
+        # Two phases so that a rename never overwrites a file still to be moved
+        for old_path, _ in moves:
+            os.replace(old_path, old_path + ".reuse")
+        for old_path, new_path in moves:
+            os.replace(old_path + ".reuse", new_path)
+        return done
+
+    def _journals(self):
+        return sorted(glob.glob(self.journal_path() + "*"))
+
+    def _save(self):
+        state = dict(self.state)
+        state["frames"] = {str(seq): frame for seq, frame in sorted(state["frames"].items())}
+        state["dropped"] = sorted(state.get("dropped", ()))
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(state, f)
+        os.replace(tmp_path, self.path)
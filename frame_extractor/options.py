@@ -0,0 +1,71 @@
+"""Choices accepted by ExtractionConfig and CropConfig.
+
+Kept free of cv2/numpy imports so the GUI and the CLI can build their
+widgets and argument parsers before the heavy modules are loaded.
+"""
+
+MODES = ("interval", "count", "all", "keyframes")
+SEEK_POLICIES = ("auto", "always", "never")
+FORMATS = ("png", "jpg", "webp", "bmp", "npy")
+CONTAINERS = ("files", "tar", "npy")
+CODECS = ("h264", "h265")
+ENCODERS = ("auto", "ffmpeg", "opencv")
+DECODERS = ("opencv", "pyav")
+THREAD_TYPES = ("auto", "frame", "slice")
+ASPECTS = ("fit", "fill", "pad", "stretch")
+INTERPOLATIONS = ("auto", "area", "linear", "cubic", "lanczos", "nearest")
+PRESETS = ("ultrafast", "superfast", "veryfast", "faster", "fast", "medium", "slow",
+           "slower", "veryslow")
+
+# Constant Rate Factor used by the ffmpeg encoder: 0 = lossless, 18 = visually lossless
+DEFAULT_CRF = 18
+
+# x264's own default is medium, which encodes ~3x slower than veryfast for files
+# about the same size (see benchmarks/bench_encoders.py)
+DEFAULT_PRESET = "veryfast"
+
+# Default ExtractionConfig.dedup threshold when duplicate dropping is switched on
+DEFAULT_DEDUP_THRESHOLD = 10
+
+# Extensions picked up when a batch is given a directory
+VIDEO_EXTENSIONS = (".mp4", ".avi", ".mov", ".mkv", ".wmv", ".flv", ".webm")
+
+
+def parse_position(text):
+    """Parse a range bound: "90", "1:30.5" or "1:02:03" are times, "2700f" is a frame number.
+
+    Returns ("time", seconds) or ("frame", index); raises ValueError.
+    """
+    text = text.strip()
+    if text.endswith("f"):
+        return ("frame", int(text[:-1]))
+    seconds = 0.0
+    for part in text.split(":"):
+        seconds = seconds * 60 + float(part)
+    return ("time", seconds)
+
+
+def parse_rect(text):
+    """Parse "X,Y,WIDTH,HEIGHT" into a tuple of ints; raises ValueError"""
+    values = tuple(int(v) for v in text.split(","))
+    if len(values) != 4:
+        raise ValueError(f"Expected X,Y,WIDTH,HEIGHT, got {text!r}")
+    return values
+
+
+def parse_size(text):
+    """Parse "WIDTHxHEIGHT" into a tuple of ints; raises ValueError"""
+    values = tuple(int(v) for v in text.lower().split("x"))
+    if len(values) != 2:
+        raise ValueError(f"Expected WIDTHxHEIGHT, got {text!r}")
+    return values
+
+
+def bound_fields(start=None, end=None):
+    """start_time/end_time/start_frame/end_frame config fields for parsed start and end bounds"""
+    fields = {}
+    for name, bound in (("start", start), ("end", end)):
+        if bound is not None:
+            kind, value = bound
+            fields[f"{name}_{kind}"] = value
+    return fields
@@ -0,0 +1,173 @@
+"""Decode -> encode -> write pipeline.
+
+The thread running extract_frames() decodes frames and submits them to a
+queue bounded by bytes rather than item count, so a 4K job holds as many
+frames in flight as a 720p job holds megabytes, not more. A pool of writer
+threads drains the queue; cv2 releases the GIL while encoding, so PNG
+compression runs on all cores. Output names are assigned by the decoder
+before frames are queued, so numbering stays sequential no matter which
+worker finishes first.
+"""
+import os
+import threading
+from collections import deque
+
+DEFAULT_MEMORY_BUDGET = 512 * 1024 * 1024
+
+
+def default_workers():
+    return max(1, os.cpu_count() or 1)
+
+
+class ByteBudgetQueue:
+    """FIFO queue that blocks producers while queued + in-flight bytes exceed a budget.
+
+    A slot is held from put() until release() is called by the consumer,
+    so frames being encoded still count against the budget. A single item
+    larger than the budget is always admitted when nothing else is held.
+    """
+
+    def __init__(self, max_bytes):
+        self.max_bytes = max_bytes
+        self.held_bytes = 0
+        self._items = deque()
+        self._closed = False
+        self._cond = threading.Condition()
+
+    def put(self, item, nbytes):
+        with self._cond:
+            while (self.held_bytes and self.held_bytes + nbytes > self.max_bytes
+                   and not self._closed):
+                self._cond.wait()
+            if self._closed:
+                return False
+            self.held_bytes += nbytes
+            self._items.append((item, nbytes))
+            self._cond.notify_all()
+            return True
+
+    def get(self):
+        """Return (item, nbytes), or None once the queue is closed and drained"""
+        with self._cond:
+            while not self._items and not self._closed:
+                self._cond.wait()
+            if not self._items:
+                return None
+            return self._items.popleft()
+
+    def release(self, nbytes):
+        with self._cond:
+            self.held_bytes -= nbytes
+            self._cond.notify_all()
+
+    def close(self, drop_pending=False):
+        """Stop accepting items; consumers finish what is queued unless drop_pending"""
+        with self._cond:
+            self._closed = True
+            if drop_pending:
+                for _, nbytes in self._items:
+                    self.held_bytes -= nbytes
+                self._items.clear()
+            self._cond.notify_all()
+
+
+class FramePool:
+    """Free list of frame arrays recycled between the decoder and the writers.
+
+    The decoder asks for a buffer before each retrieve(); writers hand the
+    frame back once it is stored. The pool never holds more arrays than
+    were in flight at once, which the memory budget already bounds.
+    """
+
+    def __init__(self):
+        self._free = []
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """Return a recycled array, or None if there is none to reuse"""
+        with self._lock:
+            return self._free.pop() if self._free else None
+
+    def release(self, frame):
+        with self._lock:
+            self._free.append(frame)
+
+
+class FramePipeline:
+    """Run write_frame(seq, frame) for submitted frames on a pool of threads.
+
+    Use as a context manager: leaving the block normally waits for every
+    queued frame to be written; leaving it with an exception drops what is
+    still queued. The first exception raised by write_frame stops the
+    pipeline and is re-raised from submit() or close().
+    """
+
+    def __init__(self, write_frame, workers=None, memory_budget=DEFAULT_MEMORY_BUDGET,
+                 on_written=None):
+        self.write_frame = write_frame
+        self.workers = workers or default_workers()
+        self.on_written = on_written
+        self.written = 0
+        self._queue = ByteBudgetQueue(memory_budget)
+        self._threads = []
+        self._lock = threading.Lock()
+        self._error = None
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+        else:
+            self._shutdown(drop_pending=True)
+
+    def start(self):
+        for i in range(self.workers):
+            thread = threading.Thread(target=self._worker, name=f"frame-writer-{i}")
+            thread.daemon = True
+            thread.start()
+            self._threads.append(thread)
+
+    def submit(self, seq, frame):
+        if not self._queue.put((seq, frame), frame.nbytes) and self._error is not None:
+            raise self._error
+
+    def report(self):
+        """Call on_written with the current count, e.g. after a frame was dropped"""
+        with self._lock:
+            if self.on_written:
+                self.on_written(self.written)
+
+    def close(self):
+        self._shutdown(drop_pending=False)
+        if self._error is not None:
+            raise self._error
+
+    def _shutdown(self, drop_pending):
+        self._queue.close(drop_pending=drop_pending)
+        for thread in self._threads:
+            thread.join()
+        self._threads = []
+
+    def _worker(self):
+        while True:
+            entry = self._queue.get()
+            if entry is None:
+                return
+            (seq, frame), nbytes = entry
+            try:
+                if self._error is None:
+                    self.write_frame(seq, frame)
+                    with self._lock:
+                        self.written += 1
+                        if self.on_written:
+                            self.on_written(self.written)
+            except Exception as e:
+                with self._lock:
+                    if self._error is None:
+                        self._error = e
+                self._queue.close(drop_pending=True)
+            finally:
+                self._queue.release(nbytes)
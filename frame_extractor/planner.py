@@ -0,0 +1,104 @@
+"""Seek-vs-decode planning for sparse sampling.
+
+Skipping a frame with cap.grab() costs one decode. Seeking with
+CAP_PROP_POS_FRAMES costs a keyframe seek plus decoding the rest of the
+GOP, which is roughly constant per seek. For every gap between targets
+the cheaper of the two should be used; the break-even gap length is
+measured on the actual file because it depends on codec, GOP size and
+resolution.
+"""
+import time
+from dataclasses import dataclass
+
+import cv2
+
+# Gaps shorter than this are never worth measuring a seek for
+MIN_SEEK_GAP = 8
+
+
+@dataclass
+class SeekCost:
+    """Measured per-operation costs of a capture, in seconds"""
+    grab: float
+    seek: float
+
+    @property
+    def break_even_gap(self):
+        """Number of skipped frames above which seeking is cheaper"""
+        if self.grab <= 0:
+            return float("inf")
+        return max(MIN_SEEK_GAP, self.seek / self.grab)
+
+
+def largest_gap(targets):
+    """Return the largest number of frames skipped between two targets"""
+    if len(targets) == 0:
+        return 0
+    if isinstance(targets, range):
+        return max(targets[0], targets.step - 1 if len(targets) > 1 else 0)
+    gap = targets[0]
+    for prev, cur in zip(targets, targets[1:]):
+        gap = max(gap, cur - prev - 1)
+    return gap
+
+
+def measure_seek_cost(cap, total_frames, grab_frames=24, seek_samples=3):
+    """Measure sequential grab cost and seek cost on an open capture.
+
+    The capture is rewound to frame 0 afterwards. Returns None if the
+    backend cannot seek accurately, in which case only grab() should be
+    used.
+    """
+    cap.set(cv2.CAP_PROP_POS_FRAMES, 0)
+    grabbed = 0
+    start = time.perf_counter()
+    for _ in range(min(grab_frames, total_frames)):
+        if not cap.grab():
+            break
+        grabbed += 1
+    if grabbed == 0:
+        cap.set(cv2.CAP_PROP_POS_FRAMES, 0)
+        return None
+    grab_cost = (time.perf_counter() - start) / grabbed
+
+    seek_total = 0.0
+    seeks = 0
+    for i in range(1, seek_samples + 1):
+        target = total_frames * i // (seek_samples + 1)
+        if target <= grabbed:
+            continue
+        start = time.perf_counter()
+        ok = cap.set(cv2.CAP_PROP_POS_FRAMES, target)
+        ok = ok and cap.grab()
+        seek_total += time.perf_counter() - start
+        # The frame that was just grabbed is the target, so the position
+        # reported afterwards must be target + 1 for seeks to be trusted
+        if not ok or int(cap.get(cv2.CAP_PROP_POS_FRAMES)) != target + 1:
+            cap.set(cv2.CAP_PROP_POS_FRAMES, 0)
+            return None
+        seeks += 1
+
+    cap.set(cv2.CAP_PROP_POS_FRAMES, 0)
+    if seeks == 0:
+        return None
+    # A seek is followed by the same grab() a sequential read needs
+    seek_cost = max(seek_total / seeks - grab_cost, 0.0)
+    return SeekCost(grab=grab_cost, seek=seek_cost)
+
+
+def plan_seek_threshold(cap, targets, total_frames, seek="auto"):
+    """Return the gap length above which the scheduler should seek.
+
+    seek is "auto" (measure on this file), "always" or "never". None means
+    never seek.
+    """
+    if seek == "never":
+        return None
+    if seek == "always":
+        return 0
+    if largest_gap(targets) <= MIN_SEEK_GAP:
+        return None  # Dense sampling; sequential decode always wins
+    cost = measure_seek_cost(cap, total_frames)
+    if cost is None:
+        return None
+    return cost.break_even_gap
@@ -0,0 +1,257 @@
+"""Preview frames for the Video Cropper, served from an LRU cache.
+
+Stepping through a video in the cropper used to seek, decode, convert
+and resize on every call, even for a one-frame step, and each seek makes
+the FFmpeg backend go back to a keyframe and decode forward again.
+PreviewSource keeps the display-sized frames it has produced in a
+FrameCache bounded by bytes. Whenever the playhead moves, a background
+prefetcher decodes the neighbourhood around it sequentially, with one
+seek and then plain reads, so +-1 and +-STEP_FRAMES steps and
+back-and-forth scrubbing are answered from memory.
+
+The GUI never decodes on its own thread. request() answers from the
+cache when it can. Otherwise it returns the nearest cached frame as an
+approximation and queues the exact frame for the same background thread
+that prefetches. Only the newest request is kept: dragging the timeline
+replaces the pending request on every motion event, so stale positions
+are never decoded.
+
+Nothing here imports Tk: frames are RGB numpy arrays and the GUI turns
+them into PhotoImages on its own thread.
+
+Given a StageTimer (see timing.py), every decode records the "seek",
+"skip", "decode", "convert" and "resize" stages, on whichever thread
+did it.
+"""
+import threading
+import time
+from collections import OrderedDict
+
+import cv2
+
+DEFAULT_CACHE_BYTES = 256 * 1024 * 1024
+
+# Frames the cropper's fast step buttons jump
+STEP_FRAMES = 30
+
+# Frames kept decoded on each side of the playhead; a fast step either way stays cached
+PREFETCH_BEHIND = STEP_FRAMES
+PREFETCH_AHEAD = STEP_FRAMES
+
+# Forward gaps up to this many frames are crossed with grab() instead of a seek
+GRAB_LIMIT = 30
+
+# A cached frame this close to a requested one stands in until it is decoded
+APPROXIMATE_DISTANCE = 150
+
+
+class FrameCache:
+    """Thread-safe LRU of frames keyed by frame index, bounded by total bytes"""
+
+    def __init__(self, max_bytes=DEFAULT_CACHE_BYTES):
+        self.max_bytes = max_bytes
+        self.nbytes = 0
+        self.hits = 0
+        self.misses = 0
+        self._frames = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._frames)
+
+    def __contains__(self, index):
+        with self._lock:
+            return index in self._frames
+
+    def get(self, index):
+        """Return the frame for index, or None, marking it most recently used"""
+        with self._lock:
+            frame = self._frames.get(index)
+            if frame is None:
+                self.misses += 1
+                return None
+            self._frames.move_to_end(index)
+            self.hits += 1
+            return frame
+
+    def put(self, index, frame):
+        """Store frame, evicting the least recently used frames over the budget"""
+        with self._lock:
+            old = self._frames.pop(index, None)
+            if old is not None:
+                self.nbytes -= old.nbytes
+            if frame.nbytes > self.max_bytes:
+                return
+            self._frames[index] = frame
+            self.nbytes += frame.nbytes
+            while self.nbytes > self.max_bytes:
+                _, evicted = self._frames.popitem(last=False)
+                self.nbytes -= evicted.nbytes
+
+    def nearest(self, index, max_distance):
+        """Return the cached frame closest to index within max_distance, or None.
+
+        Does not count as a hit or change the LRU order.
+        """
+        with self._lock:
+            best = min(self._frames, key=lambda i: abs(i - index), default=None)
+            if best is None or abs(best - index) > max_distance:
+                return None
+            return self._frames[best]
+
+    def clear(self):
+        with self._lock:
+            self._frames.clear()
+            self.nbytes = 0
+
+
+class PreviewSource:
+    """Display-sized RGB frames of one video, cached and prefetched.
+
+    From now on cap is only read by this object, from the calling thread
+    and the prefetch thread in turn. The caller still owns it and releases
+    it after close(). size is the (width, height) frames are resized to.
+    timer is an optional timing.StageTimer.
+    """
+
+    def __init__(self, cap, size, total_frames, cache_bytes=DEFAULT_CACHE_BYTES,
+                 behind=PREFETCH_BEHIND, ahead=PREFETCH_AHEAD, timer=None):
+        self.cap = cap
+        self.size = size
+        self.total_frames = total_frames
+        self.behind = behind
+        self.ahead = ahead
+        self.cache = FrameCache(cache_bytes)
+        self.timer = timer
+
+        self._cap_lock = threading.Lock()
+        self._position = None  # index of the frame cap returns next; None = unknown
+        self._buffer = None
+        self._wanted = None  # playhead the prefetcher should fill around next
+        self._pending = None  # (index, on_frame) of the newest unanswered request()
+        self._closed = False
+        self._wake = threading.Condition()
+        self._thread = threading.Thread(target=self._prefetch_loop, name="preview-prefetch",
+                                        daemon=True)
+        self._thread.start()
+
+    def frame(self, index):
+        """Return the display frame for index (None if it cannot be decoded) and prefetch around it"""
+        frame = self.cache.get(index)
+        if frame is None:
+            with self._cap_lock:
+                frame = self._read(index)
+        self.prefetch(index)
+        return frame
+
+    def request(self, index, on_frame):
+        """Return (frame, exact) for index without decoding on the calling thread.
+
+        A cached frame is returned with exact=True. Otherwise the nearest
+        cached frame (or None) is returned with exact=False, and the exact
+        frame is decoded in the background. on_frame(index, frame) is then
+        called from the background thread, unless a newer request() has
+        replaced this one by then. frame is None if index cannot be decoded.
+        """
+        frame = self.cache.get(index)
+        if frame is not None:
+            self.prefetch(index)
+            return frame, True
+        with self._wake:
+            self._pending = (index, on_frame)
+            self._wanted = index
+            self._wake.notify()
+        return self.cache.nearest(index, APPROXIMATE_DISTANCE), False
+
+    def prefetch(self, index):
+        """Ask the prefetcher to fill the cache around index; replaces any earlier request"""
+        with self._wake:
+            self._wanted = index
+            self._wake.notify()
+
+    def close(self):
+        """Stop the prefetch thread; the capture is left open"""
+        with self._wake:
+            self._closed = True
+            self._wake.notify()
+        self._thread.join()
+
+    def _read(self, index):
+        """Decode, resize and cache frame index; the caller holds _cap_lock"""
+        timer = self.timer
+        start = time.perf_counter() if timer is not None else None
+        position = self._position
+        if position is None or not position <= index <= position + GRAB_LIMIT:
+            if not self.cap.set(cv2.CAP_PROP_POS_FRAMES, index):
+                return None
+            self._position = index
+            if timer is not None:
+                start = timer.record("seek", start)
+        while self._position < index:
+            if not self.cap.grab():
+                self._position = None
+                return None
+            self._position += 1
+            if timer is not None:
+                start = timer.record("skip", start)
+        if not self.cap.grab():
+            self._position = None
+            return None
+        self._position += 1
+        if timer is not None:
+            start = timer.record("decode", start)
+        ret, self._buffer = self.cap.retrieve(image=self._buffer)
+        if not ret:
+            self._position = None
+            return None
+        if timer is not None:
+            start = timer.record("convert", start)
+        # Resize before the colour conversion so it only touches display pixels
+        frame = cv2.cvtColor(cv2.resize(self._buffer, self.size), cv2.COLOR_BGR2RGB)
+        if timer is not None:
+            timer.record("resize", start)
+        self.cache.put(index, frame)
+        return frame
+
+    def _prefetch_loop(self):
+        while True:
+            with self._wake:
+                while self._pending is None and self._wanted is None and not self._closed:
+                    self._wake.wait()
+                if self._closed:
+                    return
+                pending, self._pending = self._pending, None
+                if pending is None:
+                    centre = self._wanted
+                    self._wanted = None
+            if pending is not None:
+                # Requests come before prefetching; _wanted still holds this
+                # index (or a newer one), so its neighbourhood is filled next
+                self._answer(*pending)
+            else:
+                self._fill(centre)
+
+    def _answer(self, index, on_frame):
+        frame = self.cache.get(index)
+        if frame is None:
+            with self._cap_lock:
+                frame = self._read(index)
+        if self._pending is None:
+            on_frame(index, frame)
+
+    def _fill(self, centre):
+        last = min(self.total_frames - 1, centre + self.ahead)
+        first = max(0, centre - self.behind)
+        # Ahead of the playhead first: playback and most steps go forward
+        for start, stop in ((centre + 1, last), (first, centre - 1)):
+            missing = [i for i in range(start, stop + 1) if i not in self.cache]
+            if not missing:
+                continue
+            for index in range(missing[0], missing[-1] + 1):
+                if self._wanted is not None or self._pending is not None or self._closed:
+                    return  # the playhead moved; start again around its new position
+                if index in self.cache:
+                    continue  # _read() grabs past it without converting
+                with self._cap_lock:
+                    if self._read(index) is None:
+                        break
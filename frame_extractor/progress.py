@@ -0,0 +1,142 @@
+"""Rate-limited progress reporting shared by the extractor and the cropper.
+
+Workers call ProgressReporter.update() as often as they like, from any
+thread. The reporter coalesces those calls and invokes its callback with a
+ProgressSnapshot at most once per interval, plus once at the end, so a Tk
+event queue or a log file sees a bounded number of updates regardless of
+frame rate. Every consumer formats the same snapshot, so the GUI, the CLI
+and logs agree on frames/s, MB/s and ETA.
+"""
+import threading
+import time
+from dataclasses import dataclass
+
+DEFAULT_INTERVAL = 0.1
+
+# Weight of the newest interval in the smoothed rates
+SMOOTHING = 0.3
+
+
+def format_duration(seconds):
+    seconds = int(round(seconds))
+    hours, rest = divmod(seconds, 3600)
+    minutes, seconds = divmod(rest, 60)
+    if hours:
+        return f"{hours}:{minutes:02d}:{seconds:02d}"
+    return f"{minutes}:{seconds:02d}"
+
+
+@dataclass(frozen=True)
+class ProgressSnapshot:
+    """Immutable view of a job's progress at one point in time"""
+    done: int
+    total: int
+    elapsed: float
+    fps: float
+    bytes_done: int = None
+    bytes_per_second: float = None
+    eta: float = None
+    finished: bool = False
+
+    @property
+    def fraction(self):
+        return self.done / self.total if self.total else 0.0
+
+    def format(self):
+        """Return e.g. '120/3600 | 45.2 fps | 12.3 MB/s | ETA 1:17'"""
+        parts = [f"{self.done}/{self.total}" if self.total else str(self.done),
+                 f"{self.fps:.1f} fps"]
+        if self.bytes_per_second is not None:
+            parts.append(f"{self.bytes_per_second / 1e6:.1f} MB/s")
+        if self.finished:
+            parts.append(f"took {format_duration(self.elapsed)}")
+        elif self.eta is not None:
+            parts.append(f"ETA {format_duration(self.eta)}")
+        return " | ".join(parts)
+
+
+class ProgressReporter:
+    """Coalesce progress updates into snapshots emitted at most every interval seconds.
+
+    bytes_source, if given, is called only when a snapshot is emitted and
+    should return the bytes produced so far (e.g. an output file size).
+    """
+
+    def __init__(self, callback=None, interval=DEFAULT_INTERVAL, total=0, bytes_source=None):
+        self.callback = callback
+        self.interval = interval
+        self.total = total
+        self.bytes_source = bytes_source
+        self.done = 0
+        self.bytes_done = None
+        self._start = time.monotonic()
+        self._last_emit = None
+        self._last_done = 0
+        self._last_bytes = 0
+        self._fps = None
+        self._bps = None
+        self._lock = threading.Lock()
+        self.last_snapshot = None
+
+    def start(self, total=None):
+        """Reset the clock and emit an initial snapshot"""
+        with self._lock:
+            if total is not None:
+                self.total = total
+            self._start = time.monotonic()
+            self._emit(self._start, finished=False)
+
+    def update(self, done=None, bytes_done=None, advance=0, total=None):
+        """Record progress; emits a snapshot if interval has passed since the last one.
+
+        Pass either the absolute done count or advance by a delta.
+        """
+        with self._lock:
+            if total is not None:
+                self.total = total
+            self.done = self.done + advance if done is None else done
+            if bytes_done is not None:
+                self.bytes_done = bytes_done
+            now = time.monotonic()
+            if self._last_emit is None or now - self._last_emit >= self.interval:
+                self._emit(now, finished=False)
+
+    def finish(self):
+        """Emit a final snapshot regardless of the interval and return it"""
+        with self._lock:
+            self._emit(time.monotonic(), finished=True)
+            return self.last_snapshot
+
+    def _emit(self, now, finished):
+        if self.bytes_source is not None:
+            self.bytes_done = self.bytes_source()
+        elapsed = now - self._start
+        span = now - self._last_emit if self._last_emit is not None else elapsed
+
+        if finished or span <= 0:
+            fps = self.done / elapsed if elapsed > 0 else 0.0
+            bps = self.bytes_done / elapsed if elapsed > 0 and self.bytes_done is not None else None
+        else:
+            fps = self._smooth(self._fps, (self.done - self._last_done) / span)
+            bps = None
+            if self.bytes_done is not None:
+                bps = self._smooth(self._bps, (self.bytes_done - self._last_bytes) / span)
+        self._fps, self._bps = fps, bps
+
+        eta = None
+        if self.total and fps > 0:
+            eta = max(self.total - self.done, 0) / fps
+
+        self._last_emit = now
+        self._last_done = self.done
+        self._last_bytes = self.bytes_done or 0
+        self.last_snapshot = ProgressSnapshot(self.done, self.total, elapsed, fps,
+                                              self.bytes_done, bps, eta, finished)
+        if self.callback:
+            self.callback(self.last_snapshot)
+
+    @staticmethod
+    def _smooth(previous, current):
+        if previous is None:
+            return current
+        return SMOOTHING * current + (1 - SMOOTHING) * previous
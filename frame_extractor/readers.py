@@ -0,0 +1,235 @@
+"""Video readers: the decode side of both tools.
+
+Everything that decodes frames (the extraction engine, segment workers,
+iter_frames(), crop export and the cropper's preview and thumbnails)
+drives a small part of the cv2.VideoCapture interface: isOpened(),
+get()/set() of the CAP_PROP_* properties below, grab(), retrieve(),
+read() and release(). open_reader() returns either a cv2.VideoCapture or
+a PyAVCapture, which implements the same part on top of PyAV (FFmpeg's
+libraries), so none of that code cares which decoder it runs on.
+
+PyAV is optional (pip install av). Compared with OpenCV it offers:
+
+- Decoder threading: threads sets the thread count (0 = FFmpeg decides)
+  and thread_type picks "frame" threading (several frames decoded at
+  once; best for sequential reads), "slice" threading (one frame split
+  across threads; no added latency after a seek) or "auto" (both).
+- Exact timestamps: CAP_PROP_POS_MSEC is the presentation timestamp of
+  the last frame grabbed, not a frame count divided by the frame rate.
+- keyframes_only: the decoder is told to discard every non-key frame
+  (AVDISCARD_NONKEY), so they are demuxed but never decoded. grab() still
+  steps through every frame number so positions keep their meaning, but
+  non-key frames cost nothing and cannot be retrieved.
+
+keyframe_indices() lists the keyframes of a video by demuxing only, with
+either decoder; it is what the "keyframes" extraction mode samples.
+"""
+import importlib.util
+
+import cv2
+
+from .options import DECODERS, THREAD_TYPES  # noqa: F401 (re-exported)
+
+_THREAD_TYPES = {"auto": "AUTO", "frame": "FRAME", "slice": "SLICE"}
+
+
+def pyav_available():
+    """Whether PyAV can be imported, without importing it"""
+    return importlib.util.find_spec("av") is not None
+
+
+class PyAVCapture:
+    """cv2.VideoCapture look-alike that decodes the first video stream with PyAV"""
+
+    def __init__(self, video_path, threads=0, thread_type="auto", keyframes_only=False):
+        import av
+
+        self._error = av.error.FFmpegError
+        self.keyframes_only = keyframes_only
+        self._container = None
+        try:
+            container = av.open(video_path)
+            stream = container.streams.video[0]
+        except (self._error, OSError, IndexError):
+            return
+        stream.thread_type = _THREAD_TYPES[thread_type]
+        stream.codec_context.thread_count = threads
+        if keyframes_only:
+            stream.codec_context.skip_frame = "NONKEY"
+        self._container = container
+        self._stream = stream
+        self._fps = float(stream.average_rate or stream.guessed_rate or 0)
+        self._time_base = float(stream.time_base)
+        self._start = stream.start_time or 0
+        self._frame_count = stream.frames or 0
+        if not self._frame_count and stream.duration and self._fps:
+            self._frame_count = int(round(stream.duration * self._time_base * self._fps))
+        self._decoder = None
+        self._frame = None  # last frame grabbed; None for a non-key frame in keyframes_only
+        self._pending = None  # next decoded frame, not grabbed yet
+        self._ended = False  # the decoder has no frames left
+        self._next = 0  # index of the frame grab() returns next
+
+    def isOpened(self):
+        return self._container is not None
+
+    def _index(self, frame):
+        """Frame number of a decoded frame, from its presentation timestamp"""
+        if frame.pts is None or not self._fps:
+            return self._next
+        return int(round((frame.pts - self._start) * self._time_base * self._fps))
+
+    def _decode(self):
+        """Return the next decoded frame, or None at the end of the stream or on an error"""
+        if self._decoder is None:
+            self._decoder = self._container.decode(self._stream)
+        try:
+            return next(self._decoder)
+        except (StopIteration, self._error):
+            return None
+
+    def _skipped(self):
+        """Whether the next frame is one the decoder discarded in keyframes_only mode"""
+        if not self.keyframes_only:
+            return False
+        if self._pending is None:
+            return self._next < self._frame_count
+        return self._next < self._index(self._pending)
+
+    def grab(self):
+        if self._pending is None and not self._ended:
+            self._pending = self._decode()
+            self._ended = self._pending is None
+        if self._skipped():
+            # Step over the frame without decoding anything
+            self._frame = None
+        elif self._pending is None:
+            return False
+        else:
+            self._frame, self._pending = self._pending, None
+        self._next += 1
+        return True
+
+    def retrieve(self, image=None):
+        """Return (ok, frame) for the last grabbed frame as a new BGR array.
+
+        image is accepted for compatibility and ignored: PyAV converts into
+        an array of its own.
+        """
+        if self._frame is None:
+            return False, None
+        return True, self._frame.to_ndarray(format="bgr24")
+
+    def read(self, image=None):
+        if not self.grab():
+            return False, None
+        return self.retrieve(image)
+
+    def set(self, prop, value):
+        """Only CAP_PROP_POS_FRAMES is supported: seek so the next grab() returns frame value"""
+        if prop != cv2.CAP_PROP_POS_FRAMES or self._container is None:
+            return False
+        target = int(value)
+        pts = self._start + int(round(target / self._fps / self._time_base)) if self._fps else 0
+        try:
+            self._container.seek(pts, stream=self._stream, backward=True, any_frame=False)
+        except self._error:
+            return False
+        self._decoder = None
+        self._frame = None
+        # Decode forward from the keyframe the seek landed on
+        while True:
+            frame = self._decode()
+            if frame is None or frame.pts is None or self._index(frame) >= target:
+                break
+        self._pending = frame
+        self._ended = frame is None
+        self._next = target
+        return frame is not None or (self.keyframes_only and target < self._frame_count)
+
+    def get(self, prop):
+        if self._container is None:
+            return 0.0
+        if prop == cv2.CAP_PROP_POS_FRAMES:
+            return float(self._next)
+        if prop == cv2.CAP_PROP_POS_MSEC:
+            if self._frame is not None and self._frame.pts is not None:
+                return (self._frame.pts - self._start) * self._time_base * 1000
+            return (self._next - 1) * 1000 / self._fps if self._fps and self._next else 0.0
+        if prop == cv2.CAP_PROP_FPS:
+            return self._fps
+        if prop == cv2.CAP_PROP_FRAME_COUNT:
+            return float(self._frame_count)
+        if prop == cv2.CAP_PROP_FRAME_WIDTH:
+            return float(self._stream.codec_context.width)
+        if prop == cv2.CAP_PROP_FRAME_HEIGHT:
+            return float(self._stream.codec_context.height)
+        return 0.0
+
+    def release(self):
+        if self._container is not None:
+            self._container.close()
+            self._container = None
+
+
+def open_reader(video_path, decoder="opencv", threads=0, thread_type="auto",
+                keyframes_only=False):
+    """Return a capture for video_path on one of DECODERS; check isOpened() before use.
+
+    threads, thread_type and keyframes_only only apply to "pyav"; OpenCV
+    picks its own threading and always decodes every frame. Raises
+    ImportError if "pyav" is asked for but PyAV is not installed.
+    """
+    if decoder == "pyav":
+        return PyAVCapture(video_path, threads, thread_type, keyframes_only)
+    return cv2.VideoCapture(video_path)
+
+
+def config_reader(config, keyframes_only=False):
+    """open_reader() for the decoder settings of an ExtractionConfig or CropConfig"""
+    return open_reader(config.video_path, config.decoder, config.decode_threads,
+                       config.thread_type, keyframes_only)
+
+
+def keyframe_indices(video_path, decoder="opencv", fps=None):
+    """Return the sorted frame numbers of the video's keyframes.
+
+    Only the container is read: packets are demuxed and their keyframe
+    flags checked, but nothing is decoded, so this costs about as much
+    as reading the file. fps converts timestamps to frame numbers and
+    defaults to the stream's.
+    """
+    if decoder == "pyav":
+        return _pyav_keyframes(video_path, fps)
+    # CAP_PROP_FORMAT -1 makes grab() return raw packets, undecoded
+    cap = cv2.VideoCapture(video_path, cv2.CAP_FFMPEG, [cv2.CAP_PROP_FORMAT, -1])
+    try:
+        if not cap.isOpened():
+            return []
+        fps = fps or cap.get(cv2.CAP_PROP_FPS)
+        keyframes = set()
+        count = 0
+        while cap.grab():
+            if cap.get(cv2.CAP_PROP_LRF_HAS_KEY_FRAME):
+                # Packets arrive in decode order; the timestamp gives the display position
+                msec = cap.get(cv2.CAP_PROP_POS_MSEC)
+                keyframes.add(int(round(msec * fps / 1000)) if fps and msec >= 0 else count)
+            count += 1
+        return sorted(keyframes)
+    finally:
+        cap.release()
+
+
+def _pyav_keyframes(video_path, fps):
+    import av
+
+    with av.open(video_path) as container:
+        stream = container.streams.video[0]
+        fps = fps or float(stream.average_rate or stream.guessed_rate or 0)
+        time_base = float(stream.time_base)
+        start = stream.start_time or 0
+        keyframes = set()
+        for packet in container.demux(stream):
+            if packet.is_keyframe and packet.pts is not None:
+                keyframes.add(int(round((packet.pts - start) * time_base * fps)))
+        return sorted(keyframes)
@@ -0,0 +1,114 @@
+"""Resize stage for dataset-oriented extraction.
+
+Frames for model training are usually wanted at 224-512 px, not at the
+source resolution. Resizing before encoding means the writers compress
+and store images a fraction of the size, which is where most of the time
+and disk traffic of a full-resolution extraction goes.
+
+A Resizer is planned once per job from the (cropped) source size, so the
+per-frame work is one cv2.resize call on a view of the decoded frame.
+Aspect policies for a target box of WIDTHxHEIGHT:
+
+"fit"      Scale to fit inside the box, keeping the aspect ratio; the
+           output can be smaller than the box on one side.
+"fill"     Scale to cover the box, keeping the aspect ratio, and cut the
+           overflow off both sides evenly (a centre crop of the source,
+           taken before resizing so no pixels are resized in vain).
+"pad"      Like fit, then centred on a black canvas of exactly the box.
+"stretch"  Resize to the box, ignoring the aspect ratio.
+
+A scale factor instead of a box resizes both sides by that factor.
+"""
+import cv2
+import numpy as np
+
+from .options import ASPECTS, INTERPOLATIONS  # noqa: F401 (re-exported)
+
+_FLAGS = {
+    "nearest": cv2.INTER_NEAREST,
+    "linear": cv2.INTER_LINEAR,
+    "cubic": cv2.INTER_CUBIC,
+    "area": cv2.INTER_AREA,
+    "lanczos": cv2.INTER_LANCZOS4,
+}
+
+
+def size_label(size):
+    """Name of the subfolder holding one output size, e.g. "224x224\""""
+    width, height = size
+    return f"{width}x{height}"
+
+
+def interpolation_flag(interpolation, shrinking):
+    """cv2 interpolation flag; "auto" is area averaging when shrinking and bicubic when enlarging"""
+    if interpolation == "auto":
+        return cv2.INTER_AREA if shrinking else cv2.INTER_CUBIC
+    return _FLAGS[interpolation]
+
+
+class Resizer:
+    """Resizes frames of one source size to one output size.
+
+    size is (width, height) and is applied with the aspect policy;
+    scale, used instead of size, multiplies both sides. shape is the
+    (height, width, 3) of the frames __call__ returns.
+    """
+
+    def __init__(self, frame_width, frame_height, size=None, scale=None, aspect="fit",
+                 interpolation="auto"):
+        self.source = (slice(None), slice(None))
+        source_width, source_height = frame_width, frame_height
+        self.offset = None  # (x, y) of the image on the canvas in "pad"
+        if scale is not None:
+            self.label = f"{scale:g}x"
+            scaled = (round(frame_width * scale), round(frame_height * scale))
+            box = scaled
+        else:
+            self.label = size_label(size)
+            box = tuple(size)
+            box_width, box_height = box
+            if aspect == "stretch":
+                scaled = box
+            elif aspect == "fill":
+                factor = max(box_width / frame_width, box_height / frame_height)
+                source_width = min(frame_width, max(1, round(box_width / factor)))
+                source_height = min(frame_height, max(1, round(box_height / factor)))
+                x = (frame_width - source_width) // 2
+                y = (frame_height - source_height) // 2
+                self.source = (slice(y, y + source_height), slice(x, x + source_width))
+                scaled = box
+            else:
+                factor = min(box_width / frame_width, box_height / frame_height)
+                scaled = (round(frame_width * factor), round(frame_height * factor))
+                if aspect == "pad":
+                    self.offset = ((box_width - scaled[0]) // 2, (box_height - scaled[1]) // 2)
+                else:
+                    box = scaled
+        self.scaled = (max(1, scaled[0]), max(1, scaled[1]))
+        self.shape = (max(1, box[1]), max(1, box[0]), 3)
+        shrinking = self.scaled[0] * self.scaled[1] < source_width * source_height
+        self.flag = interpolation_flag(interpolation, shrinking)
+
+    def __call__(self, frame):
+        """Return the resized frame as a new array; frame is left untouched"""
+        source = frame[self.source]
+        if self.offset is None:
+            return cv2.resize(source, self.scaled, interpolation=self.flag)
+        canvas = np.zeros(self.shape, dtype=frame.dtype)
+        x, y = self.offset
+        width, height = self.scaled
+        # Resize straight into the canvas instead of copying the result in
+        cv2.resize(source, self.scaled, dst=canvas[y:y + height, x:x + width],
+                   interpolation=self.flag)
+        return canvas
+
+
+def make_resizers(frame_width, frame_height, sizes=None, scale=None, aspect="fit",
+                  interpolation="auto"):
+    """Return one Resizer per output size, or [None] when frames keep the source size"""
+    if scale is not None:
+        return [Resizer(frame_width, frame_height, scale=scale, interpolation=interpolation)]
+    if not sizes:
+        return [None]
+    return [Resizer(frame_width, frame_height, size, aspect=aspect, interpolation=interpolation)
+            for size in sizes]
@@ -0,0 +1,112 @@
+"""Target-frame scheduler for sequential decoding.
+
+The scheduler walks a sorted sequence of target frame indices with a
+cursor. Frames before the next target are skipped with cap.grab(), which
+demuxes and decodes but never converts the frame into a numpy array; only
+target frames pay for cap.retrieve(). Gaps longer than seek_threshold
+frames are crossed with a CAP_PROP_POS_FRAMES seek instead (see
+planner.py for how the threshold is chosen). A seek is checked the same
+way as in seek_to(); if the backend cannot land on the exact frame, the
+capture is rewound and the scheduler grabs forward from then on.
+
+retrieve() can decode into an existing array instead of allocating a new
+6-25 MB one per frame; pass frames() a `buffer` callable to supply it.
+
+Given a StageTimer (see timing.py), frames() records the "seek", "skip"
+(grab of a frame that is not a target), "decode" (grab of a target) and
+"convert" (retrieve, the colour conversion into BGR) stages.
+"""
+import time
+
+import cv2
+
+
+def seek_to(cap, frame):
+    """Position cap so that it returns frame next; return the frame it will actually return.
+
+    The seek is trusted only if the backend reports the exact position
+    afterwards. Otherwise the capture is rewound and 0 is returned, so the
+    caller decodes up from the start instead.
+    """
+    if frame <= 0 or not cap.set(cv2.CAP_PROP_POS_FRAMES, frame):
+        return 0
+    if int(cap.get(cv2.CAP_PROP_POS_FRAMES)) == frame:
+        return frame
+    cap.set(cv2.CAP_PROP_POS_FRAMES, 0)
+    return 0
+
+
+class FrameScheduler:
+    """Yield (frame_index, frame) for each target index, in order.
+
+    targets must be sorted ascending; a range object works without being
+    materialised, so "all frames" mode costs O(1) memory. seek_threshold
+    is the gap length above which seeking replaces grab(); None disables
+    seeking. position is the index of the frame the capture will return
+    next, for captures that have already been positioned.
+    """
+
+    def __init__(self, targets, seek_threshold=None, position=0):
+        self.targets = targets
+        self.seek_threshold = seek_threshold
+        self.position = position  # index of the next frame the capture will return
+        self.skipped = 0
+        self.retrieved = 0
+        self.seeks = 0
+
+    def _seek(self, cap, target):
+        landed = seek_to(cap, target)
+        if landed != target:
+            # Inaccurate seeking: grab up from where seek_to() left the capture,
+            # and don't try again on this capture
+            self.position = landed
+            self.seek_threshold = None
+            return False
+        self.position = target
+        self.seeks += 1
+        return True
+
+    def __len__(self):
+        return len(self.targets)
+
+    def frames(self, cap, should_cancel=None, buffer=None, timer=None):
+        """Yield (frame_index, frame) for each target.
+
+        buffer, if given, is called before each retrieve() and returns an
+        array to decode into (or None to let OpenCV allocate one). timer is
+        an optional timing.StageTimer.
+        """
+        for target in self.targets:
+            if target < self.position:
+                continue  # duplicate or unsorted target; already passed
+            if self.seek_threshold is not None and target - self.position > self.seek_threshold:
+                start = time.perf_counter() if timer is not None else None
+                self._seek(cap, target)
+                if timer is not None:
+                    timer.record("seek", start)
+            while self.position < target:
+                if should_cancel and should_cancel():
+                    return
+                start = time.perf_counter() if timer is not None else None
+                if not cap.grab():
+                    return
+                if timer is not None:
+                    timer.record("skip", start)
+                self.position += 1
+                self.skipped += 1
+
+            if should_cancel and should_cancel():
+                return
+            start = time.perf_counter() if timer is not None else None
+            if not cap.grab():
+                return
+            if timer is not None:
+                start = timer.record("decode", start)
+            self.position += 1
+            ret, frame = cap.retrieve(image=buffer() if buffer else None)
+            if not ret:
+                return
+            if timer is not None:
+                timer.record("convert", start)
+            self.retrieved += 1
+            yield target, frame
@@ -0,0 +1,154 @@
+"""Multi-process segmented extraction.
+
+A single cv2.VideoCapture decodes on one core. For long "all frames" jobs
+the target list is split into contiguous segments, and each segment is
+decoded by its own process with its own capture. Target i of the job is
+always written as sequence number i + 1, whichever process handles it,
+so the output is identical to a single-process run.
+
+Each worker positions its capture with a frame-accurate CAP_PROP_POS_FRAMES
+seek. The backend seeks to the preceding keyframe and decodes forward, so
+a segment boundary costs at most one GOP of extra decoding.
+"""
+import multiprocessing
+import os
+import queue
+import time
+from dataclasses import replace
+
+from .engine import ExtractionError, extract_targets
+from .manifest import JOURNAL_NAME, Journal
+from .readers import config_reader
+from .scheduler import seek_to
+from .writers import WriteStats
+
+# Minimum seconds between progress messages from one worker
+PROGRESS_INTERVAL = 0.1
+
+
+def split_targets(targets, seqs, segments):
+    """Split targets and their seqs into at most `segments` contiguous (seqs, targets) parts"""
+    total = len(targets)
+    segments = max(1, min(segments, total))
+    parts = []
+    for i in range(segments):
+        start = total * i // segments
+        end = total * (i + 1) // segments
+        if end > start:
+            parts.append((seqs[start:end], targets[start:end]))
+    return parts
+
+
+def _segment_worker(config, seqs, targets, seek_threshold, journal_path, messages, cancel_event):
+    """Process entry point: extract one segment and report through messages"""
+    first_seq = seqs[0]
+    cap = config_reader(config, keyframes_only=config.mode == "keyframes")
+    try:
+        if not cap.isOpened():
+            raise ExtractionError("Could not open video file.")
+        position = seek_to(cap, targets[0])
+
+        reported = 0
+        reported_bytes = 0
+        last_report = 0.0
+
+        def on_written(written, bytes_written):
+            nonlocal reported, reported_bytes, last_report
+            now = time.monotonic()
+            if now - last_report >= PROGRESS_INTERVAL:
+                messages.put(("progress", first_seq,
+                              (written - reported, bytes_written - reported_bytes)))
+                reported, reported_bytes = written, bytes_written
+                last_report = now
+
+        journal = Journal(journal_path) if journal_path else None
+        stats = extract_targets(config, cap, targets, seqs, seek_threshold, position,
+                                on_written, cancel_event.is_set, journal=journal)
+        messages.put(("done", first_seq, (stats.frames + stats.dropped - reported,
+                                          stats.bytes_written - reported_bytes, stats)))
+    except Exception as e:
+        messages.put(("error", first_seq, f"{type(e).__name__}: {e}"))
+    finally:
+        cap.release()
+
+
+def extract_segmented(config, targets, seqs=None, seek_threshold=None, on_written=None,
+                      should_cancel=None, journaled=False):
+    """Extract targets using config.processes worker processes.
+
+    targets[i] is written as seqs[i] (by default i + 1). on_written(total_frames,
+    total_bytes) is called from this thread as progress messages arrive. With
+    journaled, each worker records its finished frames in its own manifest
+    journal. Returns the combined WriteStats of all workers. Raises
+    ExtractionError if any worker fails; the other workers are stopped.
+    """
+    stats = WriteStats()
+    if seqs is None:
+        seqs = range(1, len(targets) + 1)
+    parts = split_targets(targets, seqs, config.processes)
+    if not parts:
+        return stats
+
+    # Writer threads per process: share the cores instead of oversubscribing
+    if not config.workers:
+        cores = multiprocessing.cpu_count()
+        config = replace(config, workers=max(1, cores // len(parts)))
+
+    ctx = multiprocessing.get_context("spawn")
+    messages = ctx.Queue()
+    cancel_event = ctx.Event()
+    workers = {}
+    for part_seqs, part in parts:
+        first_seq = part_seqs[0]
+        journal_path = None
+        if journaled:
+            journal_path = os.path.join(config.output_dir, f"{JOURNAL_NAME}.{first_seq}")
+        proc = ctx.Process(target=_segment_worker,
+                           args=(config, part_seqs, part, seek_threshold, journal_path,
+                                 messages, cancel_event))
+        proc.daemon = True
+        proc.start()
+        workers[first_seq] = proc
+
+    written = 0
+    written_bytes = 0
+    pending = set(workers)
+    error = None
+    try:
+        while pending:
+            if should_cancel and should_cancel():
+                cancel_event.set()
+            try:
+                kind, first_seq, payload = messages.get(timeout=0.1)
+            except queue.Empty:
+                for first_seq in list(pending):
+                    if not workers[first_seq].is_alive() and workers[first_seq].exitcode:
+                        pending.discard(first_seq)
+                        exitcode = workers[first_seq].exitcode
+                        error = error or f"Worker for segment {first_seq} exited with code {exitcode}"
+                        cancel_event.set()
+                continue
+
+            if kind == "error":
+                pending.discard(first_seq)
+                error = error or payload
+                cancel_event.set()
+                continue
+            if kind == "done":
+                pending.discard(first_seq)
+                frames, nbytes, worker_stats = payload
+                stats.merge(worker_stats)
+            else:
+                frames, nbytes = payload
+            written += frames
+            written_bytes += nbytes
+            if on_written and frames:
+                on_written(written, written_bytes)
+    finally:
+        cancel_event.set()
+        for proc in workers.values():
+            proc.join()
+
+    if error:
+        raise ExtractionError(f"Segmented extraction failed: {error}")
+    return stats
@@ -0,0 +1,211 @@
+"""Streaming frame iterator for in-process consumers.
+
+iter_frames() samples a video exactly like extract_frames() (same modes,
+same seek planning, same FrameScheduler) but hands the decoded frames to
+the caller instead of encoding them:
+
+    for index, timestamp_ms, frame in iter_frames("talk.mp4", interval=2.0):
+        ...
+
+    with iter_frames("talk.mp4", mode="all", size=(224, 224), rgb=True,
+                     batch_size=32) as stream:
+        for indices, timestamps_ms, batch in stream:  # batch is (N, 224, 224, 3)
+            model(batch)
+
+Decoding runs on a background thread that stays up to `prefetch` items
+(frames, or batches when batch_size is set) ahead of the consumer, so
+decode overlaps with whatever the consumer does with each frame. Leaving
+the loop early, or closing the stream, stops the thread.
+"""
+import queue
+import threading
+
+import cv2
+import numpy as np
+
+from .engine import ExtractionConfig, ExtractionError, check_crop, frames_to_extract
+from .pipeline import FramePool
+from .planner import plan_seek_threshold
+from .readers import config_reader, keyframe_indices
+from .scheduler import FrameScheduler
+
+DEFAULT_PREFETCH = 4
+
+_END = object()
+
+
+class FrameStream:
+    """Iterable over (frame_index, timestamp_ms, frame), or batches of them.
+
+    Frames are BGR uint8 arrays (RGB with rgb=True). crop is (x, y,
+    width, height) in source pixels and is applied before resizing to
+    size=(width, height). With batch_size, each item is (indices,
+    timestamps_ms, frames) where frames is one contiguous (N, H, W, C)
+    array; the last batch may be shorter. Batching needs every frame to
+    have the same shape, which is always true for one video.
+
+    Timestamps are the ones the decoder reports for each frame; with
+    decoder="pyav" they are the exact presentation timestamps (see
+    readers.py), and decode_threads sets its thread count.
+    """
+
+    def __init__(self, video_path, mode="interval", interval=1.0, frame_count=10, seek="auto",
+                 crop=None, size=None, rgb=False, batch_size=None, prefetch=DEFAULT_PREFETCH,
+                 decoder="opencv", decode_threads=0):
+        config = ExtractionConfig(video_path, mode=mode, interval=interval,
+                                  frame_count=frame_count, seek=seek, decoder=decoder,
+                                  decode_threads=decode_threads)
+        config.validate()
+        if batch_size is not None and batch_size < 1:
+            raise ValueError("Batch size must be at least 1.")
+        if prefetch < 1:
+            raise ValueError("Prefetch must be at least 1.")
+
+        self.cap = config_reader(config, keyframes_only=mode == "keyframes")
+        if not self.cap.isOpened():
+            raise ExtractionError("Could not open video file.")
+        self.total_frames = int(self.cap.get(cv2.CAP_PROP_FRAME_COUNT))
+        self.fps = self.cap.get(cv2.CAP_PROP_FPS)
+        keyframes = keyframe_indices(video_path, decoder, self.fps) if mode == "keyframes" else None
+        self.targets = frames_to_extract(config, self.total_frames, self.fps, keyframes)
+        self.seek = seek
+        self.crop = check_crop(crop, int(self.cap.get(cv2.CAP_PROP_FRAME_WIDTH)),
+                                int(self.cap.get(cv2.CAP_PROP_FRAME_HEIGHT)))
+        self.size = size
+        self.rgb = rgb
+        self.batch_size = batch_size
+
+        self._queue = queue.Queue(maxsize=prefetch)
+        self._stop = threading.Event()
+        self._thread = None
+        self._closed = False
+
+    def __len__(self):
+        """Number of frames the stream will yield (if none fail to decode)"""
+        return len(self.targets)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def __iter__(self):
+        if self._thread is not None or self._closed:
+            raise RuntimeError("A FrameStream can only be iterated once.")
+        self._thread = threading.Thread(target=self._produce, name="frame-prefetch", daemon=True)
+        self._thread.start()
+        try:
+            while True:
+                item = self._queue.get()
+                if item is _END:
+                    return
+                if isinstance(item, BaseException):
+                    raise item
+                yield item
+        finally:
+            self.close()
+
+    def close(self):
+        """Stop the prefetch thread and release the capture"""
+        self._closed = True
+        self._stop.set()
+        if self._thread is not None:
+            # Unblock a producer waiting on a full queue
+            while self._thread.is_alive():
+                try:
+                    self._queue.get(timeout=0.05)
+                except queue.Empty:
+                    pass
+            self._thread.join()
+        self.cap.release()
+
+    def _transform(self, frame, out=None):
+        if self.crop is not None:
+            x, y, width, height = self.crop
+            frame = frame[y:y + height, x:x + width]
+        if self.rgb:
+            frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+        if self.size is not None:
+            if out is not None:
+                cv2.resize(frame, self.size, dst=out, interpolation=cv2.INTER_AREA)
+                return out
+            return cv2.resize(frame, self.size, interpolation=cv2.INTER_AREA)
+        if out is not None:
+            out[...] = frame
+            return out
+        return np.ascontiguousarray(frame)
+
+    def _timestamp_ms(self):
+        """Timestamp of the frame the scheduler just yielded; the capture has not moved on yet"""
+        return self.cap.get(cv2.CAP_PROP_POS_MSEC)
+
+    def _put(self, item):
+        """Queue item unless the stream was closed; return False once closed"""
+        while not self._stop.is_set():
+            try:
+                self._queue.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                pass
+        return False
+
+    def _produce(self):
+        try:
+            seek_threshold = plan_seek_threshold(self.cap, self.targets, self.total_frames, self.seek)
+            scheduler = FrameScheduler(self.targets, seek_threshold)
+            # When every item handed out is a copy (batch slot, resize or color
+            # conversion), a single decode buffer is reused for all frames
+            pool = None
+            if self.batch_size is not None or self.size is not None or self.rgb:
+                pool = FramePool()
+            frames = scheduler.frames(self.cap, self._stop.is_set,
+                                      pool.acquire if pool else None)
+            if self.batch_size is None:
+                for index, frame in frames:
+                    item = (index, self._timestamp_ms(), self._transform(frame))
+                    if pool:
+                        pool.release(frame)
+                    if not self._put(item):
+                        return
+            else:
+                self._produce_batches(frames, pool)
+            self._put(_END)
+        except Exception as e:
+            self._put(e)
+
+    def _produce_batches(self, frames, pool):
+        batch = indices = timestamps = None
+        filled = 0
+        for index, frame in frames:
+            if batch is None:
+                first = self._transform(frame)
+                batch = np.empty((self.batch_size,) + first.shape, dtype=first.dtype)
+                batch[0] = first
+                indices = np.empty(self.batch_size, dtype=np.int64)
+                timestamps = np.empty(self.batch_size, dtype=np.float64)
+            else:
+                # Transform straight into the batch slot to avoid a copy
+                self._transform(frame, batch[filled])
+            pool.release(frame)
+            indices[filled] = index
+            timestamps[filled] = self._timestamp_ms()
+            filled += 1
+            if filled == self.batch_size:
+                if not self._put((indices, timestamps, batch)):
+                    return
+                batch = indices = timestamps = None
+                filled = 0
+        if filled:
+            self._put((indices[:filled], timestamps[:filled], batch[:filled]))
+
+
+def iter_frames(video_path, mode="interval", interval=1.0, frame_count=10, seek="auto",
+                crop=None, size=None, rgb=False, batch_size=None, prefetch=DEFAULT_PREFETCH,
+                decoder="opencv", decode_threads=0):
+    """Return a FrameStream over the frames extract_frames() would select.
+
+    See FrameStream for the meaning of the arguments and the items yielded.
+    """
+    return FrameStream(video_path, mode, interval, frame_count, seek, crop, size, rgb,
+                       batch_size, prefetch, decoder, decode_threads)
@@ -0,0 +1,190 @@
+"""Persistent low-resolution thumbnail strip for instant scrubbing.
+
+When the cropper opens a video, a background pass decodes one small RGB
+thumbnail every `step` frames, at most MAX_THUMBNAILS for the whole
+video. The strip is stored as a .npy array in the per-user cache
+directory, keyed by the same source fingerprint resumable extraction
+uses (see manifest.source_fingerprint). The next time the file is opened
+the strip is memory-mapped straight from disk. The playhead and the
+timeline hover preview then have a picture for any position before a
+single full frame has been decoded.
+
+The directory is bounded by size. After each build, the least recently
+opened strips are deleted until it fits in max_bytes.
+"""
+import hashlib
+import json
+import os
+import threading
+
+import cv2
+import numpy as np
+
+from .appdirs import cache_dir
+from .manifest import source_fingerprint
+from .planner import plan_seek_threshold
+from .readers import open_reader
+from .scheduler import FrameScheduler
+
+CACHE_SUBDIR = "thumbnails"
+DEFAULT_MAX_BYTES = 512 * 1024 * 1024
+
+THUMBNAIL_WIDTH = 160
+MAX_THUMBNAILS = 1000
+
+
+def thumbnail_step(total_frames, max_count=MAX_THUMBNAILS):
+    """Frames between thumbnails so that a video gets at most max_count"""
+    return max(1, -(-total_frames // max_count))
+
+
+def thumbnail_size(frame_width, frame_height, width=THUMBNAIL_WIDTH):
+    """(width, height) of a thumbnail with the frame's aspect ratio"""
+    return width, max(2, round(frame_height * width / frame_width / 2) * 2)
+
+
+def strip_key(fingerprint):
+    return hashlib.sha1(json.dumps(fingerprint, sort_keys=True).encode()).hexdigest()
+
+
+def evict(directory, max_bytes, keep=()):
+    """Delete the least recently used strips until directory holds at most max_bytes.
+
+    Strips are ordered by modification time, which ThumbnailStrip.load()
+    refreshes on every use. Keys in keep are never deleted. Returns the
+    number of bytes freed.
+    """
+    entries = []
+    for name in os.listdir(directory):
+        if not name.endswith((".npy", ".npy.part")):
+            continue
+        try:
+            st = os.stat(os.path.join(directory, name))
+        except OSError:
+            continue
+        entries.append((st.st_mtime, st.st_size, name))
+    total = sum(size for _, size, _ in entries)
+    freed = 0
+    for _, size, name in sorted(entries):
+        if total <= max_bytes:
+            break
+        if name.split(".")[0] in keep:
+            continue
+        try:
+            os.remove(os.path.join(directory, name))
+        except OSError:
+            continue  # in use by another process
+        total -= size
+        freed += size
+    return freed
+
+
+class ThumbnailStrip:
+    """One RGB thumbnail every `step` frames of a video, memory-mapped from the cache.
+
+    load() returns at once. It maps a strip built earlier, or starts a
+    background thread that builds one. get() may be called from any thread
+    at any time and returns None for positions that are not built yet.
+    """
+
+    def __init__(self, video_path, total_frames, fps, frame_width, frame_height,
+                 directory=None, max_bytes=DEFAULT_MAX_BYTES, decoder="opencv"):
+        self.video_path = video_path
+        self.decoder = decoder  # one of readers.DECODERS
+        self.total_frames = total_frames
+        self.step = thumbnail_step(total_frames)
+        self.size = thumbnail_size(frame_width, frame_height)
+        self.count = len(range(0, total_frames, self.step))
+        self.directory = directory or cache_dir(CACHE_SUBDIR)
+        self.max_bytes = max_bytes
+        self.key = strip_key(source_fingerprint(video_path, total_frames, fps))
+        self.path = os.path.join(self.directory, self.key + ".npy")
+        self.filled = 0  # thumbnails available from the start of the strip
+        self._array = None
+        self._stop = threading.Event()
+        self._thread = None
+
+    @property
+    def complete(self):
+        return self._thread is None or not self._thread.is_alive()
+
+    def load(self):
+        """Map the cached strip, or start building it in the background; return True if cached"""
+        width, height = self.size
+        try:
+            array = np.load(self.path, mmap_mode="r")
+        except (OSError, ValueError):
+            array = None
+        if array is not None and array.shape[1:] == (height, width, 3) and 0 < len(array) <= self.count:
+            os.utime(self.path)  # most recently used, for evict()
+            self._array = array
+            self.filled = len(array)
+            return True
+        if self.count:
+            self._thread = threading.Thread(target=self._build, name="thumbnail-index", daemon=True)
+            self._thread.start()
+        return False
+
+    def get(self, frame_index):
+        """Return the thumbnail at or before frame_index, or None if it is not built yet"""
+        array = self._array
+        slot = min(max(frame_index, 0) // self.step, self.count - 1)
+        if array is None or not self.filled:
+            return None
+        if slot >= self.filled:
+            if not self.complete:
+                return None
+            slot = self.filled - 1  # the video ended before its reported frame count
+        return array[slot]
+
+    def close(self):
+        """Stop a build in progress; a partial strip is not kept"""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+
+    def _build(self):
+        part_path = self.path + ".part"
+        cap = open_reader(self.video_path, self.decoder)
+        try:
+            if not cap.isOpened():
+                return
+            self._decode(cap, part_path)
+            if self._stop.is_set() or not self.filled:
+                self.filled = 0
+                self._array = None
+                os.remove(part_path)
+                return
+            if self.filled < self.count:
+                # The container promised more frames than it had; keep what was decoded
+                short_path = os.path.join(self.directory, self.key + ".short.npy.part")
+                with open(short_path, "wb") as f:
+                    np.save(f, self._array[:self.filled])
+                self._array = None  # unmap first: Windows cannot replace a mapped file
+                os.replace(short_path, part_path)
+            else:
+                self._array = None
+            os.replace(part_path, self.path)
+            self._array = np.load(self.path, mmap_mode="r")
+            evict(self.directory, self.max_bytes, keep=(self.key,))
+        except OSError:
+            pass  # a cache that cannot be written only costs speed
+        finally:
+            cap.release()
+
+    def _decode(self, cap, part_path):
+        """Fill a new strip at part_path until the video ends or close() is called"""
+        width, height = self.size
+        array = np.lib.format.open_memmap(part_path, mode="w+", dtype=np.uint8,
+                                           shape=(self.count, height, width, 3))
+        self._array = array
+        targets = range(0, self.total_frames, self.step)
+        scheduler = FrameScheduler(targets, plan_seek_threshold(cap, targets, self.total_frames))
+        buffer = None
+        for index, frame in scheduler.frames(cap, self._stop.is_set, lambda: buffer):
+            buffer = frame
+            slot = index // self.step
+            cv2.cvtColor(cv2.resize(frame, self.size, interpolation=cv2.INTER_AREA),
+                         cv2.COLOR_BGR2RGB, dst=array[slot])
+            self.filled = slot + 1
+        array.flush()
@@ -0,0 +1,222 @@
+"""Per-stage timers for the decode, encode and preview loops.
+
+A StageTimer is passed down into the hot loops (scheduler, writers,
+containers, crop export, preview decoding), which call
+record(stage, start) around each step of each frame. Every call adds one
+duration to that stage's LatencyHistogram, so a slow job can be pinned on
+seeking, decoding, colour conversion, encoding, disk writes, backpressure
+from the writer queue or UI callbacks. With trace=True each call is also
+kept as an event. write_trace() saves the events as Chrome trace JSON,
+which chrome://tracing and https://ui.perfetto.dev show as one lane per
+thread, so stalls between stages are visible.
+
+Timing is off unless a job asks for it. The loops hold None instead of a
+timer and skip even reading the clock. When it is on, a record() call
+costs about a microsecond: a clock read, a thread-local lookup and a list
+increment. That is well under 1% of any per-frame stage worth measuring.
+Each thread keeps its own histograms, so the writer threads never contend
+for a lock.
+"""
+import json
+import math
+import os
+import threading
+import time
+
+# Set to a folder to make both GUIs write a trace and a summary for every job
+TRACE_ENV = "FRAME_EXTRACTOR_TRACE"
+
+# Events kept per thread for the trace; beyond this only histograms are updated
+MAX_TRACE_EVENTS = 500_000
+
+BUCKETS_PER_OCTAVE = 4
+BUCKET_COUNT = 30 * BUCKETS_PER_OCTAVE  # 1 us to ~18 minutes
+
+
+def _bucket(seconds):
+    micros = seconds * 1e6
+    if micros < 1:
+        return 0
+    return min(BUCKET_COUNT - 1, int(math.log2(micros) * BUCKETS_PER_OCTAVE) + 1)
+
+
+def _bucket_value(index):
+    """Representative duration in seconds of a bucket (its geometric midpoint)"""
+    if index == 0:
+        return 0.5e-6
+    return 2 ** ((index - 0.5) / BUCKETS_PER_OCTAVE) * 1e-6
+
+
+def format_seconds(seconds):
+    if seconds >= 1:
+        return f"{seconds:.2f} s"
+    if seconds >= 1e-3:
+        return f"{seconds * 1e3:.2f} ms"
+    return f"{seconds * 1e6:.0f} us"
+
+
+class LatencyHistogram:
+    """Durations in log-spaced buckets, four per doubling, plus exact count, total and max"""
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.buckets = [0] * BUCKET_COUNT
+
+    def add(self, seconds):
+        self.count += 1
+        self.total += seconds
+        if seconds > self.max:
+            self.max = seconds
+        self.buckets[_bucket(seconds)] += 1
+
+    def merge(self, other):
+        self.count += other.count
+        self.total += other.total
+        self.max = max(self.max, other.max)
+        for i, n in enumerate(other.buckets):
+            self.buckets[i] += n
+
+    @property
+    def mean(self):
+        return self.total / self.count if self.count else 0.0
+
+    def percentile(self, q):
+        """Approximate q-th percentile (0-100) in seconds, to within about 10%"""
+        if not self.count:
+            return 0.0
+        rank = q / 100 * self.count
+        seen = 0
+        for i, n in enumerate(self.buckets):
+            seen += n
+            if seen >= rank and n:
+                return min(_bucket_value(i), self.max)
+        return self.max
+
+    def to_dict(self):
+        return {"count": self.count, "total": self.total, "mean": self.mean,
+                "p50": self.percentile(50), "p95": self.percentile(95),
+                "p99": self.percentile(99), "max": self.max}
+
+
+class _ThreadTimings:
+    def __init__(self):
+        thread = threading.current_thread()
+        self.name = thread.name
+        self.ident = thread.ident
+        self.histograms = {}
+        self.events = []
+
+
+class StageTimer:
+    """Collects per-stage latency histograms, and optionally trace events, from any thread"""
+
+    def __init__(self, trace=False, max_events=MAX_TRACE_EVENTS):
+        self.trace = trace
+        self.max_events = max_events
+        self.origin = time.perf_counter()
+        self._threads = []
+        self._local = threading.local()
+        self._lock = threading.Lock()
+
+    def _timings(self):
+        timings = _ThreadTimings()
+        self._local.timings = timings
+        with self._lock:
+            self._threads.append(timings)
+        return timings
+
+    def record(self, stage, start, end=None):
+        """Add the time from start to end (time.perf_counter() values) to stage.
+
+        end defaults to now. Returns end, so consecutive stages can be
+        chained: start = timer.record("decode", start).
+        """
+        if end is None:
+            end = time.perf_counter()
+        timings = getattr(self._local, "timings", None) or self._timings()
+        histogram = timings.histograms.get(stage)
+        if histogram is None:
+            histogram = timings.histograms[stage] = LatencyHistogram()
+        histogram.add(end - start)
+        if self.trace and len(timings.events) < self.max_events:
+            timings.events.append((stage, start, end))
+        return end
+
+    def histograms(self):
+        """Return {stage: LatencyHistogram} merged over all threads, in order of first use"""
+        merged = {}
+        with self._lock:
+            threads = list(self._threads)
+        for timings in threads:
+            for stage, histogram in list(timings.histograms.items()):
+                merged.setdefault(stage, LatencyHistogram()).merge(histogram)
+        return merged
+
+    def summary(self):
+        """One line with the median and p95 per-frame time of each stage, busiest first.
+
+        Totals are summed over threads, so stages that run on several
+        writer threads at once can add up to more than the wall time.
+        """
+        histograms = self.histograms()
+        if not histograms:
+            return "Stage timings: nothing recorded"
+        parts = []
+        for stage, h in sorted(histograms.items(), key=lambda item: -item[1].total):
+            parts.append(f"{stage} {format_seconds(h.percentile(50))} p50 / "
+                         f"{format_seconds(h.percentile(95))} p95 x{h.count} "
+                         f"({format_seconds(h.total)})")
+        return "Stage timings: " + " | ".join(parts)
+
+    def to_dict(self):
+        return {stage: h.to_dict() for stage, h in self.histograms().items()}
+
+    def trace_events(self):
+        """Return the recorded events in Chrome trace event format"""
+        pid = os.getpid()
+        events = []
+        with self._lock:
+            threads = list(self._threads)
+        for timings in threads:
+            events.append({"name": "thread_name", "ph": "M", "pid": pid, "tid": timings.ident,
+                           "args": {"name": timings.name}})
+            for stage, start, end in list(timings.events):
+                events.append({"name": stage, "ph": "X", "pid": pid, "tid": timings.ident,
+                               "ts": (start - self.origin) * 1e6, "dur": (end - start) * 1e6})
+        return events
+
+    def write_trace(self, path):
+        """Write the events as Chrome trace JSON, with the histograms as metadata"""
+        document = {"traceEvents": self.trace_events(), "displayTimeUnit": "ms",
+                    "metadata": {"stages": self.to_dict()}}
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(document, f)
+
+
+def job_timer(config):
+    """Return a StageTimer for a job config with timings or trace_path set, else None"""
+    if config.trace_path:
+        return StageTimer(trace=True)
+    return StageTimer() if config.timings else None
+
+
+def finish_job_timer(timer, config):
+    """Write the trace of a finished job, if its config asked for one"""
+    if timer is not None and config.trace_path:
+        timer.write_trace(config.trace_path)
+
+
+def trace_folder():
+    """Folder named by FRAME_EXTRACTOR_TRACE, or None when GUI tracing is off"""
+    return os.environ.get(TRACE_ENV) or None
+
+
+def gui_trace_path(name):
+    """A new trace file for a GUI job in the FRAME_EXTRACTOR_TRACE folder, or None if it is unset"""
+    folder = trace_folder()
+    if folder is None:
+        return None
+    os.makedirs(folder, exist_ok=True)
+    return os.path.join(folder, f"{name}-{time.strftime('%Y%m%d-%H%M%S')}.trace.json")
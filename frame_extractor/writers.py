@@ -0,0 +1,169 @@
+"""Output writers for extracted frames.
+
+Each writer encodes a BGR frame in memory and writes the bytes to disk,
+keeping count of bytes written and of the time spent encoding and
+writing. Writers are shared by all threads of a FramePipeline, so the
+counters are updated under a lock. A writer given a StageTimer (see
+timing.py) also records every encode and write as the "encode" and
+"write" stages.
+
+See docs/output_formats.md for speed/size numbers per format.
+"""
+import io
+import threading
+import time
+from dataclasses import dataclass
+
+import cv2
+import numpy as np
+
+from .options import FORMATS  # noqa: F401 (re-exported)
+
+
+@dataclass
+class WriteStats:
+    """Totals reported by a writer"""
+    frames: int = 0
+    bytes_written: int = 0
+    encode_seconds: float = 0.0
+    write_seconds: float = 0.0
+    dropped: int = 0  # near-duplicates dropped before encoding; see dedup.py
+
+    def merge(self, other):
+        self.frames += other.frames
+        self.bytes_written += other.bytes_written
+        self.encode_seconds += other.encode_seconds
+        self.write_seconds += other.write_seconds
+        self.dropped += other.dropped
+
+
+class FrameWriter:
+    """Base writer: subclasses implement encode(frame) -> bytes-like"""
+    extension = ""
+
+    def __init__(self):
+        self.stats = WriteStats()
+        self.timer = None  # optional timing.StageTimer
+        self._lock = threading.Lock()
+
+    def encode(self, frame):
+        raise NotImplementedError
+
+    def encode_frame(self, frame):
+        """Encode frame, adding the time taken to stats; return the bytes"""
+        start = time.perf_counter()
+        data = self.encode(frame)
+        end = time.perf_counter()
+        with self._lock:
+            self.stats.encode_seconds += end - start
+        if self.timer is not None:
+            self.timer.record("encode", start, end)
+        return data
+
+    def record_write(self, nbytes, start):
+        """Count one stored frame of nbytes whose write began at start (time.perf_counter())"""
+        end = time.perf_counter()
+        with self._lock:
+            self.stats.frames += 1
+            self.stats.bytes_written += nbytes
+            self.stats.write_seconds += end - start
+        if self.timer is not None:
+            self.timer.record("write", start, end)
+
+    def write(self, path_stem, frame):
+        """Encode frame and write it to path_stem + extension; return the path"""
+        data = self.encode_frame(frame)
+        start = time.perf_counter()
+        path = path_stem + self.extension
+        with open(path, "wb") as f:
+            f.write(data)
+        self.record_write(len(data), start)
+        return path
+
+    def describe(self):
+        return self.extension.lstrip(".").upper()
+
+
+class OpenCVWriter(FrameWriter):
+    """Writer backed by cv2.imencode, which releases the GIL"""
+
+    def __init__(self, params=()):
+        super().__init__()
+        self.params = list(params)
+
+    def encode(self, frame):
+        ok, buf = cv2.imencode(self.extension, frame, self.params)
+        if not ok:
+            raise ValueError(f"Could not encode frame as {self.extension}")
+        return buf
+
+
+class PngWriter(OpenCVWriter):
+    """Lossless PNG; compression 0 (fastest, largest) to 9 (slowest, smallest)"""
+    extension = ".png"
+
+    def __init__(self, compression=None):
+        params = () if compression is None else (cv2.IMWRITE_PNG_COMPRESSION, compression)
+        super().__init__(params)
+        self.compression = compression
+
+    def describe(self):
+        return "PNG" if self.compression is None else f"PNG level {self.compression}"
+
+
+class JpegWriter(OpenCVWriter):
+    """Lossy JPEG with quality 0-100"""
+    extension = ".jpg"
+
+    def __init__(self, quality=95):
+        super().__init__((cv2.IMWRITE_JPEG_QUALITY, quality))
+        self.quality = quality
+
+    def describe(self):
+        return f"JPEG q{self.quality}"
+
+
+class WebpWriter(OpenCVWriter):
+    """WebP: lossless when quality is None, otherwise lossy with quality 1-100"""
+    extension = ".webp"
+
+    def __init__(self, quality=None):
+        # OpenCV switches WebP to lossless mode for quality values above 100
+        super().__init__((cv2.IMWRITE_WEBP_QUALITY, 101 if quality is None else quality))
+        self.quality = quality
+
+    def describe(self):
+        return "WebP lossless" if self.quality is None else f"WebP q{self.quality}"
+
+
+class BmpWriter(OpenCVWriter):
+    """Uncompressed BMP"""
+    extension = ".bmp"
+
+
+class NpyWriter(FrameWriter):
+    """Uncompressed NumPy .npy array (H, W, 3) uint8 in BGR order"""
+    extension = ".npy"
+
+    def encode(self, frame):
+        buf = io.BytesIO()
+        np.save(buf, frame, allow_pickle=False)
+        return buf.getbuffer()
+
+
+def make_writer(image_format="png", quality=None, png_compression=None):
+    """Return a writer for one of FORMATS.
+
+    quality applies to jpg (default 95) and webp (lossless when None).
+    """
+    if image_format == "png":
+        return PngWriter(png_compression)
+    if image_format == "jpg":
+        return JpegWriter(95 if quality is None else quality)
+    if image_format == "webp":
+        return WebpWriter(quality)
+    if image_format == "bmp":
+        return BmpWriter()
+    if image_format == "npy":
+        return NpyWriter()
+    raise ValueError(f"Unknown image format: {image_format}")
@@ -1,12 +1,11 @@
 import tkinter as tk
 from tkinter import ttk, filedialog, messagebox
-import cv2
 import os
 import threading
-import time
-import torch
-import subprocess
-from pathlib import Path
+
+from frame_extractor.gpu import GpuInfo, get_gpu_info_async
+from frame_extractor.options import ASPECTS, DECODERS, DEFAULT_DEDUP_THRESHOLD, FORMATS, bound_fields, parse_position, parse_rect, parse_size
+from frame_extractor.timing import gui_trace_path, trace_folder
 
 class FrameExtractor:
     def __init__(self, root):
@@ -18,42 +17,64 @@ class FrameExtractor:
         self.video_path = tk.StringVar()
         self.extraction_mode = tk.StringVar(value="interval")
         self.interval_value = tk.StringVar(value="1.0")
+        self.count_value = tk.StringVar(value="10")
+        self.image_format = tk.StringVar(value="png")
+        self.decoder = tk.StringVar(value="opencv")
+        self.batch_jobs = tk.StringVar(value="2")
+        self.skip_duplicates = tk.BooleanVar(value=False)
+        self.range_start = tk.StringVar()
+        self.range_end = tk.StringVar()
+        self.crop_rect = tk.StringVar()
+        self.resize_sizes = tk.StringVar()
+        self.resize_aspect = tk.StringVar(value="fit")
         self.output_folder = "Extraction"
         self.is_extracting = False
         self.cancel_extraction = False
-        self.use_gpu = tk.BooleanVar(value=torch.cuda.is_available())
+        self.use_gpu = tk.BooleanVar(value=False)
         
-        # Setup GPU info
-        self.setup_gpu_info()
+        # GPU info is filled in by the background probe (see setup_gpu_info)
+        self.apply_gpu_info(GpuInfo())
         
         # Create GUI
         self.create_gui()
         
+        # Setup GPU info
+        self.setup_gpu_info()
+        
         # Ensure output folder exists
         os.makedirs(self.output_folder, exist_ok=True)
     
-    def get_cuda_comp_cap(self):
-        """Get CUDA compute capability using nvidia-smi"""
-        try:
-            result = subprocess.check_output(['nvidia-smi', '--query-gpu=compute_cap', '--format=noheader,csv'], text=True)
-            return max(map(float, result.strip().split('\n')))
-        except Exception:
-            return 0.0
-    
     def setup_gpu_info(self):
-        """Setup GPU information"""
-        if torch.cuda.is_available():
-            self.gpu_name = torch.cuda.get_device_name(0)
-            self.gpu_capability = torch.cuda.get_device_capability(0)
-            self.compute_cap = self.get_cuda_comp_cap()
-            self.is_blackwell = self.compute_cap >= 12.0
-            self.has_gpu = True
+        """Detect the GPU from the on-disk cache, or probe it in the background"""
+        cached = get_gpu_info_async(
+            lambda info: self.root.after(0, lambda: self.show_gpu_info(info)))
+        if cached is None:
+            self.gpu_info_label.config(text="Detecting GPU...")
+    
+    def apply_gpu_info(self, info):
+        """Copy probe results onto the attributes used by the rest of the GUI"""
+        self.gpu_name = info.gpu_name
+        self.gpu_capability = info.gpu_capability
+        self.compute_cap = info.compute_cap
+        self.is_blackwell = info.is_blackwell
+        self.has_gpu = info.has_gpu
+    
+    def show_gpu_info(self, info):
+        """Update the GPU Information section once the probe has finished"""
+        self.apply_gpu_info(info)
+        if self.has_gpu:
+            gpu_info = f"GPU: {self.gpu_name}"
+            if self.is_blackwell:
+                gpu_info += f" (Blackwell - 120 SM, Compute {self.compute_cap})"
+            else:
+                gpu_info += f" (Compute {self.compute_cap})"
+            self.gpu_info_label.config(text=gpu_info)
+            self.use_gpu.set(True)
+            self.gpu_checkbutton.grid(row=1, column=0, sticky=tk.W)
         else:
-            self.gpu_name = "No GPU Available"
-            self.gpu_capability = (0, 0)
-            self.compute_cap = 0.0
-            self.is_blackwell = False
-            self.has_gpu = False
+            self.gpu_info_label.config(text="No GPU detected - CPU processing only")
+            self.use_gpu.set(False)
+            self.gpu_checkbutton.grid_remove()
     
     def create_gui(self):
         # Main frame
@@ -69,17 +90,10 @@ class FrameExtractor:
         gpu_frame = ttk.LabelFrame(main_frame, text="GPU Information", padding="5")
         gpu_frame.grid(row=0, column=0, columnspan=3, sticky=(tk.W, tk.E), pady=(0, 10))
         
-        if self.has_gpu:
-            gpu_info = f"GPU: {self.gpu_name}"
-            if self.is_blackwell:
-                gpu_info += f" (Blackwell - 120 SM, Compute {self.compute_cap})"
-            else:
-                gpu_info += f" (Compute {self.compute_cap})"
-            ttk.Label(gpu_frame, text=gpu_info).grid(row=0, column=0, sticky=tk.W)
-            ttk.Checkbutton(gpu_frame, text="Use GPU Acceleration", 
-                           variable=self.use_gpu).grid(row=1, column=0, sticky=tk.W)
-        else:
-            ttk.Label(gpu_frame, text="No GPU detected - CPU processing only").grid(row=0, column=0, sticky=tk.W)
+        self.gpu_info_label = ttk.Label(gpu_frame, text="")
+        self.gpu_info_label.grid(row=0, column=0, sticky=tk.W)
+        self.gpu_checkbutton = ttk.Checkbutton(gpu_frame, text="Use GPU Acceleration", 
+                                               variable=self.use_gpu)
         
         # Video selection
         ttk.Label(main_frame, text="Select Video File:").grid(row=1, column=0, sticky=tk.W, pady=5)
@@ -99,9 +113,62 @@ class FrameExtractor:
         self.interval_entry.grid(row=0, column=1, sticky=tk.W, padx=(5, 0))
         ttk.Label(mode_frame, text="seconds").grid(row=0, column=2, sticky=tk.W, padx=(5, 0))
         
+        # Count mode
+        ttk.Radiobutton(mode_frame, text="Extract exactly", variable=self.extraction_mode, 
+                       value="count").grid(row=1, column=0, sticky=tk.W, pady=(5, 0))
+        self.count_entry = ttk.Entry(mode_frame, textvariable=self.count_value, width=10)
+        self.count_entry.grid(row=1, column=1, sticky=tk.W, padx=(5, 0), pady=(5, 0))
+        ttk.Label(mode_frame, text="evenly spaced frames").grid(row=1, column=2, sticky=tk.W, padx=(5, 0), pady=(5, 0))
+        
         # All frames mode
         ttk.Radiobutton(mode_frame, text="Extract all frames", variable=self.extraction_mode, 
-                       value="all").grid(row=1, column=0, sticky=tk.W, pady=(5, 0))
+                       value="all").grid(row=2, column=0, sticky=tk.W, pady=(5, 0))
+        
+        # Keyframes only; with PyAV the other frames are never decoded
+        ttk.Radiobutton(mode_frame, text="Extract keyframes only", variable=self.extraction_mode, 
+                       value="keyframes").grid(row=2, column=1, columnspan=2, sticky=tk.W, padx=(5, 0), pady=(5, 0))
+        
+        # Output format
+        ttk.Label(mode_frame, text="Output format:").grid(row=3, column=0, sticky=tk.W, pady=(10, 0))
+        ttk.Combobox(mode_frame, textvariable=self.image_format, values=FORMATS, 
+                    state="readonly", width=8).grid(row=3, column=1, sticky=tk.W, padx=(5, 0), pady=(10, 0))
+        decoder_options = ttk.Frame(mode_frame)
+        decoder_options.grid(row=3, column=2, sticky=tk.W, padx=(5, 0), pady=(10, 0))
+        ttk.Label(decoder_options, text="Decoder:").pack(side=tk.LEFT)
+        ttk.Combobox(decoder_options, textvariable=self.decoder, values=DECODERS, 
+                    state="readonly", width=8).pack(side=tk.LEFT, padx=(5, 0))
+        ttk.Label(decoder_options, text="(pyav needs: pip install av)").pack(side=tk.LEFT, padx=(5, 0))
+        
+        # Batch concurrency
+        ttk.Label(mode_frame, text="Videos at once (batch):").grid(row=4, column=0, sticky=tk.W, pady=(5, 0))
+        ttk.Spinbox(mode_frame, from_=1, to=16, textvariable=self.batch_jobs, 
+                   width=6).grid(row=4, column=1, sticky=tk.W, padx=(5, 0), pady=(5, 0))
+        
+        # Near-duplicate suppression
+        ttk.Checkbutton(mode_frame, text="Skip near-duplicate frames (static scenes)", 
+                       variable=self.skip_duplicates).grid(row=5, column=0, columnspan=3, sticky=tk.W, pady=(5, 0))
+        
+        # Range limits
+        ttk.Label(mode_frame, text="Start at:").grid(row=6, column=0, sticky=tk.W, pady=(10, 0))
+        ttk.Entry(mode_frame, textvariable=self.range_start, width=10).grid(row=6, column=1, sticky=tk.W, padx=(5, 0), pady=(10, 0))
+        ttk.Label(mode_frame, text="seconds, MM:SS or frame like 900f (blank = beginning)").grid(row=6, column=2, sticky=tk.W, padx=(5, 0), pady=(10, 0))
+        ttk.Label(mode_frame, text="End at:").grid(row=7, column=0, sticky=tk.W, pady=(5, 0))
+        ttk.Entry(mode_frame, textvariable=self.range_end, width=10).grid(row=7, column=1, sticky=tk.W, padx=(5, 0), pady=(5, 0))
+        ttk.Label(mode_frame, text="(blank = end of video)").grid(row=7, column=2, sticky=tk.W, padx=(5, 0), pady=(5, 0))
+        
+        # Optional crop, e.g. pasted from the Video Cropper's selection
+        ttk.Label(mode_frame, text="Crop to:").grid(row=8, column=0, sticky=tk.W, pady=(5, 0))
+        ttk.Entry(mode_frame, textvariable=self.crop_rect, width=18).grid(row=8, column=1, sticky=tk.W, padx=(5, 0), pady=(5, 0))
+        ttk.Label(mode_frame, text="X,Y,WIDTH,HEIGHT in video pixels (blank = full frame)").grid(row=8, column=2, sticky=tk.W, padx=(5, 0), pady=(5, 0))
+        
+        # Optional resize, e.g. to the input size of a model
+        ttk.Label(mode_frame, text="Resize to:").grid(row=9, column=0, sticky=tk.W, pady=(5, 0))
+        ttk.Entry(mode_frame, textvariable=self.resize_sizes, width=18).grid(row=9, column=1, sticky=tk.W, padx=(5, 0), pady=(5, 0))
+        resize_options = ttk.Frame(mode_frame)
+        resize_options.grid(row=9, column=2, sticky=tk.W, padx=(5, 0), pady=(5, 0))
+        ttk.Combobox(resize_options, textvariable=self.resize_aspect, values=ASPECTS, 
+                    state="readonly", width=7).pack(side=tk.LEFT)
+        ttk.Label(resize_options, text="WIDTHxHEIGHT, several separated by spaces (blank = full size)").pack(side=tk.LEFT, padx=(5, 0))
         
         # Progress section
         progress_frame = ttk.LabelFrame(main_frame, text="Progress", padding="5")
@@ -123,6 +190,9 @@ class FrameExtractor:
                                      command=self.start_extraction, style="Accent.TButton")
         self.start_button.pack(side=tk.LEFT, padx=(0, 10))
         
+        self.batch_button = ttk.Button(button_frame, text="Batch...", command=self.start_batch)
+        self.batch_button.pack(side=tk.LEFT, padx=(0, 10))
+        
         self.cancel_button = ttk.Button(button_frame, text="Cancel", 
                                       command=self.cancel_extraction_process, state="disabled")
         self.cancel_button.pack(side=tk.LEFT)
@@ -142,6 +212,81 @@ class FrameExtractor:
             self.video_path.set(filename)
             self.status_var.set(f"Selected: {os.path.basename(filename)}")
     
+    def validate_mode_settings(self):
+        """Check the interval/count entries; show an error and return False if invalid"""
+        if self.extraction_mode.get() == "interval":
+            try:
+                interval = float(self.interval_value.get())
+                if interval <= 0:
+                    raise ValueError
+            except ValueError:
+                messagebox.showerror("Error", "Please enter a valid interval (positive number).")
+                return False
+        elif self.extraction_mode.get() == "count":
+            try:
+                count = int(self.count_value.get())
+                if count <= 0:
+                    raise ValueError
+            except ValueError:
+                messagebox.showerror("Error", "Please enter a valid frame count (positive whole number).")
+                return False
+        try:
+            self.range_bounds()
+        except ValueError:
+            messagebox.showerror("Error", "Please enter the start and end as seconds, MM:SS or a frame number like 900f.")
+            return False
+        try:
+            self.crop_bounds()
+        except ValueError:
+            messagebox.showerror("Error", "Please enter the crop as X,Y,WIDTH,HEIGHT, e.g. 100,50,640,360.")
+            return False
+        try:
+            sizes = self.resize_bounds()
+            if sizes is not None and (min(min(size) for size in sizes) <= 0 or len(set(sizes)) != len(sizes)):
+                raise ValueError
+        except ValueError:
+            messagebox.showerror("Error", "Please enter each resize size once as WIDTHxHEIGHT, e.g. 224x224 512x512.")
+            return False
+        return True
+    
+    def crop_bounds(self):
+        """Return the crop rectangle from the Crop to entry, or None for the full frame"""
+        text = self.crop_rect.get().strip()
+        return parse_rect(text) if text else None
+    
+    def resize_bounds(self):
+        """Return the output sizes from the Resize to entry, or None to keep the frame size"""
+        text = self.resize_sizes.get().replace(",", " ").split()
+        return tuple(parse_size(size) for size in text) if text else None
+    
+    def range_bounds(self):
+        """Return the ExtractionConfig start/end fields from the range entries"""
+        start = self.range_start.get().strip()
+        end = self.range_end.get().strip()
+        return bound_fields(parse_position(start) if start else None,
+                            parse_position(end) if end else None)
+    
+    def build_config(self, video_path):
+        """Return an ExtractionConfig for video_path from the current settings"""
+        from frame_extractor import ExtractionConfig
+        
+        mode = self.extraction_mode.get()
+        return ExtractionConfig(
+            video_path=video_path,
+            output_folder=self.output_folder,
+            mode=mode,
+            interval=float(self.interval_value.get()) if mode == "interval" else 1.0,
+            frame_count=int(self.count_value.get()) if mode == "count" else 10,
+            image_format=self.image_format.get(),
+            dedup=DEFAULT_DEDUP_THRESHOLD if self.skip_duplicates.get() else None,
+            decoder=self.decoder.get(),
+            crop=self.crop_bounds(),
+            sizes=self.resize_bounds(),
+            aspect=self.resize_aspect.get(),
+            use_gpu=self.use_gpu.get() and self.has_gpu,
+            **self.range_bounds(),
+        )
+    
     def start_extraction(self):
         if not self.video_path.get():
             messagebox.showerror("Error", "Please select a video file first.")
@@ -151,131 +296,90 @@ class FrameExtractor:
             messagebox.showerror("Error", "Selected video file does not exist.")
             return
         
-        if self.extraction_mode.get() == "interval":
-            try:
-                interval = float(self.interval_value.get())
-                if interval <= 0:
-                    raise ValueError
-            except ValueError:
-                messagebox.showerror("Error", "Please enter a valid interval (positive number).")
-                return
+        if not self.validate_mode_settings():
+            return
+        
+        self.run_in_background(self.extract_frames)
+    
+    def start_batch(self):
+        """Pick several videos and extract them all with the current settings"""
+        if not self.validate_mode_settings():
+            return
+        
+        try:
+            jobs = int(self.batch_jobs.get())
+            if jobs <= 0:
+                raise ValueError
+        except ValueError:
+            messagebox.showerror("Error", "Please enter a valid number of videos to process at once.")
+            return
         
-        # Start extraction in a separate thread
+        filetypes = [
+            ("Video files", "*.mp4 *.avi *.mov *.mkv *.wmv *.flv *.webm"),
+            ("All files", "*.*")
+        ]
+        filenames = filedialog.askopenfilenames(title="Select Videos for Batch Extraction", filetypes=filetypes)
+        if not filenames:
+            return
+        
+        self.run_in_background(lambda: self.extract_batch(list(filenames), jobs))
+    
+    def run_in_background(self, target):
+        """Disable the start buttons and run target on a worker thread"""
         self.is_extracting = True
         self.cancel_extraction = False
         self.start_button.config(state="disabled")
+        self.batch_button.config(state="disabled")
         self.cancel_button.config(state="normal")
         
-        extraction_thread = threading.Thread(target=self.extract_frames)
+        extraction_thread = threading.Thread(target=target)
         extraction_thread.daemon = True
         extraction_thread.start()
     
+    def finish_background(self):
+        """Re-enable the start buttons once a worker thread is done"""
+        self.is_extracting = False
+        self.root.after(0, lambda: self.start_button.config(state="normal"))
+        self.root.after(0, lambda: self.batch_button.config(state="normal"))
+        self.root.after(0, lambda: self.cancel_button.config(state="disabled"))
+    
+    def show_progress(self, snapshot, label):
+        self.progress_bar.config(maximum=max(snapshot.total, 1), value=snapshot.done)
+        self.progress_var.set(f"{label} ({snapshot.format()})")
+    
     def cancel_extraction_process(self):
         self.cancel_extraction = True
         self.progress_var.set("Cancelling...")
     
     def extract_frames(self):
+        # Loaded on first use so the window does not wait for cv2
+        from frame_extractor import ExtractionError, extract_frames
+        
+        use_gpu = self.use_gpu.get() and self.has_gpu
         try:
-            video_path = self.video_path.get()
-            video_name = Path(video_path).stem
-            
-            # Create output folder for this video
-            output_dir = os.path.join(self.output_folder, video_name)
-            os.makedirs(output_dir, exist_ok=True)
-            
-            # Open video
-            cap = cv2.VideoCapture(video_path)
-            if not cap.isOpened():
-                self.root.after(0, lambda: messagebox.showerror("Error", "Could not open video file."))
-                return
-            
-            # Get video properties
-            total_frames = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
-            fps = cap.get(cv2.CAP_PROP_FPS)
-            
-            # Determine frames to extract
-            if self.extraction_mode.get() == "interval":
-                interval = float(self.interval_value.get())
-                frame_interval = int(fps * interval)
-                if frame_interval == 0:
-                    frame_interval = 1
-                frames_to_extract = list(range(0, total_frames, frame_interval))
-            else:  # all frames
-                frames_to_extract = list(range(total_frames))
-            
-            total_to_extract = len(frames_to_extract)
-            
-            self.root.after(0, lambda: self.progress_bar.config(maximum=total_to_extract))
+            config = self.build_config(self.video_path.get())
+            # Stage timings and a trace when FRAME_EXTRACTOR_TRACE names a folder
+            config.trace_path = gui_trace_path(f"{config.video_name}-extract")
             
             # Show GPU info in progress
-            gpu_status = ""
-            if self.use_gpu.get() and self.has_gpu:
+            if use_gpu:
                 if self.is_blackwell:
                     gpu_status = " (Using RTX 5000 series - 120 SM acceleration)"
                 else:
-                    gpu_status = f" (Using GPU acceleration)"
+                    gpu_status = " (Using GPU acceleration)"
             else:
                 gpu_status = " (CPU processing)"
             
-            self.root.after(0, lambda: self.progress_var.set(f"Extracting frames{gpu_status}... (0/{total_to_extract})"))
-            
-            extracted_count = 0
-            frame_number = 0
-            
-            # Setup GPU tensors if using GPU
-            device = None
-            if self.use_gpu.get() and self.has_gpu:
-                device = torch.device('cuda:0')
-                torch.cuda.empty_cache()  # Clear any existing GPU memory
-            
-            while True:
-                if self.cancel_extraction:
-                    break
-                
-                ret, frame = cap.read()
-                if not ret:
-                    break
-                
-                if frame_number in frames_to_extract:
-                    # Create filename with zero-padding (6 digits as requested)
-                    frame_filename = f"{video_name}_{extracted_count + 1:06d}.png"
-                    frame_path = os.path.join(output_dir, frame_filename)
-                    
-                    # Process frame with GPU acceleration if available
-                    if self.use_gpu.get() and self.has_gpu and device is not None:
-                        try:
-                            # Move frame to GPU for processing (optional optimization)
-                            frame_tensor = torch.from_numpy(frame).to(device)
-                            # Move back to CPU for saving (OpenCV requires CPU arrays)
-                            frame_processed = frame_tensor.cpu().numpy()
-                            cv2.imwrite(frame_path, frame_processed)
-                            
-                            # For Blackwell architecture, we can do batch processing for better SM utilization
-                            if self.is_blackwell and extracted_count % 10 == 0:
-                                torch.cuda.empty_cache()  # Optimize memory usage
-                        except Exception as e:
-                            # Fallback to CPU if GPU processing fails
-                            cv2.imwrite(frame_path, frame)
-                    else:
-                        # Standard CPU processing
-                        cv2.imwrite(frame_path, frame)
-                    
-                    extracted_count += 1
-                    
-                    # Update progress (update every frame for better user experience)
-                    progress_text = f"Extracting frames{gpu_status}... ({extracted_count}/{total_to_extract})"
-                    self.root.after(0, lambda: self.progress_var.set(progress_text))
-                    self.root.after(0, lambda: self.progress_bar.config(value=extracted_count))
-                
-                frame_number += 1
-            
-            cap.release()
+            def on_progress(snapshot):
+                # Called at most every progress_interval seconds; one Tk callback per update
+                self.root.after(0, lambda: self.show_progress(snapshot, f"Extracting frames{gpu_status}..."))
             
-            # Clear GPU memory after processing
-            if self.use_gpu.get() and self.has_gpu:
-                torch.cuda.empty_cache()
+            result = extract_frames(config, progress=on_progress,
+                                    should_cancel=lambda: self.cancel_extraction)
+            extracted_count = result.extracted_count
+            output_dir = result.output_dir
             
-            if self.cancel_extraction:
+            if result.cancelled:
                 self.root.after(0, lambda: self.progress_var.set("Extraction cancelled"))
                 self.root.after(0, lambda: self.status_var.set("Extraction cancelled by user"))
             else:
@@ -284,26 +388,75 @@ class FrameExtractor:
                 
                 # Enhanced completion message with GPU info
                 completion_msg = f"Frame extraction completed!\n\nExtracted {extracted_count} frames to:\n{output_dir}"
-                if self.use_gpu.get() and self.has_gpu:
+                if result.dropped_count:
+                    completion_msg += f"\n\nSkipped {result.dropped_count} near-duplicate frames"
+                if use_gpu:
                     if self.is_blackwell:
                         completion_msg += "\n\n🚀 Processed with RTX 5000 series (120 SM) acceleration!"
                     else:
                         completion_msg += f"\n\n⚡ Processed with GPU acceleration ({self.gpu_name})"
+                if result.timings:
+                    completion_msg += f"\n\n{result.timings.summary()}"
                 
                 self.root.after(0, lambda: messagebox.showinfo("Success", completion_msg))
         
+        except ExtractionError as e:
+            msg = str(e)
+            self.root.after(0, lambda msg=msg: messagebox.showerror("Error", msg))
+            self.root.after(0, lambda: self.status_var.set("Error during extraction"))
+        
         except Exception as e:
-            self.root.after(0, lambda: messagebox.showerror("Error", f"An error occurred: {str(e)}"))
+            msg = f"An error occurred: {e}"
+            self.root.after(0, lambda msg=msg: messagebox.showerror("Error", msg))
             self.root.after(0, lambda: self.status_var.set("Error during extraction"))
         
         finally:
-            self.is_extracting = False
-            self.root.after(0, lambda: self.start_button.config(state="normal"))
-            self.root.after(0, lambda: self.cancel_button.config(state="disabled"))
+            self.finish_background()
+    
+    def extract_batch(self, filenames, jobs):
+        """Extract every video in filenames, jobs at a time; failures are reported per file"""
+        from frame_extractor.batch import extract_batch
+        
+        failed = []
+        
+        def on_item(item, finished, total):
+            if not item.ok and not item.skipped:
+                failed.append(item)
+            label = f"Batch: {finished}/{total} videos done"
+            if failed:
+                label += f" ({len(failed)} failed)"
+            self.root.after(0, lambda: self.progress_bar.config(maximum=total, value=finished))
+            self.root.after(0, lambda: self.progress_var.set(label))
+        
+        try:
+            template = self.build_config(filenames[0])
+            template.trace_path = trace_folder()  # one trace per video in there
+            self.root.after(0, lambda: self.progress_var.set(f"Batch: 0/{len(filenames)} videos done"))
+            items = extract_batch(template, filenames, jobs, template.memory_budget,
+                                  on_item=on_item, should_cancel=lambda: self.cancel_extraction)
+            
+            done = [item for item in items if item.ok]
+            skipped = [item for item in items if item.skipped]
+            summary = f"Batch extraction finished.\n\n{len(done)} of {len(items)} videos extracted to:\n{self.output_folder}"
+            if skipped:
+                summary += f"\n{len(skipped)} skipped (cancelled)"
+            if failed:
+                summary += f"\n\n{len(failed)} failed:"
+                for item in failed[:10]:
+                    summary += f"\n{os.path.basename(item.video_path)}: {item.error}"
+                if len(failed) > 10:
+                    summary += f"\n... and {len(failed) - 10} more"
             
-            # Clean up GPU memory
-            if self.has_gpu:
-                torch.cuda.empty_cache()
+            self.root.after(0, lambda: self.status_var.set(f"Batch: {len(done)}/{len(items)} videos extracted"))
+            self.root.after(0, lambda: (messagebox.showwarning if failed else messagebox.showinfo)("Batch Complete", summary))
+        
+        except Exception as e:
+            msg = f"An error occurred: {e}"
+            self.root.after(0, lambda msg=msg: messagebox.showerror("Error", msg))
+            self.root.after(0, lambda: self.status_var.set("Error during batch extraction"))
+        
+        finally:
+            self.finish_background()
 
 def main():
     root = tk.Tk()
@@ -0,0 +1,48 @@
+import os
+import sys
+import types
+
+import frame_extractor.engine as engine
+from benchmarks.synthetic import make_clip
+from frame_extractor.engine import ExtractionConfig, extract_targets
+from frame_extractor.readers import open_reader
+
+
+class _FakeTensor:
+    def __init__(self, array):
+        self.array = array
+
+    def to(self, device):
+        return self
+
+    def cpu(self):
+        return self
+
+    def numpy(self):
+        return self.array.copy()
+
+
+def test_gpu_round_trip_keeps_frame_pool_bounded(tmp_path, monkeypatch):
+    torch = types.ModuleType("torch")
+    torch.from_numpy = _FakeTensor
+    monkeypatch.setitem(sys.modules, "torch", torch)
+    pools = []
+
+    class RecordingPool(engine.FramePool):
+        def __init__(self):
+            super().__init__()
+            pools.append(self)
+
+    monkeypatch.setattr(engine, "FramePool", RecordingPool)
+    path = make_clip(320, 180, 30, 10)
+    config = ExtractionConfig(path, str(tmp_path), mode="all", image_format="bmp",
+                              resume=False, workers=2, memory_budget=4 * 320 * 180 * 3)
+    os.makedirs(config.output_dir)
+    cap = open_reader(path)
+    try:
+        stats = extract_targets(config, cap, list(range(300)), device="cuda")
+    finally:
+        cap.release()
+    assert stats.frames == 300
+    # No more buffers than frames in flight (4 queued, 2 being written, 1 decoding)
+    assert len(pools[0]._free) <= 7
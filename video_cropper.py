@@ -4,12 +4,27 @@ import cv2
 import os
 import threading
 import time
-import torch
-import subprocess
 from pathlib import Path
 import numpy as np
 from PIL import Image, ImageTk
 
+from frame_extractor.gpu import GpuInfo, get_gpu_info_async
+from frame_extractor.options import DECODERS, bound_fields, parse_position
+from frame_extractor.preview import STEP_FRAMES, PreviewSource
+from frame_extractor.readers import open_reader
+from frame_extractor.thumbnails import ThumbnailStrip
+from frame_extractor.timing import StageTimer, gui_trace_path, trace_folder
+
+# Minimum seconds between progress updates posted to the Tk event queue
+PROGRESS_INTERVAL = 0.1
+
+# Videos exported at the same time by Batch Export
+BATCH_JOBS = 2
+
+# Memory for decoded preview frames kept around the playhead
+PREVIEW_CACHE_MB = 256
+
+
 class VideoCropper:
     def __init__(self, root):
         self.root = root
@@ -21,10 +36,14 @@ class VideoCropper:
         self.output_folder = "Extraction"
         self.is_processing = False
         self.cancel_processing = False
-        self.use_gpu = tk.BooleanVar(value=torch.cuda.is_available())
+        self.use_gpu = tk.BooleanVar(value=False)
+        self.decoder_var = tk.StringVar(value="opencv")
         
         # Video properties
         self.cap = None
+        self.preview = None
+        self.thumbnails = None
+        self.preview_timer = None  # StageTimer for the preview while FRAME_EXTRACTOR_TRACE is set
         self.total_frames = 0
         self.fps = 0
         self.frame_width = 0
@@ -32,6 +51,11 @@ class VideoCropper:
         self.current_frame = 0
         self.current_frame_img = None
         
+        # Timeline hover preview
+        self.hover_window = None
+        self.hover_label = None
+        self.hover_image = None
+        
         # Crop selection
         self.crop_start_x = 0
         self.crop_start_y = 0
@@ -46,8 +70,8 @@ class VideoCropper:
         self.scale_x = 1.0
         self.scale_y = 1.0
         
-        # Setup GPU info
-        self.setup_gpu_info()
+        # GPU info is filled in by the background probe (see setup_gpu_info)
+        self.apply_gpu_info(GpuInfo())
         
         # Dark mode
         self.dark_mode = tk.BooleanVar(value=False)
@@ -56,27 +80,43 @@ class VideoCropper:
         # Create GUI
         self.create_gui()
         
+        # Setup GPU info
+        self.setup_gpu_info()
+        
         # Ensure output folder exists
         os.makedirs(self.output_folder, exist_ok=True)
     
     def setup_gpu_info(self):
-        """Setup GPU information"""
-        if torch.cuda.is_available():
-            self.gpu_name = torch.cuda.get_device_name(0)
-            self.gpu_capability = torch.cuda.get_device_capability(0)
-            try:
-                result = subprocess.check_output(['nvidia-smi', '--query-gpu=compute_cap', '--format=noheader,csv'], text=True)
-                self.compute_cap = max(map(float, result.strip().split('\n')))
-            except Exception:
-                self.compute_cap = 0.0
-            self.is_blackwell = self.compute_cap >= 12.0
-            self.has_gpu = True
+        """Detect the GPU from the on-disk cache, or probe it in the background"""
+        cached = get_gpu_info_async(
+            lambda info: self.root.after(0, lambda: self.show_gpu_info(info)))
+        if cached is None:
+            self.gpu_info_label.config(text="Detecting GPU...")
+    
+    def apply_gpu_info(self, info):
+        """Copy probe results onto the attributes used by the rest of the GUI"""
+        self.gpu_name = info.gpu_name
+        self.gpu_capability = info.gpu_capability
+        self.compute_cap = info.compute_cap
+        self.is_blackwell = info.is_blackwell
+        self.has_gpu = info.has_gpu
+    
+    def show_gpu_info(self, info):
+        """Update the GPU Information section once the probe has finished"""
+        self.apply_gpu_info(info)
+        if self.has_gpu:
+            gpu_info = f"GPU: {self.gpu_name}"
+            if self.is_blackwell:
+                gpu_info += f"\n(Blackwell - 120 SM, Compute {self.compute_cap})"
+            else:
+                gpu_info += f"\n(Compute {self.compute_cap})"
+            self.gpu_info_label.config(text=gpu_info)
+            self.use_gpu.set(True)
+            self.gpu_checkbutton.pack(anchor=tk.W, pady=(5, 0))
         else:
-            self.gpu_name = "No GPU Available"
-            self.gpu_capability = (0, 0)
-            self.compute_cap = 0.0
-            self.is_blackwell = False
-            self.has_gpu = False
+            self.gpu_info_label.config(text="No GPU detected\nCPU processing only")
+            self.use_gpu.set(False)
+            self.gpu_checkbutton.pack_forget()
     
     def setup_dark_mode(self):
         """Setup dark mode styling"""
@@ -147,17 +187,10 @@ class VideoCropper:
         gpu_frame = ttk.LabelFrame(left_panel, text="GPU Information", padding="10")
         gpu_frame.pack(fill=tk.X, pady=(0, 10))
         
-        if self.has_gpu:
-            gpu_info = f"GPU: {self.gpu_name}"
-            if self.is_blackwell:
-                gpu_info += f"\n(Blackwell - 120 SM, Compute {self.compute_cap})"
-            else:
-                gpu_info += f"\n(Compute {self.compute_cap})"
-            ttk.Label(gpu_frame, text=gpu_info).pack(anchor=tk.W)
-            ttk.Checkbutton(gpu_frame, text="Use GPU Acceleration", 
-                           variable=self.use_gpu).pack(anchor=tk.W, pady=(5, 0))
-        else:
-            ttk.Label(gpu_frame, text="No GPU detected\nCPU processing only").pack(anchor=tk.W)
+        self.gpu_info_label = ttk.Label(gpu_frame, text="")
+        self.gpu_info_label.pack(anchor=tk.W)
+        self.gpu_checkbutton = ttk.Checkbutton(gpu_frame, text="Use GPU Acceleration", 
+                                               variable=self.use_gpu)
         
         # Video selection
         video_frame = ttk.LabelFrame(left_panel, text="Video File", padding="10")
@@ -194,7 +227,11 @@ class VideoCropper:
         self.crop_height_var = tk.StringVar(value="0")
         ttk.Entry(coords_frame, textvariable=self.crop_height_var, width=8).grid(row=1, column=3, padx=(5, 0), pady=(5, 0))
         
-        ttk.Button(crop_frame, text="Clear Selection", command=self.clear_selection).pack(pady=(10, 0))
+        selection_buttons = ttk.Frame(crop_frame)
+        selection_buttons.pack(pady=(10, 0))
+        ttk.Button(selection_buttons, text="Clear Selection", command=self.clear_selection).pack(side=tk.LEFT)
+        ttk.Button(selection_buttons, text="Copy for Frame Extractor",
+                  command=self.copy_selection).pack(side=tk.LEFT, padx=(5, 0))
         
         # Quality settings
         quality_frame = ttk.LabelFrame(left_panel, text="Export Quality", padding="10")
@@ -213,6 +250,21 @@ class VideoCropper:
         ttk.Entry(quality_scale_frame, textvariable=self.quality_var, width=5).pack(side=tk.RIGHT)
         ttk.Label(quality_scale_frame, text="(0=lossless, 18=high, 23=default)").pack(pady=(5, 0))
         
+        # Export range
+        range_frame = ttk.LabelFrame(left_panel, text="Export Range", padding="10")
+        range_frame.pack(fill=tk.X, pady=(0, 10))
+        
+        self.range_start_var = tk.StringVar()
+        self.range_end_var = tk.StringVar()
+        for row, (label, var) in enumerate((("Start:", self.range_start_var), ("End:", self.range_end_var))):
+            ttk.Label(range_frame, text=label).grid(row=row, column=0, sticky=tk.W, pady=2)
+            ttk.Entry(range_frame, textvariable=var, width=10).grid(row=row, column=1, padx=(5, 0), pady=2)
+            ttk.Button(range_frame, text="Set to current frame",
+                      command=lambda v=var: v.set(f"{self.current_frame}f")).grid(row=row, column=2, padx=(5, 0), pady=2)
+        ttk.Label(range_frame, text="Seconds, MM:SS or frame like 900f; blank = whole video.\n"
+                                    "Uncropped ranges are trimmed without re-encoding when ffmpeg is available.",
+                 wraplength=280).grid(row=2, column=0, columnspan=3, sticky=tk.W, pady=(5, 0))
+        
         # Progress section
         progress_frame = ttk.LabelFrame(left_panel, text="Progress", padding="10")
         progress_frame.pack(fill=tk.X, pady=(0, 10))
@@ -235,6 +287,10 @@ class VideoCropper:
                                        command=self.start_export, state="disabled")
         self.export_button.pack(fill=tk.X, pady=(0, 5))
         
+        self.batch_button = ttk.Button(button_frame, text="Batch Export...", 
+                                      command=self.start_batch_export, state="disabled")
+        self.batch_button.pack(fill=tk.X, pady=(0, 5))
+        
         self.cancel_button = ttk.Button(button_frame, text="Cancel", 
                                       command=self.cancel_processing_func, state="disabled")
         self.cancel_button.pack(fill=tk.X)
@@ -262,7 +318,7 @@ class VideoCropper:
         nav_frame = ttk.Frame(controls_frame)
         nav_frame.pack(fill=tk.X, pady=(0, 5))
         
-        ttk.Button(nav_frame, text="◀◀", command=lambda: self.seek_frame(-30)).pack(side=tk.LEFT)
+        ttk.Button(nav_frame, text="◀◀", command=lambda: self.seek_frame(-STEP_FRAMES)).pack(side=tk.LEFT)
         ttk.Button(nav_frame, text="◀", command=lambda: self.seek_frame(-1)).pack(side=tk.LEFT, padx=(5, 0))
         
         self.frame_var = tk.StringVar(value="0")
@@ -271,7 +327,7 @@ class VideoCropper:
         frame_entry.bind("<Return>", self.goto_frame)
         
         ttk.Button(nav_frame, text="▶", command=lambda: self.seek_frame(1)).pack(side=tk.LEFT)
-        ttk.Button(nav_frame, text="▶▶", command=lambda: self.seek_frame(30)).pack(side=tk.LEFT, padx=(5, 0))
+        ttk.Button(nav_frame, text="▶▶", command=lambda: self.seek_frame(STEP_FRAMES)).pack(side=tk.LEFT, padx=(5, 0))
         
         self.total_frames_label = ttk.Label(nav_frame, text="/ 0")
         self.total_frames_label.pack(side=tk.LEFT, padx=(5, 0))
@@ -281,6 +337,8 @@ class VideoCropper:
         self.timeline_scale = ttk.Scale(controls_frame, from_=0, to=100, orient=tk.HORIZONTAL, 
                                        variable=self.timeline_var, command=self.timeline_changed)
         self.timeline_scale.pack(fill=tk.X, pady=(5, 0))
+        self.timeline_scale.bind("<Motion>", self.show_timeline_preview)
+        self.timeline_scale.bind("<Leave>", self.hide_timeline_preview)
     
     def create_settings_tab(self):
         # Theme settings
@@ -290,6 +348,18 @@ class VideoCropper:
         ttk.Checkbutton(theme_frame, text="Dark Mode", variable=self.dark_mode, 
                        command=self.toggle_dark_mode).pack(anchor=tk.W)
         
+        # Decoder used for the preview, thumbnails and exports that decode in Python
+        decoder_frame = ttk.LabelFrame(self.settings_tab, text="Decoding", padding="20")
+        decoder_frame.pack(fill=tk.X, padx=20, pady=(0, 20))
+        
+        decoder_row = ttk.Frame(decoder_frame)
+        decoder_row.pack(anchor=tk.W)
+        ttk.Label(decoder_row, text="Decoder:").pack(side=tk.LEFT)
+        ttk.Combobox(decoder_row, textvariable=self.decoder_var, values=DECODERS, 
+                    state="readonly", width=8).pack(side=tk.LEFT, padx=(5, 0))
+        ttk.Label(decoder_frame, text="PyAV (pip install av) uses FFmpeg's threaded decoding. "
+                                      "Applies to the next video loaded.").pack(anchor=tk.W, pady=(5, 0))
+        
         # About
         about_frame = ttk.LabelFrame(self.settings_tab, text="About", padding="20")
         about_frame.pack(fill=tk.X, padx=20, pady=(0, 20))
@@ -333,11 +403,18 @@ Output files are saved with 'framed_' prefix"""
         
         try:
             # Release previous video if loaded
+            if self.thumbnails:
+                self.thumbnails.close()
+                self.thumbnails = None
+            if self.preview:
+                self.preview.close()
+                self.preview = None
+            preview_timings = self.finish_preview_timing()
             if self.cap:
                 self.cap.release()
             
             # Open new video
-            self.cap = cv2.VideoCapture(self.video_path.get())
+            self.cap = open_reader(self.video_path.get(), self.decoder_var.get())
             if not self.cap.isOpened():
                 messagebox.showerror("Error", "Could not open video file.")
                 return
@@ -353,6 +430,20 @@ Output files are saved with 'framed_' prefix"""
             self.scale_y = self.canvas_height / self.frame_height
             self.scale = min(self.scale_x, self.scale_y)
             
+            # Preview frames are decoded, resized and cached off the capture from here on
+            display_size = (int(self.frame_width * self.scale), int(self.frame_height * self.scale))
+            if trace_folder():
+                self.preview_timer = StageTimer(trace=True)
+            self.preview = PreviewSource(self.cap, display_size, self.total_frames,
+                                         PREVIEW_CACHE_MB * 1024 * 1024, timer=self.preview_timer)
+            
+            # Low-res strip of the whole video for hover previews and instant
+            # scrubbing; built in the background once, then mapped from the cache
+            self.thumbnails = ThumbnailStrip(self.video_path.get(), self.total_frames, self.fps,
+                                             self.frame_width, self.frame_height,
+                                             decoder=self.decoder_var.get())
+            self.thumbnails.load()
+            
             # Update UI
             self.total_frames_label.config(text=f"/ {self.total_frames}")
             self.timeline_scale.config(to=self.total_frames - 1)
@@ -361,8 +452,9 @@ Output files are saved with 'framed_' prefix"""
             self.current_frame = 0
             self.display_frame()
             
-            # Enable export button
+            # Enable export buttons
             self.export_button.config(state="normal")
+            self.batch_button.config(state="normal")
             
             # Update crop dimensions to full frame initially
             self.crop_x_var.set("0")
@@ -370,45 +462,105 @@ Output files are saved with 'framed_' prefix"""
             self.crop_width_var.set(str(self.frame_width))
             self.crop_height_var.set(str(self.frame_height))
             
-            messagebox.showinfo("Success", f"Video loaded successfully!\n\nResolution: {self.frame_width}x{self.frame_height}\nFPS: {self.fps:.2f}\nFrames: {self.total_frames}")
+            loaded_msg = f"Video loaded successfully!\n\nResolution: {self.frame_width}x{self.frame_height}\nFPS: {self.fps:.2f}\nFrames: {self.total_frames}"
+            if preview_timings:
+                loaded_msg += f"\n\nPreview of the previous video:\n{preview_timings}"
+            messagebox.showinfo("Success", loaded_msg)
             
         except Exception as e:
             messagebox.showerror("Error", f"Failed to load video: {str(e)}")
     
     def display_frame(self):
-        """Display current frame on canvas"""
-        if not self.cap:
+        """Display current frame on canvas without decoding on the Tk thread"""
+        if not self.preview:
             return
         
-        # Set frame position
-        self.cap.set(cv2.CAP_PROP_POS_FRAMES, self.current_frame)
-        ret, frame = self.cap.read()
+        # A cached frame is shown at once; otherwise the nearest cached frame
+        # stands in until the worker has decoded the exact one
+        frame_index = self.current_frame
+        start = time.perf_counter() if self.preview_timer is not None else None
+        frame, exact = self.preview.request(frame_index, self.on_preview_decoded)
+        if self.preview_timer is not None:
+            self.preview_timer.record("request", start)
+        if frame is None and self.thumbnails:
+            thumbnail = self.thumbnails.get(frame_index)
+            if thumbnail is not None:
+                frame = cv2.resize(thumbnail, self.preview.size)
+        if frame is not None:
+            self.paint_frame(frame)
+        
+        # Update frame counter
+        self.frame_var.set(str(frame_index))
+        self.timeline_var.set(frame_index)
+    
+    def on_preview_decoded(self, frame_index, frame):
+        """Called from the preview worker with the exact frame for a request"""
+        self.root.after(0, lambda: self.paint_decoded_frame(frame_index, frame))
+    
+    def paint_decoded_frame(self, frame_index, frame):
+        """Paint a decoded frame unless the playhead has moved on since it was requested"""
+        if frame is not None and frame_index == self.current_frame:
+            self.paint_frame(frame)
+    
+    def paint_frame(self, frame_resized):
+        """Draw a display-sized RGB frame on the canvas"""
+        start = time.perf_counter() if self.preview_timer is not None else None
+        display_width, display_height = self.preview.size
+        
+        # Convert to PIL Image
+        pil_image = Image.fromarray(frame_resized)
+        self.current_frame_img = ImageTk.PhotoImage(pil_image)
+        
+        # Clear canvas and display image
+        self.video_canvas.delete("all")
+        canvas_x = (self.canvas_width - display_width) // 2
+        canvas_y = (self.canvas_height - display_height) // 2
+        self.video_canvas.create_image(canvas_x, canvas_y, anchor=tk.NW, image=self.current_frame_img)
+        
+        # Redraw selection rectangle if exists
+        self.redraw_selection()
+        if self.preview_timer is not None:
+            self.preview_timer.record("paint", start)
+    
+    def finish_preview_timing(self):
+        """Write the preview trace if timing was on; return its summary line, or None"""
+        if not self.preview_timer:
+            return None
+        trace_path = gui_trace_path(f"{Path(self.video_path.get()).stem}-preview")
+        if trace_path:
+            self.preview_timer.write_trace(trace_path)
+        summary = self.preview_timer.summary()
+        self.preview_timer = None
+        return summary
+    
+    def show_timeline_preview(self, event):
+        """Show the thumbnail for the timeline position under the mouse"""
+        if not self.thumbnails or self.total_frames <= 1:
+            return
         
-        if ret:
-            # Convert BGR to RGB
-            frame_rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-            
-            # Resize frame to fit canvas
-            display_width = int(self.frame_width * self.scale)
-            display_height = int(self.frame_height * self.scale)
-            frame_resized = cv2.resize(frame_rgb, (display_width, display_height))
-            
-            # Convert to PIL Image
-            pil_image = Image.fromarray(frame_resized)
-            self.current_frame_img = ImageTk.PhotoImage(pil_image)
-            
-            # Clear canvas and display image
-            self.video_canvas.delete("all")
-            canvas_x = (self.canvas_width - display_width) // 2
-            canvas_y = (self.canvas_height - display_height) // 2
-            self.video_canvas.create_image(canvas_x, canvas_y, anchor=tk.NW, image=self.current_frame_img)
-            
-            # Redraw selection rectangle if exists
-            self.redraw_selection()
-            
-            # Update frame counter
-            self.frame_var.set(str(self.current_frame))
-            self.timeline_var.set(self.current_frame)
+        fraction = max(0.0, min(1.0, event.x / max(1, self.timeline_scale.winfo_width())))
+        frame_index = int(fraction * (self.total_frames - 1))
+        thumbnail = self.thumbnails.get(frame_index)
+        if thumbnail is None:
+            self.hide_timeline_preview()
+            return
+        
+        if self.hover_window is None:
+            self.hover_window = tk.Toplevel(self.root)
+            self.hover_window.wm_overrideredirect(True)
+            self.hover_label = ttk.Label(self.hover_window, compound=tk.TOP)
+            self.hover_label.pack()
+        
+        self.hover_image = ImageTk.PhotoImage(Image.fromarray(thumbnail))
+        self.hover_label.config(image=self.hover_image, text=str(frame_index))
+        thumb_width, thumb_height = self.thumbnails.size
+        self.hover_window.geometry(f"+{event.x_root - thumb_width // 2}+{event.y_root - thumb_height - 40}")
+        self.hover_window.deiconify()
+    
+    def hide_timeline_preview(self, event=None):
+        """Hide the timeline hover preview"""
+        if self.hover_window is not None:
+            self.hover_window.withdraw()
     
     def seek_frame(self, delta):
         """Seek to relative frame position"""
@@ -438,6 +590,8 @@ Output files are saved with 'framed_' prefix"""
             return
         
         frame_num = int(float(value))
+        if frame_num == self.current_frame:
+            return  # sub-frame slider motion
         self.current_frame = frame_num
         self.display_frame()
     
@@ -538,6 +692,14 @@ Output files are saved with 'framed_' prefix"""
         except ValueError:
             pass
     
+    def copy_selection(self):
+        """Put the crop rectangle on the clipboard as X,Y,WIDTH,HEIGHT for the Frame Extractor's Crop to field"""
+        rect = ",".join(var.get().strip() for var in (self.crop_x_var, self.crop_y_var,
+                                                      self.crop_width_var, self.crop_height_var))
+        self.root.clipboard_clear()
+        self.root.clipboard_append(rect)
+        self.progress_var.set(f"Copied crop rectangle {rect}")
+    
     def clear_selection(self):
         """Clear crop selection"""
         if self.selection_rectangle:
@@ -550,13 +712,8 @@ Output files are saved with 'framed_' prefix"""
             self.crop_width_var.set(str(self.frame_width))
             self.crop_height_var.set(str(self.frame_height))
     
-    def start_export(self):
-        """Start video export process"""
-        if not self.cap:
-            messagebox.showerror("Error", "Please load a video first.")
-            return
-        
-        # Validate crop selection
+    def validate_crop(self):
+        """Check the crop selection against the loaded video; show an error and return False if invalid"""
         try:
             crop_x = int(self.crop_x_var.get())
             crop_y = int(self.crop_y_var.get())
@@ -565,153 +722,212 @@ Output files are saved with 'framed_' prefix"""
             
             if crop_width <= 0 or crop_height <= 0:
                 messagebox.showerror("Error", "Invalid crop dimensions.")
-                return
+                return False
             
             if crop_x + crop_width > self.frame_width or crop_y + crop_height > self.frame_height:
                 messagebox.showerror("Error", "Crop area exceeds video boundaries.")
-                return
+                return False
         except ValueError:
             messagebox.showerror("Error", "Invalid crop coordinates.")
+            return False
+        
+        try:
+            crf = int(self.quality_var.get())
+        except ValueError:
+            crf = -1
+        if not 0 <= crf <= 51:
+            messagebox.showerror("Error", "CRF quality must be a whole number from 0 to 51.")
+            return False
+        
+        try:
+            self.range_bounds()
+        except ValueError:
+            messagebox.showerror("Error", "Please enter the range as seconds, MM:SS or a frame number like 900f.")
+            return False
+        return True
+    
+    def range_bounds(self):
+        """Return the CropConfig start/end fields from the range entries"""
+        start = self.range_start_var.get().strip()
+        end = self.range_end_var.get().strip()
+        return bound_fields(parse_position(start) if start else None,
+                            parse_position(end) if end else None)
+    
+    def start_export(self):
+        """Start video export process"""
+        if not self.cap:
+            messagebox.showerror("Error", "Please load a video first.")
+            return
+        
+        # Validate crop selection
+        if not self.validate_crop():
+            return
+        
+        self.run_in_background(self.export_video)
+    
+    def start_batch_export(self):
+        """Pick several videos and export them all with the current crop selection"""
+        if not self.cap:
+            messagebox.showerror("Error", "Please load a video first.")
+            return
+        
+        if not self.validate_crop():
             return
         
-        # Start export in separate thread
+        filetypes = [
+            ("Video files", "*.mp4 *.avi *.mov *.mkv *.wmv *.flv *.webm"),
+            ("All files", "*.*")
+        ]
+        filenames = filedialog.askopenfilenames(title="Select Videos for Batch Export", filetypes=filetypes)
+        if not filenames:
+            return
+        
+        self.run_in_background(lambda: self.export_batch(list(filenames)))
+    
+    def run_in_background(self, target):
+        """Disable the export buttons and run target on a worker thread"""
         self.is_processing = True
         self.cancel_processing = False
         self.export_button.config(state="disabled")
+        self.batch_button.config(state="disabled")
         self.cancel_button.config(state="normal")
         
-        export_thread = threading.Thread(target=self.export_video)
+        export_thread = threading.Thread(target=target)
         export_thread.daemon = True
         export_thread.start()
     
+    def finish_background(self):
+        """Re-enable the export buttons once a worker thread is done"""
+        self.is_processing = False
+        self.root.after(0, lambda: self.export_button.config(state="normal"))
+        self.root.after(0, lambda: self.batch_button.config(state="normal"))
+        self.root.after(0, lambda: self.cancel_button.config(state="disabled"))
+    
     def export_video(self):
         """Export cropped video"""
+        from frame_extractor.cropper import CropConfig, export_crop
+        
         try:
-            # Get parameters
-            crop_x = int(self.crop_x_var.get())
-            crop_y = int(self.crop_y_var.get())
-            crop_width = int(self.crop_width_var.get())
-            crop_height = int(self.crop_height_var.get())
-            
-            # Generate output filename
-            video_path = self.video_path.get()
-            video_name = Path(video_path).stem
-            video_ext = Path(video_path).suffix
-            output_name = f"framed_{video_name}{video_ext}"
-            output_path = os.path.join(self.output_folder, output_name)
-            
-            # Ensure even dimensions for encoding
-            if crop_width % 2 != 0:
-                crop_width -= 1
-            if crop_height % 2 != 0:
-                crop_height -= 1
-            
-            # Setup codec
-            codec = self.codec_var.get()
-            quality = self.quality_var.get()
-            
-            if codec == "h265":
-                fourcc = cv2.VideoWriter.fourcc(*'HEVC')
-            else:
-                fourcc = cv2.VideoWriter.fourcc(*'mp4v')
-            
-            # Create video writer
-            out = cv2.VideoWriter(output_path, fourcc, self.fps, (crop_width, crop_height))
-            
-            if not out.isOpened():
-                self.root.after(0, lambda: messagebox.showerror("Error", "Could not create output video file."))
-                return
-            
-            # Process frames
-            self.root.after(0, lambda: self.progress_bar.config(maximum=self.total_frames))
+            # Export decodes on its own capture, sequentially from the first
+            # frame; self.cap stays with the preview so scrubbing is safe
+            config = CropConfig(self.video_path.get(),
+                                x=int(self.crop_x_var.get()),
+                                y=int(self.crop_y_var.get()),
+                                width=int(self.crop_width_var.get()),
+                                height=int(self.crop_height_var.get()),
+                                output_folder=self.output_folder,
+                                codec=self.codec_var.get(),
+                                crf=int(self.quality_var.get()),
+                                progress_interval=PROGRESS_INTERVAL,
+                                decoder=self.decoder_var.get(),
+                                use_gpu=self.use_gpu.get() and self.has_gpu,
+                                **self.range_bounds())
+            # Stage timings and a trace when FRAME_EXTRACTOR_TRACE names a folder
+            config.trace_path = gui_trace_path(f"{Path(config.video_path).stem}-crop")
+            output_name = os.path.basename(config.output_path)
             
             gpu_status = ""
-            if self.use_gpu.get() and self.has_gpu:
+            if config.use_gpu:
                 if self.is_blackwell:
                     gpu_status = " (Using RTX 5000 series - 120 SM acceleration)"
                 else:
                     gpu_status = " (Using GPU acceleration)"
-                device = torch.device('cuda:0')
-                torch.cuda.empty_cache()
             else:
                 gpu_status = " (CPU processing)"
-                device = None
-            
-            self.root.after(0, lambda: self.progress_var.set(f"Exporting cropped video{gpu_status}..."))
-            
-            processed_frames = 0
-            
-            for frame_idx in range(self.total_frames):
-                if self.cancel_processing:
-                    break
-                
-                # Read frame
-                if not self.cap:
-                    break
-                    
-                self.cap.set(cv2.CAP_PROP_POS_FRAMES, frame_idx)
-                ret, frame = self.cap.read()
-                
-                if not ret:
-                    break
-                
-                # Crop frame
-                cropped_frame = frame[crop_y:crop_y+crop_height, crop_x:crop_x+crop_width]
-                
-                # GPU processing if available
-                if self.use_gpu.get() and self.has_gpu and device is not None:
-                    try:
-                        frame_tensor = torch.from_numpy(cropped_frame).to(device)
-                        cropped_frame = frame_tensor.cpu().numpy()
-                        
-                        if self.is_blackwell and processed_frames % 10 == 0:
-                            torch.cuda.empty_cache()
-                    except Exception:
-                        pass  # Fallback to CPU processing
-                
-                # Write frame
-                out.write(cropped_frame)
-                processed_frames += 1
-                
-                # Update progress
-                if processed_frames % 30 == 0 or processed_frames == self.total_frames:
-                    progress_text = f"Exporting cropped video{gpu_status}... ({processed_frames}/{self.total_frames})"
-                    self.root.after(0, lambda: self.progress_var.set(progress_text))
-                    self.root.after(0, lambda: self.progress_bar.config(value=processed_frames))
             
-            # Clean up
-            out.release()
+            def on_progress(snapshot):
+                # Called at most every PROGRESS_INTERVAL seconds; one Tk callback per update
+                self.root.after(0, lambda: self.show_progress(snapshot, f"Exporting cropped video{gpu_status}..."))
             
-            if self.use_gpu.get() and self.has_gpu:
-                torch.cuda.empty_cache()
+            result = export_crop(config, on_progress, should_cancel=lambda: self.cancel_processing)
             
-            if self.cancel_processing:
-                # Remove incomplete file
-                if os.path.exists(output_path):
-                    os.remove(output_path)
+            if result.cancelled:
                 self.root.after(0, lambda: self.progress_var.set("Export cancelled"))
             else:
                 self.root.after(0, lambda: self.progress_var.set(f"Export completed! Saved to {output_name}"))
                 
                 completion_msg = f"Video export completed!\n\nCropped video saved as:\n{output_name}\n\nLocation: {self.output_folder}"
-                if self.use_gpu.get() and self.has_gpu:
+                if result.encoder == "opencv":
+                    completion_msg += "\n\nffmpeg was not found, so OpenCV encoded the video and the CRF setting was not applied."
+                elif result.encoder == "ffmpeg-copy":
+                    completion_msg += "\n\nThe range was copied without re-encoding, so it starts at the nearest keyframe before the start position."
+                if config.use_gpu:
                     if self.is_blackwell:
                         completion_msg += "\n\n🚀 Processed with RTX 5000 series (120 SM) acceleration!"
                     else:
                         completion_msg += f"\n\n⚡ Processed with GPU acceleration ({self.gpu_name})"
+                if result.timings:
+                    completion_msg += f"\n\n{result.timings.summary()}"
                 
                 self.root.after(0, lambda: messagebox.showinfo("Success", completion_msg))
         
         except Exception as e:
-            self.root.after(0, lambda: messagebox.showerror("Error", f"Export failed: {str(e)}"))
+            msg = f"Export failed: {e}"
+            self.root.after(0, lambda msg=msg: messagebox.showerror("Error", msg))
         
         finally:
-            self.is_processing = False
-            self.root.after(0, lambda: self.export_button.config(state="normal"))
-            self.root.after(0, lambda: self.cancel_button.config(state="disabled"))
-            
-            if self.has_gpu:
-                torch.cuda.empty_cache()
+            self.finish_background()
+    
+    def export_batch(self, filenames):
+        """Export every video in filenames with the current crop; failures are reported per file"""
+        from frame_extractor.batch import export_crop_batch
+        from frame_extractor.cropper import CropConfig
+        
+        failed = []
+        
+        def on_item(item, finished, total):
+            if not item.ok and not item.skipped:
+                failed.append(item)
+            label = f"Batch: {finished}/{total} videos exported"
+            if failed:
+                label += f" ({len(failed)} failed)"
+            self.root.after(0, lambda: self.progress_bar.config(maximum=total, value=finished))
+            self.root.after(0, lambda: self.progress_var.set(label))
+        
+        try:
+            template = CropConfig(
+                video_path=filenames[0],
+                x=int(self.crop_x_var.get()),
+                y=int(self.crop_y_var.get()),
+                width=int(self.crop_width_var.get()),
+                height=int(self.crop_height_var.get()),
+                output_folder=self.output_folder,
+                codec=self.codec_var.get(),
+                crf=int(self.quality_var.get()),
+                decoder=self.decoder_var.get(),
+                use_gpu=self.use_gpu.get() and self.has_gpu,
+                trace_path=trace_folder(),  # one trace per video in there
+                **self.range_bounds(),
+            )
+            self.root.after(0, lambda: self.progress_var.set(f"Batch: 0/{len(filenames)} videos exported"))
+            items = export_crop_batch(template, filenames, BATCH_JOBS, on_item=on_item,
+                                      should_cancel=lambda: self.cancel_processing)
+            
+            done = [item for item in items if item.ok]
+            skipped = [item for item in items if item.skipped]
+            summary = f"Batch export finished.\n\n{len(done)} of {len(items)} videos exported to:\n{self.output_folder}"
+            if skipped:
+                summary += f"\n{len(skipped)} skipped (cancelled)"
+            if failed:
+                summary += f"\n\n{len(failed)} failed:"
+                for item in failed[:10]:
+                    summary += f"\n{os.path.basename(item.video_path)}: {item.error}"
+                if len(failed) > 10:
+                    summary += f"\n... and {len(failed) - 10} more"
+            
+            self.root.after(0, lambda: (messagebox.showwarning if failed else messagebox.showinfo)("Batch Complete", summary))
+        
+        except Exception as e:
+            msg = f"Batch export failed: {e}"
+            self.root.after(0, lambda msg=msg: messagebox.showerror("Error", msg))
+        
+        finally:
+            self.finish_background()
+    
+    def show_progress(self, snapshot, label):
+        """Show a progress snapshot in the progress bar and label"""
+        self.progress_bar.config(maximum=max(snapshot.total, 1), value=snapshot.done)
+        self.progress_var.set(f"{label} ({snapshot.format()})")
     
     def cancel_processing_func(self):
         """Cancel video processing"""
@@ -722,6 +938,7 @@ def main():
     root = tk.Tk()
     app = VideoCropper(root)
     root.mainloop()
+    app.finish_preview_timing()
 
 if __name__ == "__main__":
     main()